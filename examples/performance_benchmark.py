@@ -0,0 +1,805 @@
+"""
+性能基准测试
+
+对比不同生成方式的耗时，用于评估性能优化的效果和防止性能回退。
+在项目根目录运行: python examples/performance_benchmark.py
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pdf_generator import PDFReportGenerator, CompiledReport, ParallelReportRunner, ReportCache, ChartCache
+
+
+def _make_sales_config():
+    """构造一个包含表格和图表的销售报告配置"""
+    return {
+        "metadata": {
+            "title": "客户销售报告",
+            "author": "基准测试",
+            "pageSize": "A4"
+        },
+        "styles": {
+            "salesTable": {
+                "gridColor": "#BDC3C7",
+                "headerBackground": "#3498DB",
+                "headerTextColor": "#FFFFFF",
+                "fontSize": 9
+            }
+        },
+        "elements": [
+            {"type": "heading", "text": "销售明细", "level": 1},
+            {"type": "table", "dataSource": "sales", "style": "salesTable"},
+            {
+                "type": "chart",
+                "chartType": "bar",
+                "dataSource": "sales",
+                "xAxis": "产品",
+                "yAxis": "销量",
+                "title": "产品销量"
+            }
+        ]
+    }
+
+
+def _make_sales_data(seed: int, rows: int = 20) -> pd.DataFrame:
+    """构造一个客户的销售数据"""
+    return pd.DataFrame({
+        "产品": [f"产品{i}" for i in range(rows)],
+        "销量": [(seed * 7 + i * 13) % 500 for i in range(rows)],
+        "金额": [(seed * 11 + i * 17) % 9000 for i in range(rows)],
+    })
+
+
+def benchmark_batch(count: int = 20):
+    """对比：每份报告新建生成器 vs CompiledReport 批量渲染"""
+    print(f"基准测试: 批量生成 {count} 份报告")
+    config = _make_sales_config()
+    data_sets = {f"customer_{i}": {"sales": _make_sales_data(i)} for i in range(count)}
+
+    # 方式1：每份报告新建生成器
+    start = time.perf_counter()
+    for key, data in data_sets.items():
+        generator = PDFReportGenerator(config_dict=config)
+        for name, df in data.items():
+            generator.add_data_source(name, df)
+        generator.to_bytes()
+    naive_elapsed = time.perf_counter() - start
+
+    # 方式2：预编译一次，批量渲染
+    report = CompiledReport(config_dict=config)
+    summary = report.generate_batch(data_sets)
+    batch_elapsed = summary['compile_time'] + summary['elapsed']
+
+    print(f"  每份新建生成器: {naive_elapsed:.2f}s ({count / naive_elapsed:.1f} 份/秒)")
+    print(f"  CompiledReport:  {batch_elapsed:.2f}s ({summary['throughput']:.1f} 份/秒, "
+          f"预编译 {summary['compile_time'] * 1000:.0f}ms)")
+    slowest = max(summary['items'], key=lambda item: item['elapsed'])
+    print(f"  最慢条目: {slowest['key']} {slowest['elapsed'] * 1000:.0f}ms\n")
+
+
+def benchmark_parallel(count: int = 20, max_workers: int = 4):
+    """对比：单进程串行生成 vs ParallelReportRunner 多进程生成"""
+    print(f"基准测试: 并行生成 {count} 份报告（{max_workers} 个工作进程）")
+    config = _make_sales_config()
+    jobs = [(config, {"sales": _make_sales_data(i)}) for i in range(count)]
+    # 混入一个错误配置，验证单个任务失败不影响整个批次
+    jobs.append(({"elements": [{"type": "unknown"}]}, {}))
+
+    start = time.perf_counter()
+    for job_config, data in jobs[:count]:
+        generator = PDFReportGenerator(config_dict=job_config)
+        for name, df in data.items():
+            generator.add_data_source(name, df)
+        generator.to_bytes()
+    serial_elapsed = time.perf_counter() - start
+
+    runner = ParallelReportRunner(max_workers=max_workers, max_tasks_per_worker=10)
+    start = time.perf_counter()
+    results = list(runner.run(jobs))
+    parallel_elapsed = time.perf_counter() - start
+
+    succeeded = sum(1 for result in results if result['success'])
+    print(f"  串行:     {serial_elapsed:.2f}s")
+    print(f"  多进程:   {parallel_elapsed:.2f}s（含进程启动，成功 {succeeded}/{len(results)}）")
+    print(f"  加速比:   {serial_elapsed / parallel_elapsed:.1f}x\n")
+
+
+def benchmark_profile():
+    """输出一次生成的分阶段耗时，定位瓶颈"""
+    print("性能分析: 单份报告分阶段耗时")
+    generator = PDFReportGenerator(config_dict=_make_sales_config())
+    generator.add_data_source("sales", _make_sales_data(0, rows=200))
+    _, profile = generator.generate(return_bytes=True, profile=True)
+
+    print(f"  总计: {profile.wall * 1000:.0f}ms, {profile.page_count} 页, {profile.output_size} 字节")
+    for name, stage in profile.stages.items():
+        print(f"  {name:<20} {stage['wall'] * 1000:8.1f}ms  峰值内存 {(stage['peak_memory'] or 0) / 1024:.0f}KB")
+    for element_type, item in profile.get_element_type_summary().items():
+        print(f"  元素 {element_type:<15} {item['wall'] * 1000:8.1f}ms  x{item['count']}")
+    print()
+
+
+def _make_statement_config(sections: int, stream_pages: bool):
+    """构造一个多页对账单配置（页脚显示总页数）"""
+    elements = []
+    for i in range(sections):
+        elements.append({"type": "heading", "text": f"账户 {i + 1}", "level": 1})
+        elements.extend(
+            {"type": "text", "content": f"交易记录 {i + 1}-{j + 1}: " + "摘要说明 " * 20}
+            for j in range(12)
+        )
+
+    return {
+        "metadata": {"title": "对账单"},
+        "pageTemplate": {
+            "streamPages": stream_pages,
+            # 使用项目自带的字体（页眉页脚默认的 SimHei 未安装时无法绘制）
+            "header": {
+                "enabled": True,
+                "center": {"type": "text", "content": "{{metadata.title}}", "fontName": "GB2312"}
+            },
+            "footer": {
+                "enabled": True,
+                "center": {"type": "pageNumber", "format": "Page {page} of {total}", "fontName": "GB2312"}
+            }
+        },
+        "elements": elements
+    }
+
+
+def benchmark_page_streaming(section_counts=(50, 200, 800)):
+    """对比：NumberedCanvas 缓存所有页面 vs streamPages 逐页输出的布局阶段峰值内存"""
+    print("基准测试: 页眉页脚的布局阶段峰值内存")
+    for sections in section_counts:
+        line = f"  {sections:>4} 个章节:"
+        for stream_pages in (False, True):
+            generator = PDFReportGenerator(config_dict=_make_statement_config(sections, stream_pages))
+            _, profile = generator.generate(return_bytes=True, profile=True)
+            peak = profile.stages['layout']['peak_memory'] / 1024 / 1024
+            label = "streamPages" if stream_pages else "默认"
+            line += f"  {label} {peak:6.1f}MB"
+        print(f"{line}  ({profile.page_count} 页)")
+    print()
+
+
+def _make_toc_config(chapters: int, strategy: str):
+    """构造一个带自动目录的多章节报告配置"""
+    elements = []
+    for i in range(chapters):
+        elements.append({"type": "heading", "text": f"第 {i + 1} 章", "level": 1})
+        elements.append({"type": "heading", "text": f"{i + 1}.1 销售明细", "level": 2})
+        elements.append({"type": "table", "dataSource": "sales", "style": "salesTable"})
+
+    config = _make_sales_config()
+    config["toc"] = {"enabled": True, "autoGenerate": True, "strategy": strategy}
+    config["elements"] = elements
+    return config
+
+
+def benchmark_toc(chapters: int = 60):
+    """对比：multiBuild 多遍布局 vs singlePass 单遍布局的自动目录"""
+    print(f"基准测试: 自动目录（{chapters} 章）")
+    elapsed = {}
+    for strategy in ("multiBuild", "singlePass"):
+        generator = PDFReportGenerator(config_dict=_make_toc_config(chapters, strategy))
+        generator.add_data_source("sales", _make_sales_data(0, rows=40))
+        _, profile = generator.generate(return_bytes=True, profile=True)
+        elapsed[strategy] = profile.stages['layout']['wall']
+        print(f"  {strategy:<12} 布局 {elapsed[strategy]:.2f}s（{profile.page_count} 页）")
+    print(f"  加速比:      {elapsed['multiBuild'] / elapsed['singlePass']:.1f}x\n")
+
+
+def benchmark_result_cache(requests: int = 20):
+    """对比：重复请求每次生成 vs ReportCache 命中缓存"""
+    print(f"基准测试: 结果缓存（{requests} 次相同请求）")
+    config = _make_sales_config()
+    data = _make_sales_data(0, rows=200)
+    cache = ReportCache()
+
+    for label, result_cache in (("无缓存", None), ("ReportCache", cache)):
+        start = time.perf_counter()
+        for _ in range(requests):
+            generator = PDFReportGenerator(config_dict=config, result_cache=result_cache)
+            generator.add_data_source("sales", data.copy())
+            generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<12} {elapsed:.2f}s ({elapsed / requests * 1000:.1f}ms/次)")
+
+    stats = cache.get_stats()
+    print(f"  命中 {stats['hits']} 次，未命中 {stats['misses']} 次\n")
+
+
+def benchmark_chart_cache(count: int = 20):
+    """对比：每份报告重新绘制图表 vs ChartCache
+
+    各份报告的金额列不同（表格和整份PDF都不同），图表只用到产品和销量两列，因此可以共享。
+    """
+    print(f"基准测试: 图表缓存（{count} 份报告共用同一图表）")
+    config = _make_sales_config()
+    base = _make_sales_data(0, rows=50)
+    data_sets = []
+    for i in range(count):
+        df = base.copy()
+        df["金额"] = _make_sales_data(i, rows=50)["金额"]
+        data_sets.append(df)
+    cache = ChartCache()
+
+    for label, chart_cache in (("无缓存", None), ("ChartCache", cache)):
+        start = time.perf_counter()
+        for df in data_sets:
+            generator = PDFReportGenerator(config_dict=config, chart_cache=chart_cache)
+            generator.add_data_source("sales", df)
+            generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<12} {elapsed:.2f}s ({elapsed / count * 1000:.1f}ms/份)")
+
+    stats = cache.get_stats()
+    print(f"  命中 {stats['hits']} 次，未命中 {stats['misses']} 次\n")
+
+
+def benchmark_chart_workers(charts: int = 16, workers: int = 4):
+    """对比：逐个渲染图表 vs 在进程池中并行预渲染（加速比受CPU核心数限制）"""
+    print(f"基准测试: 并行渲染 {charts} 个图表（{workers} 个进程，CPU核心数 {os.cpu_count()}）")
+    config = {
+        "metadata": {"title": "图表报告"},
+        "elements": [
+            {
+                "type": "chart",
+                "chartType": ("bar", "line", "area", "scatter")[i % 4],
+                "dataSource": "sales",
+                "xAxis": "销量",
+                "yAxis": "金额",
+                "title": f"图表{i}"
+            }
+            for i in range(charts)
+        ]
+    }
+    data = _make_sales_data(0, rows=200)
+
+    for label, chart_workers in (("逐个渲染", None), (f"{workers} 个进程", workers)):
+        with PDFReportGenerator(config_dict=config, chart_workers=chart_workers) as generator:
+            generator.add_data_source("sales", data)
+            # 第一次生成启动进程池，不计入耗时
+            generator.to_bytes()
+            start = time.perf_counter()
+            generator.to_bytes()
+            elapsed = time.perf_counter() - start
+        print(f"  {label:<10} {elapsed:.2f}s")
+    print()
+
+
+def benchmark_chart_engine(charts: int = 10):
+    """对比：matplotlib PNG图表 vs ReportLab 矢量图表（耗时和文件大小）"""
+    print(f"基准测试: 图表引擎（{charts} 个图表）")
+    data = _make_sales_data(0, rows=30)
+
+    for engine in ("matplotlib", "native"):
+        config = {
+            "metadata": {"title": "图表引擎", "chartEngine": engine},
+            "elements": [
+                {
+                    "type": "chart",
+                    "chartType": ("bar", "line", "area", "pie")[i % 4],
+                    "dataSource": "sales",
+                    "xAxis": "产品",
+                    "yAxis": ["销量", "金额"] if i % 4 != 3 else "销量",
+                    "labels": "产品",
+                    "values": "销量",
+                    "title": f"图表{i}"
+                }
+                for i in range(charts)
+            ]
+        }
+        generator = PDFReportGenerator(config_dict=config)
+        generator.add_data_source("sales", data)
+        start = time.perf_counter()
+        pdf_bytes = generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        print(f"  {engine:<12} {elapsed:.2f}s  {len(pdf_bytes) / 1024:.0f}KB")
+    print()
+
+
+def benchmark_chart_format(charts: int = 10):
+    """对比：matplotlib PNG图表（dpi 100/150/300）vs matplotlib 矢量图表（耗时和文件大小）"""
+    print(f"基准测试: 图表输出格式（{charts} 个图表）")
+    data = _make_sales_data(0, rows=30)
+
+    variants = [("png", dpi) for dpi in (100, 150, 300)] + [("vector", None)]
+    for chart_format, dpi in variants:
+        elements = []
+        for i in range(charts):
+            element = {
+                "type": "chart",
+                "chartType": ("bar", "line", "area", "pie")[i % 4],
+                "dataSource": "sales",
+                "xAxis": "产品",
+                "yAxis": ["销量", "金额"] if i % 4 != 3 else "销量",
+                "labels": "产品",
+                "values": "销量",
+                "title": f"图表{i}"
+            }
+            if dpi:
+                element["dpi"] = dpi
+            elements.append(element)
+        config = {
+            "metadata": {"title": "图表输出格式", "chartFormat": chart_format},
+            "elements": elements
+        }
+        generator = PDFReportGenerator(config_dict=config)
+        generator.add_data_source("sales", data)
+        start = time.perf_counter()
+        pdf_bytes = generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        label = f"png dpi={dpi}" if dpi else chart_format
+        print(f"  {label:<12} {elapsed:.2f}s  {len(pdf_bytes) / 1024:.0f}KB")
+    print()
+
+
+def benchmark_chart_codec(charts: int = 10):
+    """对比：PNG往返 vs 画布像素直接嵌入（Flate）vs JPEG（耗时和文件大小）"""
+    print(f"基准测试: 图表位图编码（{charts} 个图表）")
+    data = _make_sales_data(0, rows=30)
+
+    for codec, quality in (("png", None), ("flate", None), ("jpeg", 85), ("jpeg", 60)):
+        elements = []
+        for i in range(charts):
+            element = {
+                "type": "chart",
+                "chartType": ("bar", "line", "area", "pie")[i % 4],
+                "dataSource": "sales",
+                "xAxis": "产品",
+                "yAxis": ["销量", "金额"] if i % 4 != 3 else "销量",
+                "labels": "产品",
+                "values": "销量",
+                "title": f"图表{i}"
+            }
+            if quality:
+                element["jpegQuality"] = quality
+            elements.append(element)
+        config = {
+            "metadata": {"title": "图表位图编码", "chartImageCodec": codec},
+            "elements": elements
+        }
+        generator = PDFReportGenerator(config_dict=config)
+        generator.add_data_source("sales", data)
+        start = time.perf_counter()
+        pdf_bytes = generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        label = f"{codec} q={quality}" if quality else codec
+        print(f"  {label:<12} {elapsed:.2f}s  {len(pdf_bytes) / 1024:.0f}KB")
+    print()
+
+
+def benchmark_chart_threads(charts: int = 200, threads: int = 8):
+    """并发压力测试：多线程共享一个 ChartGenerator 渲染图表，结果必须与串行渲染逐字节一致"""
+    from concurrent.futures import ThreadPoolExecutor
+    from pdf_generator.utils import ChartGenerator
+
+    print(f"基准测试: 多线程图表渲染（{charts} 个图表，{threads} 个线程）")
+    chart_generator = ChartGenerator()
+    jobs = []
+    for i in range(charts):
+        chart_type = ("bar", "line", "area", "pie", "scatter")[i % 5]
+        config = {
+            "xAxis": "销量" if chart_type == "scatter" else "产品",
+            "yAxis": "金额" if chart_type == "scatter" else ["销量", "金额"],
+            "labels": "产品",
+            "values": "销量",
+            "title": f"图表{i}",
+            "width": 6 + i % 3,
+            "format": ("png", "png", "vector")[i % 3],
+            "imageCodec": ("png", "flate")[i % 2],
+            "showLegend": chart_type != "scatter",
+        }
+        jobs.append((chart_type, _make_sales_data(i % 7, rows=10 + i % 20), config))
+
+    start = time.perf_counter()
+    expected = [chart_generator.generate_chart(*job) for job in jobs]
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda job: chart_generator.generate_chart(*job), jobs))
+    threaded = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, results) if a != b)
+    print(f"  串行: {serial:.2f}s  多线程: {threaded:.2f}s  与串行结果不一致: {mismatches}/{charts}")
+    if mismatches:
+        raise AssertionError(f"{mismatches} charts differ between threaded and serial rendering")
+    print()
+
+
+def benchmark_chart_dpi(charts: int = 10):
+    """对比：固定 dpi 栅格化 vs 按显示尺寸和目标分辨率栅格化（3×2英寸的小图表）"""
+    print(f"基准测试: 图表目标分辨率（{charts} 个 3×2 英寸图表）")
+    data = _make_sales_data(0, rows=30)
+
+    for label, options in (
+        ("dpi=200", {"dpi": 200}),
+        ("targetDpi=300", {"targetDpi": 300}),
+        ("targetDpi=150", {"targetDpi": 150}),
+    ):
+        elements = [
+            {
+                "type": "chart",
+                "chartType": ("bar", "line", "area", "pie")[i % 4],
+                "dataSource": "sales",
+                "xAxis": "产品",
+                "yAxis": ["销量", "金额"] if i % 4 != 3 else "销量",
+                "labels": "产品",
+                "values": "销量",
+                "title": f"图表{i}",
+                "width": 3,
+                "height": 2,
+                **options,
+            }
+            for i in range(charts)
+        ]
+        config = {"metadata": {"title": "图表目标分辨率"}, "elements": elements}
+        generator = PDFReportGenerator(config_dict=config)
+        generator.add_data_source("sales", data)
+        start = time.perf_counter()
+        pdf_bytes = generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<14} {elapsed:.2f}s  {len(pdf_bytes) / 1024:.0f}KB")
+    print()
+
+
+def _make_ledger_data(rows: int) -> pd.DataFrame:
+    """构造一个流水账数据（整数、浮点数、日期和摘要，少量摘要超过换行阈值）"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "序号": np.arange(rows),
+        "日期": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "金额": rng.normal(1000, 300, rows).round(2),
+        "摘要": ["跨行转账，附言：" + "季度结算款项" * 8 if i % 50 == 0 else f"转账 {i % 97}"
+               for i in range(rows)],
+    })
+
+
+def benchmark_table_conversion(row_counts=(1_000, 10_000, 100_000)):
+    """对比：逐行 iterrows 构建表格 vs create_table 按列转换（都包含ReportLab Table的构建，不含布局）"""
+    from reportlab.platypus import Paragraph, Table
+
+    print("基准测试: 表格数据转换")
+    generator = PDFReportGenerator(config_dict=_make_sales_config())
+    factory = generator.element_factory
+    cell_style = generator.style_manager.get_style('BodyText')
+    table_style = generator.style_manager.get_table_style('salesTable')
+    threshold = 50
+
+    def cell_texts(table):
+        return [[cell.text if isinstance(cell, Paragraph) else cell for cell in row] for row in table._cellvalues]
+
+    # 输出检查：与 iterrows 逐个 str() 的结果一致；只显示日期或时间差列时与pandas标量的 str() 一致
+    ledger = _make_ledger_data(200)
+    expected = [list(ledger.columns)] + [[str(val) for val in row.values] for _, row in ledger.iterrows()]
+    assert cell_texts(factory.create_table({"dataSource": "ledger"}, {"ledger": ledger})) == expected
+    for column in (ledger[["日期"]], pd.DataFrame({"时长": pd.to_timedelta([0, 3600, 90061, None], unit="s")})):
+        expected = [list(column.columns)] + [[str(val)] for val in column.iloc[:, 0]]
+        assert cell_texts(factory.create_table({"dataSource": "column"}, {"column": column})) == expected, \
+            f"{column.columns[0]} 列的显示与pandas不一致"
+
+    for rows in row_counts:
+        df = _make_ledger_data(rows)
+
+        start = time.perf_counter()
+        expected = [list(df.columns)]
+        for _, row in df.iterrows():
+            expected.append([
+                Paragraph(str(val), cell_style) if len(str(val)) > threshold else str(val)
+                for val in row.values
+            ])
+        Table(expected, repeatRows=1).setStyle(table_style)
+        row_wise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = factory.create_table(
+            {"dataSource": "ledger", "style": "salesTable", "wrapThreshold": threshold}, {"ledger": df}
+        )
+        column_wise = time.perf_counter() - start
+
+        assert len(table._cellvalues) == len(expected)
+        print(f"  {rows:>7} 行  iterrows {row_wise:6.2f}s  create_table {column_wise:6.2f}s  "
+              f"加速比 {row_wise / column_wise:.1f}x")
+    print()
+
+
+def benchmark_chunked_table(row_counts=(2_000, 5_000, 10_000), chunk_rows: int = 100):
+    """对比：一个 Table vs chunkRows 分块布局的长表格（一个 Table 在每个分页处复制剩余的行，耗时随行数平方增长）"""
+    print(f"基准测试: 长表格分块布局（chunkRows={chunk_rows}）")
+    for rows in row_counts:
+        data = _make_ledger_data(rows)
+        line = f"  {rows:>6} 行:"
+        for label, chunk in (("Table", 0), ("分块", chunk_rows)):
+            config = _make_sales_config()
+            config["elements"] = [{
+                "type": "table",
+                "dataSource": "ledger",
+                "style": "salesTable",
+                "columnWidths": [0.8, 1.8, 1, 3],
+                "chunkRows": chunk,
+            }]
+            generator = PDFReportGenerator(config_dict=config)
+            generator.add_data_source("ledger", data)
+            start = time.perf_counter()
+            generator.to_bytes()
+            line += f"  {label} {time.perf_counter() - start:6.2f}s"
+        print(line)
+    print()
+
+
+def benchmark_auto_column_widths(row_counts=(1_000, 5_000)):
+    """对比：ReportLab 测量每个单元格 vs autoColumnWidths 按字体度量估算列宽（创建表格并完成第一次布局）"""
+    print("基准测试: 表格列宽估算")
+    generator = PDFReportGenerator(config_dict=_make_sales_config())
+    factory = generator.element_factory
+    frame_width, frame_height = 451.0, 697.0
+
+    for rows in row_counts:
+        data = {"ledger": _make_ledger_data(rows)}
+        line = f"  {rows:>6} 行:"
+        for label, auto in (("测量", False), ("估算", True)):
+            start = time.perf_counter()
+            table = factory.create_table({
+                "dataSource": "ledger",
+                "style": "salesTable",
+                "autoColumnWidths": auto,
+            }, data)
+            width, _ = table.wrap(frame_width, frame_height)
+            line += f"  {label} {time.perf_counter() - start:5.2f}s（宽 {width:.0f}/{frame_width:.0f}pt）"
+        print(line)
+    print()
+
+
+def benchmark_conditional_formats(row_counts=(5_000, 20_000), chunk_rows: int = 100):
+    """对比：每个命中单元格一条样式命令 vs conditionalFormats 合并为矩形区域（分块布局整个表格）"""
+    from reportlab.platypus import SimpleDocTemplate
+    from pdf_generator.core.chunked_table import ChunkedTable
+    from pdf_generator.utils.conditional_format import evaluate_rule, mask_to_ranges
+
+    print("基准测试: 表格条件格式")
+    generator = PDFReportGenerator(config_dict=_make_sales_config())
+    parse_color = generator.style_manager.parse_color
+    rules = [
+        {"column": "余额", "operator": "<", "value": 0, "textColor": "#C00000"},
+        {"columns": ["金额", "余额"], "top": 50, "background": "#FFF2CC"},
+    ]
+
+    for rows in row_counts:
+        rng = np.random.default_rng(0)
+        amounts = rng.normal(0, 300, rows).round(2)
+        df = pd.DataFrame({"序号": np.arange(rows), "金额": amounts, "余额": np.cumsum(amounts).round(2)})
+        table_data = [list(df.columns)] + df.astype(str).values.tolist()
+        base_commands = generator.style_manager.get_table_style("salesTable").getCommands()
+
+        line = f"  {rows:>6} 行:"
+        for label, merge in (("逐个单元格", False), ("合并区域", True)):
+            start = time.perf_counter()
+            commands = []
+            for rule in rules:
+                mask = evaluate_rule(df, list(df.columns), rule)
+                if merge:
+                    ranges = mask_to_ranges(mask)
+                else:
+                    ranges = [(c, r, c, r) for r, c in zip(*np.nonzero(mask))]
+                for key, op in (("background", "BACKGROUND"), ("textColor", "TEXTCOLOR")):
+                    if key in rule:
+                        color = parse_color(rule[key])
+                        commands.extend((op, (c0, r0 + 1), (c1, r1 + 1), color) for c0, r0, c1, r1 in ranges)
+            table = ChunkedTable(table_data, base_commands + commands, chunk_rows)
+            SimpleDocTemplate(io.BytesIO()).build([table])
+            line += f"  {label} {time.perf_counter() - start:5.2f}s（{len(commands)} 条命令）"
+        print(line)
+    print()
+
+
+def benchmark_row_striping(row_counts=(5_000, 20_000), chunk_rows: int = 100):
+    """对比：每行一条 BACKGROUND 命令 vs 一条 ROWBACKGROUNDS 命令为整个长表格设置交替行背景色（分块布局）"""
+    from reportlab.platypus import SimpleDocTemplate
+    from pdf_generator.core.chunked_table import ChunkedTable
+    from pdf_generator.utils.conditional_format import group_band_commands
+
+    print("基准测试: 长表格交替行背景色")
+    generator = PDFReportGenerator(config_dict=_make_sales_config())
+    style_manager = generator.style_manager
+    colors = ["#ECF0F1", "#FFFFFF"]
+    striped = style_manager.create_table_style("striped", {"gridColor": "#BDC3C7", "rowBackground": colors})
+    plain = style_manager.create_table_style("plain", {"gridColor": "#BDC3C7"})
+
+    for rows in row_counts:
+        df = _make_ledger_data(rows)
+        table_data = [list(df.columns)] + df.astype(str).values.tolist()
+        per_row = [
+            ("BACKGROUND", (0, i + 1), (-1, i + 1), style_manager.parse_color(colors[i % len(colors)]))
+            for i in range(rows)
+        ]
+        # 分组底色：按日期（天）分组
+        df["日"] = df["日期"].dt.date
+        banding = group_band_commands(df, list(df.columns), {"column": "日"}, style_manager.parse_color)
+
+        line = f"  {rows:>6} 行:"
+        for label, commands in (("逐行命令", plain.getCommands() + per_row),
+                                ("ROWBACKGROUNDS", striped.getCommands()),
+                                ("分组底色", plain.getCommands() + banding)):
+            start = time.perf_counter()
+            SimpleDocTemplate(io.BytesIO()).build([ChunkedTable(table_data, commands, chunk_rows)])
+            line += f"  {label} {time.perf_counter() - start:5.2f}s（{len(commands)} 条命令）"
+        print(line)
+    print()
+
+
+def benchmark_downsampling(points: int = 200_000):
+    """对比：大数据量折线图/散点图 原始数据 vs 自动降采样"""
+    print(f"基准测试: 图表降采样（{points} 个数据点）")
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "时间": pd.date_range("2024-01-01", periods=points, freq="s"),
+        "延迟": np.cumsum(rng.normal(size=points)),
+        "负载": rng.normal(size=points),
+    })
+
+    for max_points in (0, None):
+        elements = []
+        for chart_type, x_col in (("line", "时间"), ("scatter", "负载")):
+            element = {
+                "type": "chart",
+                "chartType": chart_type,
+                "dataSource": "metrics",
+                "xAxis": x_col,
+                "yAxis": "延迟",
+                "showLegend": False
+            }
+            if max_points is not None:
+                element["maxPoints"] = max_points
+            elements.append(element)
+        generator = PDFReportGenerator(config_dict={"metadata": {"title": "降采样"}, "elements": elements})
+        generator.add_data_source("metrics", data)
+        start = time.perf_counter()
+        pdf_bytes = generator.to_bytes()
+        elapsed = time.perf_counter() - start
+        _, profile = generator.generate(return_bytes=True, profile=True)
+        dropped = sum(element.get("dropped_points", 0) for element in profile.elements)
+        label = "原始数据" if max_points == 0 else "自动降采样"
+        print(f"  {label:<8} {elapsed:.2f}s  {len(pdf_bytes) / 1024:.0f}KB  丢弃 {dropped} 个点")
+    print()
+
+
+# 在新解释器中测量导入耗时和首份报告延迟，并检查哪些重量级依赖被加载
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from pdf_generator import PDFReportGenerator
+import_time = time.perf_counter() - start
+heavy = ("matplotlib", "sqlalchemy", "requests", "fastapi", "uvicorn")
+loaded_after_import = [name for name in heavy if name in sys.modules]
+start = time.perf_counter()
+PDFReportGenerator(config_dict=json.loads(sys.argv[1])).to_bytes()
+first_report = time.perf_counter() - start
+print(json.dumps({
+    "import_time": import_time,
+    "first_report": first_report,
+    "loaded_after_import": loaded_after_import,
+    "loaded_after_report": [name for name in heavy if name in sys.modules],
+}))
+"""
+
+
+def benchmark_startup(runs: int = 3):
+    """冷启动：导入耗时和首份报告（纯文本，无图表和数据库）的延迟
+
+    matplotlib、SQLAlchemy、requests 和 API 依赖应当在用到时才导入，
+    导入 pdf_generator 或生成纯文本报告后出现在 sys.modules 中即视为回退。
+    """
+    print(f"基准测试: 冷启动（{runs} 次新进程取最小值）")
+    config = {
+        "metadata": {"title": "冷启动"},
+        "elements": [{"type": "heading", "text": "标题", "level": 1}, {"type": "text", "content": "正文"}]
+    }
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT, json.dumps(config)],
+            capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"  import pdf_generator: {min(r['import_time'] for r in results) * 1000:.0f}ms")
+    print(f"  首份报告:             {min(r['first_report'] for r in results) * 1000:.0f}ms")
+    loaded = sorted(set(results[-1]['loaded_after_import']) | set(results[-1]['loaded_after_report']))
+    if loaded:
+        print(f"  警告: 不需要的重量级依赖被加载: {', '.join(loaded)}\n")
+    else:
+        print("  未加载 matplotlib / SQLAlchemy / requests / API 依赖\n")
+
+
+def benchmark_font_registry(count: int = 5):
+    """同一进程内连续创建生成器：字体只在第一次扫描和解析，之后的构造接近零开销"""
+    print(f"基准测试: 连续创建 {count} 个生成器（含图表生成器）")
+    config = _make_sales_config()
+    for i in range(count):
+        start = time.perf_counter()
+        generator = PDFReportGenerator(config_dict=config)
+        constructed = time.perf_counter() - start
+        generator.element_factory.chart_generator
+        with_charts = time.perf_counter() - start
+        print(f"  第 {i + 1} 个: 构造 {constructed * 1000:7.1f}ms  含图表生成器 {with_charts * 1000:7.1f}ms")
+    print()
+
+
+
+_FONT_REGISTRATION_SCRIPT = """
+import json, time
+from pdf_generator.core.styles import StyleManager
+start = time.perf_counter()
+StyleManager()
+print(json.dumps({"elapsed": time.perf_counter() - start}))
+"""
+
+
+def benchmark_font_cache(runs: int = 3):
+    """新进程中注册字体的耗时：直接解析TTF vs 从字体度量缓存加载"""
+    print(f"基准测试: 新进程注册字体（{runs} 次取最小值）")
+
+    def run(env):
+        results = []
+        for _ in range(runs):
+            completed = subprocess.run(
+                [sys.executable, "-c", _FONT_REGISTRATION_SCRIPT],
+                capture_output=True, text=True, check=True, env=env
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1])['elapsed'])
+        return min(results)
+
+    env = {k: v for k, v in os.environ.items() if k != "PDF_GENERATOR_FONT_CACHE_DIR"}
+    without_cache = run(env)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env["PDF_GENERATOR_FONT_CACHE_DIR"] = cache_dir
+        # 第一次运行写入缓存
+        run(env)
+        with_cache = run(env)
+
+    print(f"  无缓存: {without_cache * 1000:.1f}ms")
+    print(f"  有缓存: {with_cache * 1000:.1f}ms")
+    if with_cache > 0:
+        print(f"  加速比: {without_cache / with_cache:.1f}x\n")
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("性能基准测试")
+    print("=" * 70)
+    print()
+
+    benchmark_profile()
+    benchmark_batch()
+    benchmark_parallel()
+    benchmark_page_streaming()
+    benchmark_toc()
+    benchmark_result_cache()
+    benchmark_chart_cache()
+    benchmark_chart_workers()
+    benchmark_chart_engine()
+    benchmark_chart_format()
+    benchmark_chart_codec()
+    benchmark_chart_threads()
+    benchmark_chart_dpi()
+    benchmark_table_conversion()
+    benchmark_chunked_table()
+    benchmark_auto_column_widths()
+    benchmark_conditional_formats()
+    benchmark_row_striping()
+    benchmark_downsampling()
+    benchmark_startup()
+    benchmark_font_registry()
+    benchmark_font_cache()
@@ -7,17 +7,26 @@ Basic Usage:
     >>> generator = PDFReportGenerator(config_dict=config)
     >>> generator.generate("output.pdf")
 
+Batch Usage:
+    >>> from pdf_generator import CompiledReport
+    >>> report = CompiledReport(config_dict=config)
+    >>> report.generate_batch({"a": {"sales": df_a}, "b": {"sales": df_b}}, "output/")
+
 API Server Usage:
     >>> from pdf_generator import start_api_server
     >>> start_api_server(host="localhost", port=8080)
 """
 
 from pdf_generator.core.generator import PDFReportGenerator
+from pdf_generator.core.batch import CompiledReport, generate_batch
+from pdf_generator.core.parallel import ParallelReportRunner
+from pdf_generator.utils.result_cache import ReportCache
+from pdf_generator.utils.chart_cache import ChartCache
 
 __version__ = "0.1.1"
 
 # 主要导出
-__all__ = ["PDFReportGenerator"]
+__all__ = ["PDFReportGenerator", "CompiledReport", "generate_batch", "ParallelReportRunner", "ReportCache", "ChartCache"]
 
 # 尝试导入 API 服务器功能（可选依赖）
 try:
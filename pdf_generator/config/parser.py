@@ -1,7 +1,8 @@
 """配置文件解析器"""
 
 import json
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, Optional, Set
 from pathlib import Path
 from jinja2 import Template
 
@@ -11,6 +12,14 @@ from pdf_generator.config.validator import ConfigValidator
 class ConfigParser:
     """解析和处理JSON配置文件"""
     
+    # 模板中对数据源的引用：dataSources.name 或 dataSources['name']
+    DATA_SOURCE_REF_PATTERN = re.compile(
+        r"dataSources\s*(?:\.\s*(\w+)|\[\s*['\"]([^'\"]+)['\"]\s*\])?"
+    )
+    
+    # 通过这些方法访问 dataSources 时无法确定具体使用了哪些数据源
+    DICT_METHODS = {'items', 'keys', 'values', 'get'}
+    
     def __init__(self, config_path: Optional[str] = None, config_dict: Optional[Dict[str, Any]] = None):
         """
         初始化配置解析器
@@ -116,6 +125,57 @@ class ConfigParser:
         
         return processed
     
+    def get_referenced_data_sources(self) -> Optional[Set[str]]:
+        """扫描配置，找出实际被引用的数据源
+        
+        检查元素、封面、页眉页脚、目录和元数据中的：
+        - 'dataSource' 字段（表格、图表等）
+        - 模板字符串中的 dataSources.x / dataSources['x'] 引用
+        
+        Returns:
+            被引用的数据源名称集合；如果存在无法静态确定的引用
+            （如 dataSources.items()、dataSources[变量]），返回None表示需要全部数据源
+        """
+        referenced: Set[str] = set()
+        sections = [
+            self.get_elements(),
+            self.config.get('coverPage', {}),
+            self.config.get('pageTemplate', {}),
+            self.config.get('toc', {}),
+            self.config.get('metadata', {}),
+        ]
+        
+        for section in sections:
+            if not self._collect_data_source_refs(section, referenced):
+                return None
+        
+        return referenced
+    
+    def _collect_data_source_refs(self, value: Any, referenced: Set[str]) -> bool:
+        """递归收集数据源引用
+        
+        Returns:
+            False表示遇到无法静态确定的引用
+        """
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == 'dataSource' and isinstance(item, str):
+                    referenced.add(item)
+                elif not self._collect_data_source_refs(item, referenced):
+                    return False
+        elif isinstance(value, list):
+            for item in value:
+                if not self._collect_data_source_refs(item, referenced):
+                    return False
+        elif isinstance(value, str) and 'dataSources' in value:
+            for match in self.DATA_SOURCE_REF_PATTERN.finditer(value):
+                name = match.group(1) or match.group(2)
+                if not name or name in self.DICT_METHODS:
+                    return False
+                referenced.add(name)
+        
+        return True
+    
     def get_full_config(self) -> Dict[str, Any]:
         """获取完整配置"""
         return self.config
@@ -1,5 +1,6 @@
 """配置文件验证器"""
 
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 
@@ -10,7 +11,11 @@ class ConfigValidator:
     VALID_ORIENTATIONS = ['portrait', 'landscape']
     VALID_ELEMENT_TYPES = ['text', 'heading', 'table', 'chart', 'image', 'spacer', 'pagebreak', 'list']
     VALID_CHART_TYPES = ['bar', 'line', 'pie', 'scatter', 'area']
+    VALID_CHART_ENGINES = ['matplotlib', 'native']
+    VALID_CHART_FORMATS = ['png', 'vector']
+    VALID_CHART_IMAGE_CODECS = ['png', 'flate', 'jpeg']
     VALID_DATA_SOURCE_TYPES = ['json', 'csv', 'excel', 'database', 'api', 'inline']
+    VALID_CONDITION_OPERATORS = ['<', '<=', '>', '>=', '==', '!=', 'between']
     
     def __init__(self):
         self.errors: List[str] = []
@@ -59,6 +64,45 @@ class ConfigValidator:
             self.errors.append(
                 f"Invalid orientation '{orientation}'. Must be one of {self.VALID_ORIENTATIONS}"
             )
+        
+        # 数据源加载超时
+        if 'dataSourceTimeout' in metadata and not self._is_positive_number(metadata['dataSourceTimeout']):
+            self.errors.append("metadata.dataSourceTimeout must be a positive number (seconds)")
+        
+        # 默认图表引擎
+        if 'chartEngine' in metadata and metadata['chartEngine'] not in self.VALID_CHART_ENGINES:
+            self.errors.append(
+                f"Invalid metadata.chartEngine '{metadata['chartEngine']}'. "
+                f"Must be one of {self.VALID_CHART_ENGINES}"
+            )
+        
+        # matplotlib图表的默认输出格式
+        if 'chartFormat' in metadata and metadata['chartFormat'] not in self.VALID_CHART_FORMATS:
+            self.errors.append(
+                f"Invalid metadata.chartFormat '{metadata['chartFormat']}'. "
+                f"Must be one of {self.VALID_CHART_FORMATS}"
+            )
+        
+        # matplotlib位图的默认嵌入编码
+        if 'chartImageCodec' in metadata and metadata['chartImageCodec'] not in self.VALID_CHART_IMAGE_CODECS:
+            self.errors.append(
+                f"Invalid metadata.chartImageCodec '{metadata['chartImageCodec']}'. "
+                f"Must be one of {self.VALID_CHART_IMAGE_CODECS}"
+            )
+        
+        # matplotlib位图的默认目标分辨率
+        if 'chartTargetDpi' in metadata and not self._is_positive_number(metadata['chartTargetDpi']):
+            self.errors.append("metadata.chartTargetDpi must be a positive number")
+        
+        # 固定的生成时间（确定性输出）
+        if 'creationDate' in metadata:
+            try:
+                datetime.fromisoformat(str(metadata['creationDate']))
+            except ValueError:
+                self.errors.append(
+                    f"Invalid metadata.creationDate '{metadata['creationDate']}'. "
+                    f"Must be an ISO 8601 date or datetime"
+                )
     
     def _validate_styles(self, styles: Dict[str, Any]):
         """验证样式配置"""
@@ -76,6 +120,17 @@ class ConfigValidator:
                             f"Invalid color format '{color}' in style '{style_name}'"
                         )
             
+            # 交替行/列背景色
+            row_background = style_config.get('rowBackground')
+            if isinstance(row_background, list) and not self._is_valid_color_cycle(row_background):
+                self.errors.append(
+                    f"Invalid rowBackground in style '{style_name}': must be a non-empty list of colors or null"
+                )
+            if 'columnBackground' in style_config and not self._is_valid_color_cycle(style_config['columnBackground']):
+                self.errors.append(
+                    f"Invalid columnBackground in style '{style_name}': must be a non-empty list of colors or null"
+                )
+            
             # 验证水平对齐方式
             if 'alignment' in style_config:
                 alignment = style_config['alignment']
@@ -140,6 +195,11 @@ class ConfigValidator:
                 self.errors.append(
                     f"Data source '{name}' of type 'database' requires 'query' field"
                 )
+            
+            if 'fetchTimeout' in source and not self._is_positive_number(source['fetchTimeout']):
+                self.errors.append(
+                    f"Data source '{name}': 'fetchTimeout' must be a positive number (seconds)"
+                )
     
     def _validate_elements(self, elements: List[Dict[str, Any]]):
         """验证PDF元素配置"""
@@ -176,6 +236,24 @@ class ConfigValidator:
                         f"Table element at index {idx} requires either 'dataSource' or 'data' field"
                     )
                 
+                chunk_rows = element.get('chunkRows')
+                if chunk_rows is not None and not (
+                    isinstance(chunk_rows, int) and not isinstance(chunk_rows, bool) and chunk_rows >= 0
+                ):
+                    self.errors.append(
+                        f"Table element at index {idx}: chunkRows must be a non-negative integer"
+                    )
+                
+                if 'autoColumnWidths' in element and not isinstance(element['autoColumnWidths'], bool):
+                    self.errors.append(
+                        f"Table element at index {idx}: autoColumnWidths must be a boolean"
+                    )
+                for key in ('minColumnWidth', 'maxColumnWidth'):
+                    if key in element and not self._is_positive_number(element[key]):
+                        self.errors.append(
+                            f"Table element at index {idx}: {key} must be a positive number (inches)"
+                        )
+                
                 # 验证mergedCells格式
                 if 'mergedCells' in element:
                     merged_cells = element['mergedCells']
@@ -191,6 +269,14 @@ class ConfigValidator:
                                     f"[startRow, startCol, endRow, endCol]"
                                 )
                 
+                # 验证groupBanding格式
+                if 'groupBanding' in element:
+                    self._validate_group_banding(element['groupBanding'], idx)
+                
+                # 验证conditionalFormats格式
+                if 'conditionalFormats' in element:
+                    self._validate_conditional_formats(element['conditionalFormats'], idx)
+                
                 # 验证cellAlignments格式
                 if 'cellAlignments' in element:
                     cell_alignments = element['cellAlignments']
@@ -269,6 +355,45 @@ class ConfigValidator:
                 
                 if 'dataSource' not in element:
                     self.errors.append(f"Chart element at index {idx} requires 'dataSource' field")
+                
+                if 'engine' in element and element['engine'] not in self.VALID_CHART_ENGINES:
+                    self.errors.append(
+                        f"Invalid chart engine '{element['engine']}' at index {idx}. "
+                        f"Must be one of {self.VALID_CHART_ENGINES}"
+                    )
+                
+                if 'format' in element and element['format'] not in self.VALID_CHART_FORMATS:
+                    self.errors.append(
+                        f"Invalid chart format '{element['format']}' at index {idx}. "
+                        f"Must be one of {self.VALID_CHART_FORMATS}"
+                    )
+                
+                max_points = element.get('maxPoints')
+                if max_points is not None and not (
+                    isinstance(max_points, int) and not isinstance(max_points, bool) and max_points >= 0
+                ):
+                    self.errors.append(
+                        f"Chart element at index {idx}: maxPoints must be a non-negative integer"
+                    )
+                
+                if 'imageCodec' in element and element['imageCodec'] not in self.VALID_CHART_IMAGE_CODECS:
+                    self.errors.append(
+                        f"Invalid chart image codec '{element['imageCodec']}' at index {idx}. "
+                        f"Must be one of {self.VALID_CHART_IMAGE_CODECS}"
+                    )
+                
+                quality = element.get('jpegQuality')
+                if quality is not None and not (
+                    isinstance(quality, int) and not isinstance(quality, bool) and 1 <= quality <= 95
+                ):
+                    self.errors.append(
+                        f"Chart element at index {idx}: jpegQuality must be an integer between 1 and 95"
+                    )
+                
+                if 'targetDpi' in element and not self._is_positive_number(element['targetDpi']):
+                    self.errors.append(
+                        f"Chart element at index {idx}: targetDpi must be a positive number"
+                    )
             
             if element_type == 'image' and 'path' not in element:
                 self.errors.append(f"Image element at index {idx} requires 'path' field")
@@ -279,6 +404,9 @@ class ConfigValidator:
             self.errors.append("pageTemplate must be a dictionary")
             return
         
+        if 'streamPages' in page_template and not isinstance(page_template['streamPages'], bool):
+            self.errors.append("pageTemplate.streamPages must be a boolean")
+        
         # 验证页眉
         if 'header' in page_template:
             self._validate_header_footer_section(page_template['header'], 'header')
@@ -314,6 +442,12 @@ class ConfigValidator:
             self.errors.append("toc must be a dictionary")
             return
         
+        if 'strategy' in toc and toc['strategy'] not in ['multiBuild', 'singlePass']:
+            self.errors.append(
+                f"Invalid toc.strategy: {toc['strategy']}. "
+                f"Must be 'multiBuild' or 'singlePass'"
+            )
+        
         # 验证手动条目
         if 'entries' in toc:
             entries = toc['entries']
@@ -376,6 +510,66 @@ class ConfigValidator:
                     if elem_type == 'image' and 'path' not in elem:
                         self.errors.append(f"coverPage.elements[{idx}] (image) requires 'path' field")
     
+    def _validate_group_banding(self, banding: Any, idx: int):
+        """验证表格的分组底色配置"""
+        name = f"Table element at index {idx}: groupBanding"
+        if not isinstance(banding, dict):
+            self.errors.append(f"{name} must be a dictionary")
+            return
+        
+        if 'column' not in banding and 'columns' not in banding:
+            self.errors.append(f"{name} requires 'column' or 'columns' field")
+        elif 'columns' in banding and not isinstance(banding['columns'], list):
+            self.errors.append(f"{name}.columns must be a list")
+        
+        if 'colors' in banding and not self._is_valid_color_cycle(banding['colors']):
+            self.errors.append(f"{name}.colors must be a non-empty list of #RRGGBB colors or null")
+    
+    def _validate_conditional_formats(self, rules: Any, idx: int):
+        """验证表格的条件格式规则"""
+        prefix = f"Table element at index {idx}"
+        if not isinstance(rules, list):
+            self.errors.append(f"{prefix}: 'conditionalFormats' must be a list")
+            return
+        
+        for i, rule in enumerate(rules):
+            name = f"{prefix}: conditionalFormats[{i}]"
+            if not isinstance(rule, dict):
+                self.errors.append(f"{name} must be a dictionary")
+                continue
+            
+            if 'columns' in rule and not isinstance(rule['columns'], list):
+                self.errors.append(f"{name}.columns must be a list")
+            
+            # 条件：operator、top、bottom 三选一
+            conditions = [key for key in ('operator', 'top', 'bottom') if key in rule]
+            if len(conditions) != 1:
+                self.errors.append(f"{name} requires exactly one of 'operator', 'top' or 'bottom'")
+            elif 'operator' in rule:
+                operator = rule['operator']
+                if operator not in self.VALID_CONDITION_OPERATORS:
+                    self.errors.append(
+                        f"{name}.operator must be one of {self.VALID_CONDITION_OPERATORS}"
+                    )
+                elif operator == 'between':
+                    value = rule.get('value')
+                    if not (isinstance(value, list) and len(value) == 2
+                            and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+                        self.errors.append(f"{name}.value must be [low, high] for 'between'")
+                elif 'value' not in rule:
+                    self.errors.append(f"{name} requires 'value' field")
+            else:
+                n = rule[conditions[0]]
+                if not (isinstance(n, int) and not isinstance(n, bool) and n > 0):
+                    self.errors.append(f"{name}.{conditions[0]} must be a positive integer")
+            
+            # 格式：背景色和文字颜色至少一个
+            if 'background' not in rule and 'textColor' not in rule:
+                self.errors.append(f"{name} requires 'background' or 'textColor'")
+            for key in ('background', 'textColor'):
+                if key in rule and not self._is_valid_color(rule[key]):
+                    self.errors.append(f"{name}.{key} must be a color in #RRGGBB format")
+    
     def _is_valid_color(self, color: str) -> bool:
         """验证颜色格式（支持#RRGGBB）"""
         if not isinstance(color, str):
@@ -392,6 +586,17 @@ class ConfigValidator:
         
         return False
     
+    def _is_valid_color_cycle(self, color_list: Any) -> bool:
+        """验证交替颜色列表（#RRGGBB 或 null，至少一个颜色）"""
+        return (
+            isinstance(color_list, list) and len(color_list) > 0
+            and all(color is None or self._is_valid_color(color) for color in color_list)
+        )
+    
+    def _is_positive_number(self, value: Any) -> bool:
+        """验证是否为正数"""
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+    
     def get_errors(self) -> List[str]:
         """获取所有错误"""
         return self.errors
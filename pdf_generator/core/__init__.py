@@ -3,6 +3,15 @@
 from pdf_generator.core.generator import PDFReportGenerator
 from pdf_generator.core.styles import StyleManager
 from pdf_generator.core.elements import ElementFactory
+from pdf_generator.core.batch import CompiledReport, generate_batch
+from pdf_generator.core.parallel import ParallelReportRunner
 
-__all__ = ["PDFReportGenerator", "StyleManager", "ElementFactory"]
+__all__ = [
+    "PDFReportGenerator",
+    "StyleManager",
+    "ElementFactory",
+    "CompiledReport",
+    "generate_batch",
+    "ParallelReportRunner",
+]
 
@@ -0,0 +1,233 @@
+"""批量报告生成
+
+同一份报告布局需要针对大量数据集重复渲染时（例如为每个客户生成对账单），
+每次都新建 PDFReportGenerator 会重复解析/验证配置、注册字体、创建图表生成器。
+CompiledReport 只做一次这些准备工作，之后对每个数据集只执行内容构建和PDF输出。
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Union, Callable, Iterable, Mapping, Tuple
+
+import pandas as pd
+
+from pdf_generator.core.generator import PDFReportGenerator
+from pdf_generator.utils.result_cache import ReportCache
+from pdf_generator.utils.chart_cache import ChartCache
+from pdf_generator.utils.chart_pool import ChartRenderPool
+
+
+# 数据集：数据源名称 -> 数据（DataFrame、字典或列表）
+DataSet = Mapping[str, Union[pd.DataFrame, dict, list]]
+
+# 输出接收函数：(key, pdf_bytes) -> None
+OutputSink = Callable[[str, bytes], None]
+
+
+class CompiledReport:
+    """预编译的报告
+
+    配置解析、样式与字体注册、元素工厂和配置中声明的数据源只在构造时处理一次，
+    之后可以用不同的数据集反复渲染。
+
+    Example:
+        >>> report = CompiledReport(config_path="templates/sales_report.json")
+        >>> summary = report.generate_batch(
+        ...     {"customer_1": {"sales_data": df1}, "customer_2": {"sales_data": df2}},
+        ...     "output/"
+        ... )
+        >>> print(summary['throughput'])
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        config_dict: Optional[Dict[str, Any]] = None,
+        font_dirs: Optional[list] = None,
+        result_cache: Optional[ReportCache] = None,
+        chart_cache: Optional[ChartCache] = None,
+        chart_workers: Optional[int] = None,
+        chart_pool: Optional[ChartRenderPool] = None
+    ):
+        """
+        初始化预编译报告
+
+        Args:
+            config_path: JSON配置文件路径
+            config_dict: 配置字典（直接传入）
+            font_dirs: 字体文件目录列表
+            result_cache: 生成结果缓存，数据相同的数据集直接使用缓存的PDF
+            chart_cache: 图表渲染缓存，图表用到的数据列相同的数据集直接使用缓存的图表
+            chart_workers: 并行渲染图表的进程数（进程池在所有数据集之间复用，close() 时关闭）
+            chart_pool: 外部创建的图表渲染进程池，提供时忽略 chart_workers，由创建者负责关闭
+        """
+        start = time.perf_counter()
+        self.generator = PDFReportGenerator(
+            config_path=config_path,
+            config_dict=config_dict,
+            font_dirs=font_dirs,
+            result_cache=result_cache,
+            chart_cache=chart_cache,
+            chart_workers=chart_workers,
+            chart_pool=chart_pool
+        )
+        # 配置中声明且被引用的数据源在这里加载一次，作为所有数据集共享的基础数据
+        # （按需加载时构造生成器并不会加载数据源，直接复制字典只会得到空的快照）
+        self.generator._prefetch_data_sources()
+        self._base_data_sources: Dict[str, pd.DataFrame] = self.generator.data_sources.loaded()
+        self.compile_time = time.perf_counter() - start
+
+    def _apply_data_set(self, data: Optional[DataSet]):
+        """将数据集应用到生成器
+
+        原地更新数据源字典，使页眉页脚等持有该字典引用的组件同步看到新数据。
+        数据集中的同名数据源会覆盖配置中声明的数据源。
+        """
+        data_sources = self.generator.data_sources
+        data_sources.clear()
+        data_sources.update(self._base_data_sources)
+
+        if data:
+            for name, value in data.items():
+                self.generator.add_data_source(name, value)
+
+    def render(
+        self,
+        data: Optional[DataSet] = None,
+        output_path: Optional[str] = None
+    ) -> Optional[bytes]:
+        """使用指定数据集渲染一份报告
+
+        Args:
+            data: 数据集（数据源名称 -> 数据），为None时只使用配置中的数据源
+            output_path: 输出文件路径（可选）
+
+        Returns:
+            未指定output_path时返回PDF字节流；否则返回None
+        """
+        self._apply_data_set(data)
+
+        if output_path:
+            self.generator.generate(output_path=output_path)
+            return None
+
+        return self.generator.to_bytes()
+
+    def generate_batch(
+        self,
+        data_sets: Union[Mapping[str, DataSet], Iterable[Union[DataSet, Tuple[str, DataSet]]]],
+        output: Union[str, Path, OutputSink, None] = None,
+        filename_template: str = "{key}.pdf"
+    ) -> Dict[str, Any]:
+        """批量渲染
+
+        单个数据集渲染失败不会中断整个批次，错误会记录在对应条目的结果中。
+
+        Args:
+            data_sets: 数据集集合，支持：
+                - 字典：key -> 数据集
+                - 可迭代对象：元素为 (key, 数据集) 或数据集（key为序号）
+            output: 输出位置，支持：
+                - 目录路径：每份报告写入 目录/filename_template
+                - 可调用对象：以 (key, pdf_bytes) 调用
+                - None：PDF字节流保存在结果条目的 'bytes' 字段中
+            filename_template: 输出文件名模板（输出到目录时使用），可用变量 {key}
+
+        Returns:
+            批次摘要字典：
+                - total / succeeded / failed: 数量统计
+                - compile_time: 预编译耗时（秒）
+                - elapsed: 批次渲染总耗时（秒）
+                - throughput: 吞吐量（成功份数/秒）
+                - items: 每个数据集的结果（key、success、elapsed、size、output/bytes/error）
+        """
+        output_dir = None
+        sink = None
+        if isinstance(output, (str, Path)):
+            output_dir = Path(output)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        elif callable(output):
+            sink = output
+
+        items = []
+        batch_start = time.perf_counter()
+
+        for key, data in self._iter_data_sets(data_sets):
+            item: Dict[str, Any] = {'key': key, 'success': False}
+            item_start = time.perf_counter()
+
+            try:
+                pdf_bytes = self.render(data)
+                item['size'] = len(pdf_bytes)
+
+                if output_dir is not None:
+                    file_path = output_dir / filename_template.format(key=key)
+                    with open(file_path, 'wb') as f:
+                        f.write(pdf_bytes)
+                    item['output'] = str(file_path)
+                elif sink is not None:
+                    sink(key, pdf_bytes)
+                else:
+                    item['bytes'] = pdf_bytes
+
+                item['success'] = True
+            except Exception as e:
+                print(f"Warning: Failed to render batch item '{key}': {e}")
+                item['error'] = str(e)
+
+            item['elapsed'] = time.perf_counter() - item_start
+            items.append(item)
+
+        elapsed = time.perf_counter() - batch_start
+        succeeded = sum(1 for item in items if item['success'])
+
+        return {
+            'total': len(items),
+            'succeeded': succeeded,
+            'failed': len(items) - succeeded,
+            'compile_time': self.compile_time,
+            'elapsed': elapsed,
+            'throughput': succeeded / elapsed if elapsed > 0 else 0.0,
+            'items': items,
+        }
+
+    def close(self):
+        """释放资源（关闭 chart_workers 创建的图表渲染进程池）"""
+        self.generator.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _iter_data_sets(data_sets) -> Iterable[Tuple[str, Optional[DataSet]]]:
+        """将各种形式的数据集集合统一为 (key, 数据集) 序列"""
+        if isinstance(data_sets, Mapping):
+            for key, data in data_sets.items():
+                yield str(key), data
+            return
+
+        for index, entry in enumerate(data_sets):
+            if isinstance(entry, tuple) and len(entry) == 2:
+                key, data = entry
+                yield str(key), data
+            else:
+                yield str(index), entry
+
+
+def generate_batch(
+    data_sets: Union[Mapping[str, DataSet], Iterable[Union[DataSet, Tuple[str, DataSet]]]],
+    output: Union[str, Path, OutputSink, None] = None,
+    config_path: Optional[str] = None,
+    config_dict: Optional[Dict[str, Any]] = None,
+    font_dirs: Optional[list] = None,
+    filename_template: str = "{key}.pdf"
+) -> Dict[str, Any]:
+    """批量生成报告的便捷函数
+
+    等价于 CompiledReport(config_path, config_dict, font_dirs).generate_batch(...)
+    """
+    report = CompiledReport(config_path=config_path, config_dict=config_dict, font_dirs=font_dirs)
+    return report.generate_batch(data_sets, output, filename_template=filename_template)
@@ -0,0 +1,255 @@
+"""分块长表格
+
+一个 Table 包含几万行时，ReportLab 会为每个单元格创建样式对象并测量，之后在每个分页处把剩余的
+所有行复制成新表格再次分割，布局耗时随行数平方增长，内存也与整个表格成正比。
+
+ChunkedTable 只保存单元格数据和样式命令，布局时每次只用接下来的 chunk_rows 行创建普通 Table：
+
+- 表头（repeatRows 行）只出现在表格开头和每页顶部，同一页中相邻的块之间不重复表头
+- 所有块使用相同的列宽（未指定列宽时使用第一块计算出的列宽）
+- 样式命令按块换算行号，负数行号仍然相对于整个表格；ROWBACKGROUNDS 的颜色顺序跨块连续，
+  与 Table 分页后相同，每页从第一个数据行重新开始
+- 跨行合并（SPAN）的单元格不会被拆到两个块中
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+from reportlab.platypus import Table, TableStyle
+from reportlab.platypus.flowables import Flowable
+
+
+class ChunkedTable(Flowable):
+    """按块布局的长表格，效果与一个 Table 相同"""
+
+    def __init__(
+        self,
+        data: List[List[Any]],
+        style_commands: Sequence[tuple],
+        chunk_rows: int,
+        colWidths=None,
+        rowHeights=None,
+        repeatRows: int = 1,
+        spaceBefore=None,
+        spaceAfter=None,
+        _start: int = 0,
+        _show_header: bool = True,
+        _page_start: int = 0,
+        _no_break: Optional[frozenset] = None,
+        **table_kwargs
+    ):
+        """
+        Args:
+            data: 表格数据（含表头行）
+            style_commands: TableStyle 命令列表，行列号相对于整个表格
+            chunk_rows: 每块的数据行数
+            colWidths / rowHeights / repeatRows / spaceBefore / spaceAfter: 同 Table
+            table_kwargs: 其他传给每块 Table 的参数（repeatCols、splitByRow、hAlign、vAlign）
+        """
+        Flowable.__init__(self)
+        self._data = data
+        self._commands = list(style_commands)
+        self._chunk_rows = max(int(chunk_rows), 1)
+        self._col_widths = colWidths
+        self._row_heights = rowHeights
+        self._header_rows = min(max(int(repeatRows), 0), len(data))
+        self._table_kwargs = table_kwargs
+        self.hAlign = table_kwargs.get('hAlign', 'CENTER')
+        self.vAlign = table_kwargs.get('vAlign', 'MIDDLE')
+        if spaceBefore is not None:
+            self.spaceBefore = spaceBefore
+        if spaceAfter is not None:
+            self.spaceAfter = spaceAfter
+
+        # 剩余部分的第一行（数据行下标，不含表头）
+        self._start = _start
+        # 第一块是否显示表头（表格开头和每页顶部）
+        self._show_header = _show_header
+        # 当前页第一个数据行（数据行下标；为0时表示表格仍在第一页）
+        self._page_start = _page_start
+        if _no_break is None:
+            _no_break = self._find_span_rows()
+        # 不能作为块起点的数据行（被跨行合并的单元格跨越）
+        self._no_break = _no_break
+        self._wrap_info = None
+        self._tables: List[Tuple[Table, float]] = []
+
+    @property
+    def _body_count(self) -> int:
+        return len(self._data) - self._header_rows
+
+    def wrap(self, availWidth, availHeight):
+        """依次测量各块，累计高度超过可用高度时停止（此时返回的高度只是下限）"""
+        self._wrap_info = (availWidth, availHeight)
+        self._tables = []
+        width = height = 0
+        start = self._start
+        show_header = self._show_header
+        while start < self._body_count or not self._tables:
+            end = self._chunk_end(start)
+            table = self._make_table(start, end, show_header)
+            w, h = table.wrap(availWidth, availHeight)
+            if self._col_widths is None:
+                # 之后的块使用第一块计算出的列宽
+                self._col_widths = list(table._colWidths)
+            self._tables.append((table, h))
+            width = max(width, w)
+            height += h
+            start = end
+            show_header = False
+            if height > availHeight:
+                break
+
+        self.width = width
+        self.height = height
+        return width, height
+
+    def draw(self):
+        """整个表格可以放在当前位置时，依次绘制各块"""
+        y = self.height
+        for table, h in self._tables:
+            y -= h
+            table.drawOn(self.canv, 0, y)
+
+    def split(self, availWidth, availHeight):
+        if self._wrap_info != (availWidth, availHeight):
+            self.wrap(availWidth, availHeight)
+
+        first, height = self._tables[0]
+        start = self._start
+        end = self._chunk_end(start)
+
+        if height <= availHeight:
+            # 第一块放得下，剩余部分在同一页中紧接着布局（不重复表头）
+            result = [first]
+            rest = self._rest(end, show_header=False, page_start=self._page_start)
+        else:
+            parts = first.split(availWidth, availHeight)
+            if not parts:
+                # 当前页一行都放不下，下一页顶部需要显示表头
+                self._show_header = True
+                self._page_start = start
+                return []
+            # 第一块只放得下一部分，其余的行从下一页开始重新分块（带表头）；
+            # 不直接使用 Table 分割出的第二部分，它在下一页仍可能再次分页
+            fitted = parts[0]._nrows - (self._header_rows if self._show_header else 0)
+            result = parts[:1]
+            rest = self._rest(start + fitted, show_header=True, page_start=start + fitted)
+
+        result[0].spaceBefore = getattr(self, 'spaceBefore', 0)
+        if rest is not None:
+            result.append(rest)
+        else:
+            result[-1].spaceAfter = getattr(self, 'spaceAfter', 0)
+        return result
+
+    def _rest(self, start: int, show_header: bool, page_start: int) -> Optional['ChunkedTable']:
+        """从数据行 start 开始的剩余部分（page_start 为剩余部分第一块所在页的第一个数据行）"""
+        if start >= self._body_count:
+            return None
+        rest = ChunkedTable(
+            self._data, self._commands, self._chunk_rows,
+            colWidths=self._col_widths,
+            rowHeights=self._row_heights,
+            repeatRows=self._header_rows,
+            spaceBefore=0,
+            spaceAfter=getattr(self, 'spaceAfter', 0),
+            _start=start,
+            _show_header=show_header,
+            _page_start=page_start,
+            _no_break=self._no_break,
+            **self._table_kwargs
+        )
+        return rest
+
+    def _chunk_end(self, start: int) -> int:
+        """从数据行 start 开始的块的结束位置（不拆开跨行合并的单元格）"""
+        end = min(start + self._chunk_rows, self._body_count)
+        while end < self._body_count and end in self._no_break:
+            end += 1
+        return end
+
+    def _make_table(self, start: int, end: int, show_header: bool) -> Table:
+        """用表头和数据行 [start, end) 创建一块表格"""
+        h = self._header_rows
+        header = list(range(h)) if show_header else []
+        rows = header + list(range(h + start, h + end))
+
+        row_heights = self._row_heights
+        if isinstance(row_heights, (list, tuple)):
+            row_heights = [row_heights[i] for i in rows if i < len(row_heights)]
+
+        table = Table(
+            [self._data[i] for i in rows],
+            colWidths=self._col_widths,
+            rowHeights=row_heights,
+            repeatRows=len(header),
+            spaceBefore=0,
+            spaceAfter=0,
+            **self._table_kwargs
+        )
+        table.setStyle(TableStyle(self._chunk_commands(len(header), start, end)))
+        return table
+
+    def _chunk_commands(self, header_count: int, start: int, end: int) -> List[tuple]:
+        """把整个表格的样式命令换算为一块的行号"""
+        h = self._header_rows
+        total = len(self._data)
+        first_body = h + start
+        # 块中的片段：(整个表格的起始行, 结束行, 块中的起始行)
+        segments = []
+        if header_count:
+            segments.append((0, h - 1, 0))
+        segments.append((first_body, h + end - 1, header_count))
+
+        commands = []
+        for command in self._commands:
+            op, (sc, sr), (ec, er) = command[0], command[1], command[2]
+            if isinstance(sr, str) or isinstance(er, str):
+                # splitfirst / splitlast 等特殊行号
+                commands.append(command)
+                continue
+            sr = sr + total if sr < 0 else sr
+            er = er + total if er < 0 else er
+
+            # [(整个表格中的起始行, 块中的起始行, 块中的结束行)]
+            ranges = []
+            for seg_start, seg_end, local_start in segments:
+                lo, hi = max(sr, seg_start), min(er, seg_end)
+                if lo > hi:
+                    continue
+                local_lo = local_start + lo - seg_start
+                local_hi = local_start + hi - seg_start
+                if ranges and op != 'ROWBACKGROUNDS' and ranges[-1][2] + 1 == local_lo:
+                    # 表头和紧接着的数据行在块中相邻，合并为一个范围（BOX等不在中间断开）
+                    ranges[-1] = (ranges[-1][0], ranges[-1][1], local_hi)
+                else:
+                    ranges.append((lo, local_lo, local_hi))
+
+            for lo, local_lo, local_hi in ranges:
+                args = command[3:]
+                if op == 'ROWBACKGROUNDS' and args and args[0]:
+                    # 颜色按整个表格中的行号循环；与 Table 分页相同，第一页之后的每页从第一个数据行重新开始
+                    base = sr
+                    if self._page_start and lo >= h:
+                        base = max(sr, h + self._page_start)
+                    colors = list(args[0])
+                    offset = (lo - base) % len(colors)
+                    args = (colors[offset:] + colors[:offset],) + tuple(args[1:])
+                commands.append((op, (sc, local_lo), (ec, local_hi)) + tuple(args))
+        return commands
+
+    def _find_span_rows(self) -> frozenset:
+        """被跨行合并的单元格跨越的数据行（块不能从这些行开始）"""
+        h = self._header_rows
+        total = len(self._data)
+        rows = set()
+        for command in self._commands:
+            if command[0] != 'SPAN':
+                continue
+            sr, er = command[1][1], command[2][1]
+            if isinstance(sr, str) or isinstance(er, str):
+                continue
+            sr = sr + total if sr < 0 else sr
+            er = er + total if er < 0 else er
+            rows.update(range(max(sr + 1, h) - h, er + 1 - h))
+        return frozenset(rows)
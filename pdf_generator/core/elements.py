@@ -1,27 +1,134 @@
 """PDF元素生成器"""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import io
 from pathlib import Path
 
 from reportlab.lib.units import inch
+from reportlab.lib.pagesizes import A4
 from reportlab.platypus import (
-    Paragraph, Table, Image, Spacer, PageBreak, 
+    Paragraph, Table, TableStyle, Image, Spacer, PageBreak, 
     KeepTogether, ListFlowable, ListItem
 )
 from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
+import numpy as np
 import pandas as pd
 
+from pdf_generator.core.chunked_table import ChunkedTable
 from pdf_generator.core.styles import StyleManager
-from pdf_generator.utils.chart_generator import ChartGenerator
+from pdf_generator.utils.chart_cache import ChartCache, make_chart_cache_key, get_chart_columns
+from pdf_generator.utils.downsample import downsample_chart_data
+from pdf_generator.utils.conditional_format import conditional_format_commands, group_band_commands
+from pdf_generator.utils.table_widths import fit_column_widths, get_cell_font, string_widths
+
+
+class BufferImage(Image):
+    """由内存中的PIL图像创建的图片
+    
+    ImageReader 直接引用图像的像素，嵌入PDF时由ReportLab压缩，不经过文件编码和解码。
+    """
+    
+    def __init__(self, image, width: Optional[float] = None, height: Optional[float] = None,
+                 hAlign: str = 'CENTER'):
+        # Image 只接受文件名或文件对象：先设置好 ImageReader，再按文件对象的方式初始化，
+        # 文件对象方式不会延迟加载，_setup 直接使用这里的 _img，不会读取传入的空文件对象
+        self._img = ImageReader(image)
+        Image.__init__(self, io.BytesIO(), width, height, hAlign=hAlign)
 
 
 class ElementFactory:
     """PDF元素工厂类"""
     
-    def __init__(self, style_manager: StyleManager):
+    # 图表引擎：matplotlib（PNG图片）或 native（ReportLab矢量图形）
+    CHART_ENGINES = ('matplotlib', 'native')
+    
+    # matplotlib图表的输出格式：png（位图）或 vector（ReportLab矢量图形）
+    CHART_FORMATS = ('png', 'vector')
+    
+    # 位图嵌入PDF的编码：png、flate（像素直接交给ReportLab压缩）或 jpeg
+    CHART_IMAGE_CODECS = ('png', 'flate', 'jpeg')
+    
+    def __init__(
+        self,
+        style_manager: StyleManager,
+        chart_cache: Optional[ChartCache] = None,
+        chart_engine: str = 'matplotlib',
+        chart_format: str = 'png',
+        chart_image_codec: str = 'png',
+        chart_target_dpi: Optional[float] = None
+    ):
         self.style_manager = style_manager
-        self.chart_generator = ChartGenerator()
+        # 图表生成器依赖matplotlib，首次生成图表时才创建
+        self._chart_generator = None
+        self._native_chart_generator = None
+        # 默认图表引擎（可被图表元素的 engine 覆盖）
+        self.chart_engine = chart_engine
+        # matplotlib图表的默认输出格式（可被图表元素的 format 覆盖）
+        self.chart_format = chart_format
+        # matplotlib位图的默认嵌入编码（可被图表元素的 imageCodec 覆盖）
+        self.chart_image_codec = chart_image_codec
+        # matplotlib位图的默认目标分辨率（可被图表元素的 targetDpi 覆盖），None表示不按绘制尺寸栅格化
+        self.chart_target_dpi = chart_target_dpi
+        # 图表渲染缓存（可在多个生成器之间共享）
+        self.chart_cache = chart_cache
+        # 预先渲染的图表：缓存键 -> 图表字节或渲染时抛出的异常
+        self._prerendered_charts: Dict[str, Union[bytes, Exception]] = {}
+        # 图表降采样累计丢弃的数据点数
+        self.dropped_chart_points = 0
+        # 正文框架的可用宽度（点），用于表格自动列宽；由生成器按页面大小和页边距设置
+        self.frame_width: Optional[float] = None
+    
+    @property
+    def chart_generator(self):
+        """图表生成器（首次访问时导入matplotlib并创建）"""
+        if self._chart_generator is None:
+            from pdf_generator.utils.chart_generator import ChartGenerator
+            self._chart_generator = ChartGenerator()
+        return self._chart_generator
+    
+    @property
+    def native_chart_generator(self):
+        """矢量图表生成器（使用默认中文字体）"""
+        if self._native_chart_generator is None:
+            from pdf_generator.utils.native_charts import NativeChartGenerator
+            self._native_chart_generator = NativeChartGenerator(
+                font_name=self.style_manager.get_style('Normal').fontName
+            )
+        return self._native_chart_generator
+    
+    def get_chart_engine(self, config: Dict[str, Any]) -> str:
+        """获取图表使用的引擎"""
+        engine = config.get('engine', self.chart_engine)
+        if engine not in self.CHART_ENGINES:
+            raise ValueError(f"Unsupported chart engine: {engine}")
+        return engine
+    
+    def _with_chart_defaults(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """补全matplotlib图表的输出格式、位图编码和目标分辨率
+        
+        图表元素的 format / imageCodec / targetDpi 优先于元数据中的 chartFormat /
+        chartImageCodec / chartTargetDpi；与默认值相同时不写入配置，不改变已有图表的缓存键。
+        设置了目标分辨率时同时写入图表的绘制尺寸，图表按绘制尺寸和目标分辨率栅格化，
+        像素与PDF中的显示尺寸一一对应。
+        """
+        defaults = {}
+        for key, default, valid in (
+            ('format', self.chart_format, self.CHART_FORMATS),
+            ('imageCodec', self.chart_image_codec, self.CHART_IMAGE_CODECS),
+        ):
+            value = config.get(key, default)
+            if value not in valid:
+                raise ValueError(f"Unsupported chart {key}: {value}")
+            if key not in config and value != 'png':
+                defaults[key] = value
+        
+        target_dpi = config.get('targetDpi', self.chart_target_dpi)
+        if target_dpi:
+            defaults['targetDpi'] = target_dpi
+            defaults['width'] = config.get('width', 6)
+            defaults['height'] = config.get('height', 4)
+        return dict(config, **defaults) if defaults else config
     
     def create_element(
         self,
@@ -90,7 +197,7 @@ class ElementFactory:
         self,
         config: Dict[str, Any],
         data_sources: Optional[Dict[str, pd.DataFrame]] = None
-    ) -> Table:
+    ) -> Union[Table, ChunkedTable]:
         """创建表格
         
         Config keys:
@@ -112,9 +219,24 @@ class ElementFactory:
             - spaceBefore: 表格前的空白高度（英寸，可选）
             - spaceAfter: 表格后的空白高度（英寸，可选）
             - cellAlignments: 单元格对齐设置列表，格式：[{"range": [startRow, startCol, endRow, endCol], "align": "LEFT/CENTER/RIGHT", "valign": "TOP/MIDDLE/BOTTOM"}, ...]
+            - chunkRows: 分块布局的每块行数（可选，数据行数超过该值时使用 ChunkedTable，
+              布局耗时与行数成线性关系；未指定列宽时各块使用第一块计算出的列宽）
+            - autoColumnWidths: 未指定 columnWidths 时按字体度量估算列宽（默认False，
+              由ReportLab在布局时测量）
+            - minColumnWidth / maxColumnWidth: 自动列宽的最小/最大列宽（英寸，默认0.5 / 不限）
+            - conditionalFormats: 条件格式规则列表，格式：[{"column": "金额", "operator": "<", "value": 0,
+              "textColor": "#FF0000"}, {"column": "金额", "top": 10, "background": "#FFF2CC"}, ...]
+            - groupBanding: 分组底色，分组列的取值变化时交替行背景色，格式：{"column": "部门",
+              "colors": ["#F2F2F2", null]}
+        
+        Returns:
+            Table，分块布局时为 ChunkedTable
         """
         # 获取表格数据
         table_data = None
+        # 各列单元格的字符串和长度（用于估算列宽）
+        column_strings = None
+        column_lengths = None
         
         # 获取自动换行配置
         wrap_columns = config.get('wrapColumns', [])  # 指定需要换行的列索引
@@ -139,6 +261,13 @@ class ElementFactory:
                     else:
                         row_data.append(val_str)
                 table_data.append(row_data)
+            
+            if config.get('autoColumnWidths', False):
+                column_strings = [[str(val) for val in col] for col in zip(*raw_data[1:])]
+                column_lengths = [
+                    np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+                    for strings in column_strings
+                ]
         # 方式2: 从数据源获取
         elif 'dataSource' in config:
             data_source_name = config['dataSource']
@@ -157,19 +286,10 @@ class ElementFactory:
             table_data = [headers]
             
             # 添加数据行
-            for _, row in df.iterrows():
-                row_data = []
-                for col_idx, val in enumerate(row.values):
-                    val_str = str(val)
-                    # 判断是否需要自动换行
-                    # 1. 在wrapColumns列表中
-                    # 2. 超过wrapThreshold长度阈值
-                    if col_idx in wrap_columns or len(val_str) > wrap_threshold:
-                        # 使用Paragraph实现自动换行
-                        row_data.append(Paragraph(val_str, cell_style))
-                    else:
-                        row_data.append(val_str)
-                table_data.append(row_data)
+            rows, column_strings, column_lengths = self._dataframe_to_rows(
+                df, wrap_columns, wrap_threshold, cell_style
+            )
+            table_data.extend(rows)
         else:
             raise ValueError("Table element requires either 'dataSource' or 'data'")
         
@@ -201,20 +321,6 @@ class ElementFactory:
         if space_after is not None:
             space_after = space_after * inch if isinstance(space_after, (int, float)) else space_after
         
-        # 创建表格
-        table = Table(
-            table_data, 
-            colWidths=column_widths, 
-            rowHeights=row_heights,
-            repeatRows=repeat_rows,
-            repeatCols=repeat_cols,
-            splitByRow=split_by_row,
-            hAlign=h_align,
-            vAlign=v_align,
-            spaceBefore=space_before,
-            spaceAfter=space_after
-        )
-        
         # 应用样式
         style_name = config.get('style', 'default')
         table_style = self.style_manager.get_table_style(style_name)
@@ -229,8 +335,31 @@ class ElementFactory:
                 'fontSize': 9,
             })
         
-        # 先应用基础样式
-        table.setStyle(table_style)
+        # 先应用基础样式，再依次应用分组底色、条件格式、合并和对齐样式
+        table_styles = [table_style]
+        
+        # 分组底色：每个分组一条样式命令；条件格式：命中的单元格合并为矩形区域，每个区域一条样式命令
+        group_banding = config.get('groupBanding')
+        conditional_formats = config.get('conditionalFormats')
+        if group_banding or conditional_formats:
+            if 'data' in config:
+                format_data = pd.DataFrame(config['data'][1:])
+                column_names = config['data'][0]
+            else:
+                format_data = df
+                column_names = list(df.columns)
+            
+            format_commands = []
+            if group_banding:
+                format_commands.extend(group_band_commands(
+                    format_data, column_names, group_banding, self.style_manager.parse_color
+                ))
+            if conditional_formats:
+                format_commands.extend(conditional_format_commands(
+                    format_data, column_names, conditional_formats, self.style_manager.parse_color
+                ))
+            if format_commands:
+                table_styles.append(TableStyle(format_commands))
         
         # 处理单元格合并
         merged_cells = config.get('mergedCells', [])
@@ -255,14 +384,11 @@ class ElementFactory:
             
             # 应用合并样式
             if merge_commands:
-                from reportlab.platypus import TableStyle
-                merge_style = TableStyle(merge_commands)
-                table.setStyle(merge_style)
+                table_styles.append(TableStyle(merge_commands))
         
         # 处理单元格对齐
         cell_alignments = config.get('cellAlignments', [])
         if cell_alignments:
-            from reportlab.platypus import TableStyle
             alignment_commands = []
             
             for cell_align in cell_alignments:
@@ -291,17 +417,182 @@ class ElementFactory:
             
             # 应用对齐样式
             if alignment_commands:
-                alignment_style = TableStyle(alignment_commands)
-                table.setStyle(alignment_style)
+                table_styles.append(TableStyle(alignment_commands))
+        
+        commands = [command for style in table_styles for command in style.getCommands()]
+        
+        # 自动列宽：按字体度量估算，布局时不再测量每个单元格
+        if not column_widths and column_strings is not None and config.get('autoColumnWidths', False):
+            column_widths = self._estimate_column_widths(
+                table_data[0], column_strings, column_lengths, commands, len(table_data),
+                wrap_columns, wrap_threshold, cell_style, config
+            )
+        
+        table_kwargs = dict(
+            colWidths=column_widths, 
+            rowHeights=row_heights,
+            repeatRows=repeat_rows,
+            repeatCols=repeat_cols,
+            splitByRow=split_by_row,
+            hAlign=h_align,
+            vAlign=v_align,
+            spaceBefore=space_before,
+            spaceAfter=space_after
+        )
+        
+        # 长表格分块布局：每次只为接下来的 chunkRows 行创建 Table
+        chunk_rows = config.get('chunkRows', 0)
+        if chunk_rows and isinstance(repeat_rows, int) and len(table_data) - repeat_rows > chunk_rows:
+            return ChunkedTable(table_data, commands, chunk_rows, **table_kwargs)
+        
+        # 创建表格
+        table = Table(table_data, **table_kwargs)
+        for style in table_styles:
+            table.setStyle(style)
         
         return table
     
+    @classmethod
+    def _dataframe_to_rows(
+        cls,
+        df: pd.DataFrame,
+        wrap_columns: List[int],
+        wrap_threshold: int,
+        cell_style
+    ) -> Tuple[List[List[Any]], List[List[str]], List[np.ndarray]]:
+        """把DataFrame转换为表格数据行（不含表头）
+        
+        Returns:
+            (数据行, 各列的字符串列表, 各列的字符串长度)，后两者用于估算列宽
+        """
+        column_strings, column_lengths = cls._dataframe_to_strings(df)
+        if not column_strings:
+            # 没有列时每行为空行（zip 无法得到行数）
+            return [[] for _ in range(len(df))], column_strings, column_lengths
+        rows = cls._strings_to_rows(
+            column_strings, column_lengths, wrap_columns, wrap_threshold, cell_style
+        )
+        return rows, column_strings, column_lengths
+    
+    @staticmethod
+    def _dataframe_to_strings(df: pd.DataFrame) -> Tuple[List[List[str]], List[np.ndarray]]:
+        """按列把DataFrame转换为字符串，返回 (各列的字符串列表, 各列的字符串长度)
+        
+        单元格的值取自 df.to_numpy()，与逐行 iterrows 一样使用各列的公共类型
+        （例如整数列和浮点数列一起显示时整数显示为 1.0）。
+        日期和时间差列通过pandas转换，与和其他列一起显示时一样格式化为
+        Timestamp / Timedelta（2024-01-01 00:00:00、0 days 01:00:00）。
+        """
+        values = df.to_numpy()
+        row_count, col_count = values.shape
+        
+        column_strings = []
+        column_lengths = []
+        for col_idx in range(col_count):
+            column = values[:, col_idx]
+            if column.dtype.kind in 'Mm':
+                # 只显示日期（或时间差）列时 to_numpy() 得到 datetime64 / timedelta64，
+                # 其 str() 为 2024-01-01T00:00:00.000000000 / 3600000000000 nanoseconds
+                column = df.iloc[:, col_idx].astype(object).to_numpy()
+            if column.dtype.kind in 'biufc':
+                # 数值列：NumPy一次转换整列，格式与 str() 相同
+                strings = column.astype(str)
+                lengths = np.char.str_len(strings)
+                strings = strings.tolist()
+            else:
+                # 对象、日期等列：逐个调用 str()（对象列中可能是任意对象）
+                strings = list(map(str, column))
+                lengths = np.fromiter(map(len, strings), dtype=np.int64, count=row_count)
+            column_strings.append(strings)
+            column_lengths.append(lengths)
+        return column_strings, column_lengths
+    
+    @staticmethod
+    def _strings_to_rows(
+        column_strings: List[List[str]],
+        column_lengths: List[np.ndarray],
+        wrap_columns: List[int],
+        wrap_threshold: int,
+        cell_style
+    ) -> List[List[Any]]:
+        """把各列的字符串转换为表格数据行，只为需要自动换行的单元格创建 Paragraph：
+        1. 在wrapColumns列表中的列
+        2. 超过wrapThreshold长度阈值的单元格
+        """
+        rows = [list(row) for row in zip(*column_strings)]
+        for col_idx, lengths in enumerate(column_lengths):
+            if col_idx in wrap_columns:
+                wrapped = range(len(rows))
+            else:
+                wrapped = np.flatnonzero(lengths > wrap_threshold).tolist()
+            # 使用Paragraph实现自动换行
+            for row_idx in wrapped:
+                rows[row_idx][col_idx] = Paragraph(rows[row_idx][col_idx], cell_style)
+        return rows
+    
+    def _estimate_column_widths(
+        self,
+        headers: List[Any],
+        column_strings: List[List[str]],
+        column_lengths: List[np.ndarray],
+        commands: List[tuple],
+        total_rows: int,
+        wrap_columns: List[int],
+        wrap_threshold: int,
+        cell_style,
+        config: Dict[str, Any]
+    ) -> List[float]:
+        """按字体度量估算列宽（点），并调整到正文框架的可用宽度以内
+        
+        表头和普通单元格使用表格样式中的字体、字号和内边距，Paragraph 单元格使用单元格样式的字体；
+        包含 Paragraph 的列可以换行，宽度不够时优先压缩。
+        """
+        header_font, header_size, header_padding = get_cell_font(commands, 0, total_rows)
+        body_font, body_size, body_padding = get_cell_font(commands, min(1, total_rows - 1), total_rows)
+        
+        col_count = max(len(headers), len(column_strings))
+        widths = []
+        flexible = []
+        for col_idx in range(col_count):
+            header = str(headers[col_idx]) if col_idx < len(headers) else ''
+            width = string_widths([header], header_font, header_size)[0] + header_padding
+            
+            strings = column_strings[col_idx] if col_idx < len(column_strings) else []
+            wrapped = False
+            if strings:
+                cell_widths = string_widths(strings, body_font, body_size)
+                if col_idx in wrap_columns:
+                    mask = np.ones(len(strings), dtype=bool)
+                else:
+                    mask = column_lengths[col_idx] > wrap_threshold
+                wrapped = bool(mask.any())
+                if wrapped:
+                    cell_widths[mask] = string_widths(
+                        [strings[i] for i in np.flatnonzero(mask).tolist()],
+                        cell_style.fontName, cell_style.fontSize
+                    )
+                width = max(width, float(cell_widths.max()) + body_padding)
+            widths.append(width)
+            flexible.append(wrapped)
+        
+        available = self.frame_width
+        if available is None:
+            # 默认A4纵向、1英寸页边距，Frame 左右内边距各6点
+            available = A4[0] - 2 * inch - 12
+        max_width = config.get('maxColumnWidth')
+        return fit_column_widths(
+            widths, available,
+            min_width=config.get('minColumnWidth', 0.5) * inch,
+            max_width=max_width * inch if max_width is not None else None,
+            flexible=flexible
+        )
+    
     def create_chart(
         self,
         config: Dict[str, Any],
         data_sources: Optional[Dict[str, pd.DataFrame]] = None
-    ) -> Image:
-        """创建图表（作为图片）
+    ):
+        """创建图表（matplotlib引擎生成图片，native引擎生成矢量图形）
         
         Config keys:
             - chartType: 图表类型（bar/line/pie/scatter/area）
@@ -311,6 +602,14 @@ class ElementFactory:
             - title: 图表标题
             - width: 图表宽度（英寸）
             - height: 图表高度（英寸）
+            - engine: 图表引擎（matplotlib/native），默认使用元数据中的 chartEngine
+            - format: matplotlib图表的输出格式（png/vector），默认使用元数据中的 chartFormat
+            - imageCodec: matplotlib位图的嵌入编码（png/flate/jpeg），默认使用元数据中的 chartImageCodec
+            - jpegQuality: imageCodec 为 jpeg 时的JPEG质量（1-95，默认85）
+            - targetDpi: matplotlib位图的目标分辨率，设置后按绘制尺寸和该分辨率栅格化（忽略 dpi），
+              默认使用元数据中的 chartTargetDpi
+            - maxPoints: 折线图、面积图和散点图的点数上限，超过时先降采样（0表示不降采样，
+              默认按图表宽度自动计算）
         """
         chart_type = config.get('chartType')
         if not chart_type:
@@ -326,17 +625,44 @@ class ElementFactory:
         
         df = data_sources[data_source_name]
         
-        # 生成图表
-        chart_bytes = self.chart_generator.generate_chart(chart_type, df, config)
+        engine = self.get_chart_engine(config)
+        if engine == 'matplotlib':
+            # 先补全默认值，降采样使用与图表相同的宽度
+            config = self._with_chart_defaults(config)
         
-        # 转换为ReportLab Image
-        chart_image = Image(io.BytesIO(chart_bytes))
+        # 降采样在两种引擎、图表缓存和预渲染之前进行（ChartGenerator 中再次降采样不会改变数据）
+        df, dropped = downsample_chart_data(chart_type, df, config)
+        self.dropped_chart_points += dropped
         
-        # 设置大小
-        width = config.get('width', 6) * inch
-        height = config.get('height', 4) * inch
-        chart_image.drawWidth = width
-        chart_image.drawHeight = height
+        if engine == 'native':
+            # 矢量图形，尺寸由配置的宽高决定
+            chart_image = self.native_chart_generator.generate_chart(chart_type, df, config)
+        else:
+            # 生成图表
+            width = config.get('width', 6) * inch
+            height = config.get('height', 4) * inch
+            
+            if config.get('format') == 'vector':
+                # 矢量图形，与PNG图片一样缩放到配置的宽高
+                from pdf_generator.utils.chart_vector import load_chart_drawing
+                chart_image = load_chart_drawing(self._render_chart(chart_type, df, config))
+                chart_image.scale(width / chart_image.width, height / chart_image.height)
+                chart_image.width = width
+                chart_image.height = height
+            elif (
+                config.get('imageCodec') == 'flate'
+                and self.chart_cache is None
+                and not self._prerendered_charts
+            ):
+                # 不需要缓存的字节时，直接把Agg画布的像素交给ReportLab
+                chart_image = BufferImage(
+                    self.chart_generator.render_image(chart_type, df, config), width, height
+                )
+            else:
+                # 转换为ReportLab Image（JPEG数据直接嵌入，不会解码）
+                chart_image = Image(io.BytesIO(self._render_chart(chart_type, df, config)))
+                chart_image.drawWidth = width
+                chart_image.drawHeight = height
         
         # 对齐方式
         alignment = config.get('alignment', 'center')
@@ -349,6 +675,104 @@ class ElementFactory:
         
         return chart_image
     
+    def _chart_key(self, chart_type: str, df: pd.DataFrame, config: Dict[str, Any]) -> str:
+        """图表的缓存键（图表缓存和预渲染共用）"""
+        extra: Dict[str, Any] = {'fonts': sorted(self.style_manager.registered_fonts)}
+        if config.get('format') == 'vector':
+            # 矢量图形的数据格式变化后，不再使用旧格式的缓存条目
+            from pdf_generator.utils.chart_vector import VECTOR_FORMAT_VERSION
+            extra['vectorFormat'] = VECTOR_FORMAT_VERSION
+        return make_chart_cache_key(chart_type, config, df, extra=extra)
+    
+    def _render_chart(self, chart_type: str, df: pd.DataFrame, config: Dict[str, Any]) -> bytes:
+        """渲染图表（PNG或矢量图形数据），优先使用预渲染和图表缓存中的结果
+        
+        缓存命中时不会创建图表生成器，也就不会导入matplotlib。
+        """
+        if self._prerendered_charts:
+            prerendered = self._prerendered_charts.get(self._chart_key(chart_type, df, config))
+            if isinstance(prerendered, Exception):
+                raise prerendered
+            if prerendered is not None:
+                return prerendered
+        
+        if self.chart_cache is None:
+            return self.chart_generator.generate_chart(chart_type, df, config)
+        
+        key = self._chart_key(chart_type, df, config)
+        chart_bytes = self.chart_cache.get(key)
+        if chart_bytes is None:
+            chart_bytes = self.chart_generator.generate_chart(chart_type, df, config)
+            self.chart_cache.put(key, chart_bytes)
+        return chart_bytes
+    
+    def prerender_charts(
+        self,
+        chart_configs: List[Dict[str, Any]],
+        data_sources: Optional[Dict[str, pd.DataFrame]],
+        pool
+    ) -> int:
+        """在进程池中预先渲染一批图表，之后 create_chart 直接使用渲染结果
+        
+        图表缓存中已有的图表不会重新渲染；相同的图表只渲染一次。只有一个图表需要渲染时
+        不使用进程池。native引擎的图表、缺少必填项或数据源的图表会被跳过，由 create_chart 照常处理。
+        
+        Args:
+            chart_configs: 图表元素配置列表（已处理模板变量）
+            data_sources: 数据源字典
+            pool: ChartRenderPool
+        
+        Returns:
+            在进程池中渲染的图表数量
+        """
+        keys = []
+        jobs = []
+        for config in chart_configs:
+            chart_type = config.get('chartType')
+            data_source_name = config.get('dataSource')
+            if not chart_type or not data_sources or data_source_name not in data_sources:
+                continue
+            
+            try:
+                if self.get_chart_engine(config) != 'matplotlib':
+                    continue
+                config = self._with_chart_defaults(config)
+                df, _ = downsample_chart_data(chart_type, data_sources[data_source_name], config)
+                key = self._chart_key(chart_type, df, config)
+            except Exception:
+                continue
+            
+            if key in keys or key in self._prerendered_charts:
+                continue
+            if self.chart_cache is not None:
+                chart_bytes = self.chart_cache.get(key)
+                if chart_bytes is not None:
+                    self._prerendered_charts[key] = chart_bytes
+                    continue
+            
+            keys.append(key)
+            # 只传输图表用到的列
+            jobs.append((chart_type, df[get_chart_columns(config, df)], config))
+        
+        if len(jobs) < 2:
+            return 0
+        
+        try:
+            results = pool.render(jobs)
+        except Exception as e:
+            print(f"Warning: Parallel chart rendering failed, rendering charts serially: {e}")
+            return 0
+        
+        for key, result in zip(keys, results):
+            self._prerendered_charts[key] = result
+            if self.chart_cache is not None and isinstance(result, bytes):
+                self.chart_cache.put(key, result)
+        return len(jobs)
+    
+    def clear_prerendered_charts(self):
+        """清除预渲染的图表"""
+        self._prerendered_charts.clear()
+    
     def create_image(self, config: Dict[str, Any]) -> Image:
         """创建图片
         
@@ -1,8 +1,13 @@
 """PDF报告生成器主引擎"""
 
-from typing import Dict, Any, Optional, Union, BinaryIO
+from typing import Dict, Any, Optional, Union, BinaryIO, List, Tuple, Callable
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
+import calendar
 import io
+import os
+import time
 
 from reportlab.lib.pagesizes import A4, A3, A5, LETTER, LEGAL, landscape
 from reportlab.platypus import SimpleDocTemplate, Paragraph, BaseDocTemplate, PageTemplate, Frame
@@ -17,9 +22,14 @@ from pdf_generator.data_sources.json_source import JSONDataSource
 from pdf_generator.data_sources.csv_source import CSVDataSource
 from pdf_generator.data_sources.api_source import APIDataSource
 from pdf_generator.data_sources.database import DatabaseDataSource
-from pdf_generator.core.page_template import PageTemplateManager, NumberedCanvas
+from pdf_generator.data_sources.lazy import LazyDataSourceDict
+from pdf_generator.core.page_template import PageTemplateManager, NumberedCanvas, DeferredFormCanvas
 from pdf_generator.core.toc_generator import TOCGenerator
 from pdf_generator.core.cover_page import CoverPageGenerator
+from pdf_generator.utils.profiler import ReportProfiler, ReportProfile
+from pdf_generator.utils.result_cache import ReportCache, make_cache_key
+from pdf_generator.utils.chart_cache import ChartCache
+from pdf_generator.utils.chart_pool import ChartRenderPool
 
 
 class PDFReportGenerator:
@@ -33,11 +43,22 @@ class PDFReportGenerator:
         'LEGAL': LEGAL,
     }
     
+    # 确定性模式下未提供时钟、配置中也没有 creationDate 时使用的固定时间（与ReportLab invariant模式一致）
+    DETERMINISTIC_EPOCH = datetime(2000, 1, 1)
+    
     def __init__(
         self,
         config_path: Optional[str] = None,
         config_dict: Optional[Dict[str, Any]] = None,
-        font_dirs: Optional[list] = None
+        font_dirs: Optional[list] = None,
+        lazy_data_sources: bool = True,
+        fetch_workers: Optional[int] = None,
+        result_cache: Optional[ReportCache] = None,
+        chart_cache: Optional[ChartCache] = None,
+        chart_workers: Optional[int] = None,
+        chart_pool: Optional[ChartRenderPool] = None,
+        deterministic: bool = False,
+        clock: Optional[Callable[[], datetime]] = None
     ):
         """
         初始化PDF生成器
@@ -50,6 +71,28 @@ class PDFReportGenerator:
                       如果不提供，会自动在以下位置查找：
                       1. 当前工作目录下的 fonts 目录
                       2. 用户主目录下的 .fonts 或 fonts 目录
+            lazy_data_sources: 是否按需加载数据源（默认True）。
+                      启用时只有被元素、封面、页眉页脚或模板引用的数据源才会加载，
+                      并且在首次访问时才加载；未被引用的数据源记录在 skipped_data_sources 中。
+                      设为False时在初始化阶段加载所有数据源。
+            fetch_workers: 并发加载数据源的最大线程数，默认为 min(数据源数量, 8)；
+                      设为1时逐个加载。单个数据源的超时时间可以通过数据源配置的
+                      fetchTimeout 或元数据的 dataSourceTimeout 设置（秒）
+            result_cache: 生成结果缓存（可在多个生成器之间共享）。设置后 generate/to_bytes
+                      先按配置和数据指纹查找缓存，命中时直接返回缓存的PDF，不再运行ReportLab
+            chart_cache: 图表渲染缓存（可在多个生成器之间共享）。图表配置和用到的数据列都相同时
+                      直接使用缓存的PNG，不再调用matplotlib
+            chart_workers: 并行渲染图表的进程数。大于1时，构建内容之前先在进程池中并行渲染
+                      所有图表（进程池首次使用时创建，之后的生成复用）；默认逐个渲染。
+                      生成器拥有这个进程池，用完后需要调用 close()（或使用 with 语句）关闭工作进程
+            chart_pool: 外部创建的图表渲染进程池（可在多个生成器之间共享，例如Web服务中每个请求
+                      创建一个生成器时）。提供时忽略 chart_workers，close() 不会关闭这个进程池，
+                      由创建者负责调用 ChartRenderPool.shutdown()
+            deterministic: 确定性输出模式。启用后相同的配置和数据生成逐字节相同的PDF：
+                      创建/修改时间和页眉页脚中的日期变量固定为 clock 的时间（未提供时使用
+                      元数据的 creationDate，再否则为2000-01-01），文档ID由配置和数据指纹生成
+            clock: 返回当前时间的函数，用于页眉页脚中的 {{date}} 等变量和PDF的创建时间，
+                      默认为 datetime.now
         """
         # 解析配置
         self.config_parser = ConfigParser(config_path, config_dict)
@@ -70,11 +113,23 @@ class PDFReportGenerator:
         
         # 初始化组件
         self.style_manager = StyleManager(font_dirs=all_font_dirs if all_font_dirs else None)
-        self.element_factory = ElementFactory(self.style_manager)
+        self.element_factory = ElementFactory(
+            self.style_manager,
+            chart_cache=chart_cache,
+            chart_engine=metadata.get('chartEngine', 'matplotlib') if metadata else 'matplotlib',
+            chart_format=metadata.get('chartFormat', 'png') if metadata else 'png',
+            chart_image_codec=metadata.get('chartImageCodec', 'png') if metadata else 'png',
+            chart_target_dpi=metadata.get('chartTargetDpi') if metadata else None
+        )
         
         # 数据源
-        self.data_sources: Dict[str, pd.DataFrame] = {}
+        self.lazy_data_sources = lazy_data_sources
+        self.fetch_workers = fetch_workers
+        self.data_sources: Dict[str, pd.DataFrame] = LazyDataSourceDict(
+            default_timeout=metadata.get('dataSourceTimeout') if metadata else None
+        )
         self.data_source_objects: Dict[str, DataSource] = {}
+        self.skipped_data_sources: List[str] = []
         
         # 加载样式
         styles_config = self.config_parser.get_styles()
@@ -87,6 +142,12 @@ class PDFReportGenerator:
         # 初始化高级功能组件
         metadata = self.config_parser.get_metadata()
         
+        # 时钟：确定性模式下固定为由输入决定的时间
+        self.deterministic = deterministic
+        if clock is None and deterministic:
+            clock = self._get_fixed_clock(metadata)
+        self.clock = clock
+        
         # 页面模板管理器（页眉页脚）
         page_template_config = self.config_parser.config.get('pageTemplate')
         # 准备上下文：包含metadata和其他变量
@@ -97,7 +158,8 @@ class PDFReportGenerator:
         self.page_template_manager = PageTemplateManager(
             page_template_config, 
             self.style_manager,
-            template_context
+            template_context,
+            clock=self.clock
         ) if page_template_config else None
         
         # 目录生成器
@@ -107,6 +169,27 @@ class PDFReportGenerator:
         # 封面生成器
         cover_config = self.config_parser.config.get('coverPage', {})
         self.cover_generator = CoverPageGenerator(cover_config, self.style_manager, self.config_parser)
+        
+        # 性能分析（仅在 generate(profile=True) 期间启用）
+        self._profiler: Optional[ReportProfiler] = None
+        self.last_profile: Optional[ReportProfile] = None
+        
+        # 生成结果缓存
+        self.result_cache = result_cache
+        
+        # 图表并行渲染：外部传入的进程池由调用方关闭，自己创建的进程池在 close() 时关闭
+        self.chart_workers = chart_workers
+        self._owns_chart_pool = chart_pool is None and bool(chart_workers and chart_workers > 1)
+        self.chart_pool: Optional[ChartRenderPool] = (
+            chart_pool if chart_pool is not None
+            else ChartRenderPool(chart_workers) if self._owns_chart_pool else None
+        )
+    
+    def _get_fixed_clock(self, metadata: Optional[Dict[str, Any]]) -> Callable[[], datetime]:
+        """确定性模式的固定时钟：元数据中的 creationDate，未设置时为 DETERMINISTIC_EPOCH"""
+        creation_date = metadata.get('creationDate') if metadata else None
+        fixed = datetime.fromisoformat(str(creation_date)) if creation_date else self.DETERMINISTIC_EPOCH
+        return lambda: fixed
     
     def _load_data_sources(self):
         """从配置加载数据源"""
@@ -130,13 +213,43 @@ class PDFReportGenerator:
                 continue
             
             self.data_source_objects[name] = data_source
-            
-            # 预加载数据
-            try:
-                self.data_sources[name] = data_source.get_data()
-                print(f"Loaded data source '{name}': {len(self.data_sources[name])} rows")
-            except Exception as e:
-                print(f"Warning: Failed to load data source '{name}': {e}")
+            self.data_sources.register(name, data_source)
+        
+        if not self.lazy_data_sources:
+            # 并发预加载所有数据
+            self.data_sources.prefetch(max_workers=self.fetch_workers)
+            return
+        
+        # 按需加载：未被引用的数据源永远不会被访问
+        referenced = self.config_parser.get_referenced_data_sources()
+        if referenced is not None:
+            self.skipped_data_sources = [
+                name for name in self.data_source_objects if name not in referenced
+            ]
+        
+        if self.skipped_data_sources:
+            print(f"Info: Skipping unreferenced data sources: {', '.join(self.skipped_data_sources)}")
+    
+    def _prefetch_data_sources(self):
+        """并发加载所有被引用但尚未加载的数据源
+        
+        在首次生成时调用，使多个数据源的加载延迟重叠，而不是在构建内容时逐个串行加载。
+        只有一个数据源时同样在这里加载，保证按名称以外的方式访问（遍历、items()）时也能看到它。
+        """
+        # 引用无法静态确定时（例如遍历 dataSources）skipped_data_sources 为空，加载所有数据源
+        names = [
+            name for name in self.data_sources.pending_names()
+            if name not in self.skipped_data_sources
+        ]
+        if names:
+            self.data_sources.prefetch(names, max_workers=self.fetch_workers)
+    
+    def get_data_source_timings(self) -> Dict[str, float]:
+        """获取每个数据源的加载耗时（秒）
+        
+        包括加载失败和超时的数据源；未加载的数据源不包含在内。
+        """
+        return dict(self.data_sources.fetch_times)
     
     def add_data_source(self, name: str, data: Union[pd.DataFrame, dict, list]):
         """手动添加数据源
@@ -182,77 +295,273 @@ class PDFReportGenerator:
         
         # 1. 添加封面页（如果启用）
         if self.cover_generator and self.cover_generator.is_enabled():
-            cover_elements = self.cover_generator.generate(page_size, context)
+            with self._profile_stage('cover'):
+                cover_elements = self.cover_generator.generate(page_size, context)
             story.extend(cover_elements)
         
         # 2. 添加目录（如果启用）
         if self.toc_generator and self.toc_generator.is_enabled():
-            toc_elements = self.toc_generator.generate_toc_elements()
+            with self._profile_stage('toc'):
+                toc_elements = self.toc_generator.generate_toc_elements()
             story.extend(toc_elements)
         
         # 3. 获取元素配置
         elements_config = self.config_parser.get_elements()
         
-        # 4. 生成每个元素
+        # 4. 并行预渲染图表
+        if self.chart_pool:
+            with self._profile_stage('chart_prerender'):
+                self._prerender_charts(elements_config, context)
+        
+        # 5. 生成每个元素
+        try:
+            for index, element_config in enumerate(elements_config):
+                with self._profile_element(index, element_config.get('type')) as record:
+                    story.append(self._build_element(element_config, context, record))
+        finally:
+            self.element_factory.clear_prerendered_charts()
+        
+        return story
+    
+    def _prerender_charts(self, elements_config: List[Dict[str, Any]], context: Dict[str, Any]):
+        """在进程池中预先渲染所有图表元素
+        
+        模板处理失败的图表在这里跳过，之后由 _build_element 照常生成错误提示。
+        """
+        chart_configs = []
         for element_config in elements_config:
+            if element_config.get('type') != 'chart':
+                continue
             try:
-                # 处理模板变量
+                chart_configs.append(
+                    self.config_parser.process_element_content(element_config, context)
+                )
+            except Exception:
+                continue
+        
+        self.element_factory.prerender_charts(chart_configs, self.data_sources, self.chart_pool)
+    
+    def _build_element(self, element_config: Dict[str, Any], context: Dict[str, Any], record: Dict[str, Any]):
+        """构建单个元素，失败时返回错误提示段落
+        
+        Args:
+            element_config: 元素配置
+            context: 模板上下文
+            record: 性能分析记录（未启用性能分析时为临时字典）
+        """
+        try:
+            # 处理模板变量
+            template_start = time.perf_counter()
+            with self._profile_stage('template_rendering'):
                 processed_config = self.config_parser.process_element_content(
                     element_config, context
                 )
+            record['template_wall'] = time.perf_counter() - template_start
+            
+            # 创建PDF元素
+            element_type = processed_config['type']
+            
+            # 特殊处理：如果是heading且启用了TOC自动生成
+            if element_type == 'heading' and self.toc_generator and self.toc_generator.is_auto_generate():
+                level = processed_config.get('level', 1)
+                text = processed_config.get('text', '')
+                style_name = processed_config.get('style', f'Heading{level}')
                 
-                # 创建PDF元素
-                element_type = processed_config['type']
-                
-                # 特殊处理：如果是heading且启用了TOC自动生成
-                if element_type == 'heading' and self.toc_generator and self.toc_generator.is_auto_generate():
-                    level = processed_config.get('level', 1)
-                    text = processed_config.get('text', '')
-                    style_name = processed_config.get('style', f'Heading{level}')
-                    
-                    # 使用TOC生成器创建带书签的标题
-                    pdf_element = self.toc_generator.create_heading_with_bookmark(
-                        text, level, style_name
-                    )
-                else:
-                    # 普通元素
-                    pdf_element = self.element_factory.create_element(
-                        element_type,
-                        processed_config,
-                        self.data_sources
+                # 使用TOC生成器创建带书签的标题
+                return self.toc_generator.create_heading_with_bookmark(
+                    text, level, style_name
+                )
+            
+            # 普通元素
+            dropped_points = self.element_factory.dropped_chart_points
+            element = self.element_factory.create_element(
+                element_type,
+                processed_config,
+                self.data_sources
+            )
+            dropped_points = self.element_factory.dropped_chart_points - dropped_points
+            if dropped_points:
+                record['dropped_points'] = dropped_points
+            return element
+        
+        except Exception as e:
+            # 错误处理：添加错误信息到PDF
+            error_text = f"Error creating element: {e}"
+            print(f"Warning: {error_text}")
+            record['error'] = str(e)
+            return Paragraph(
+                f"<font color='red'>{error_text}</font>",
+                self.style_manager.get_style('Normal')
+            )
+    
+    def _profile_stage(self, name: str):
+        """性能分析阶段（未启用性能分析时不做任何事）"""
+        if self._profiler:
+            return self._profiler.stage(name)
+        return nullcontext()
+    
+    def _profile_element(self, index: int, element_type: Optional[str]):
+        """性能分析元素记录（未启用性能分析时返回临时字典）"""
+        if self._profiler:
+            return self._profiler.element(index, element_type or 'unknown')
+        return nullcontext({})
+    
+    def _make_canvasmaker(self, page_size: tuple, fingerprint: Optional[str] = None):
+        """创建canvasmaker
+        
+        有页眉页脚时使用PageTemplateManager创建的Canvas，否则使用支持延迟表单的DeferredFormCanvas；
+        设置了时钟时用它的时间作为PDF的创建/修改时间；提供 fingerprint 时将其加入文档ID的摘要；
+        启用性能分析时额外记录Canvas.save的耗时。
+        
+        Args:
+            page_size: 页面大小
+            fingerprint: 输入指纹（确定性模式下为配置和数据的缓存键）
+        """
+        page_mgr = self.page_template_manager
+        profiler = self._profiler
+        clock = self.clock
+        
+        def make_canvas(filename, *args, **kwargs):
+            if page_mgr:
+                canv = page_mgr.create_canvas(filename, page_size, invariant=kwargs.get('invariant'))
+            else:
+                canv = DeferredFormCanvas(filename, *args, **kwargs)
+            
+            if clock:
+                canv.setDateFormatter(self._make_date_formatter(clock()))
+            if fingerprint:
+                # 文档ID由ReportLab按 _doc.signature 的摘要生成，没有公开的接口可以加入输入指纹；
+                # ReportLab内部结构变化时直接报错，而不是静默生成不可复现的PDF
+                doc = getattr(canv, '_doc', None)
+                if not hasattr(getattr(doc, 'signature', None), 'update'):
+                    raise RuntimeError(
+                        "Deterministic mode is not supported by this ReportLab version "
+                        "(canvas._doc.signature is missing)"
                     )
-                
-                story.append(pdf_element)
+                doc.signature.update(fingerprint.encode('ascii'))
             
-            except Exception as e:
-                # 错误处理：添加错误信息到PDF
-                error_text = f"Error creating element: {e}"
-                print(f"Warning: {error_text}")
-                error_para = Paragraph(
-                    f"<font color='red'>{error_text}</font>",
-                    self.style_manager.get_style('Normal')
-                )
-                story.append(error_para)
+            if profiler:
+                save = canv.save
+                
+                def profiled_save():
+                    with profiler.stage('canvas_save'):
+                        save()
+                
+                canv.save = profiled_save
+            return canv
         
-        return story
+        return make_canvas
+    
+    @staticmethod
+    def _make_date_formatter(moment: datetime) -> Callable[..., str]:
+        """创建PDF创建/修改时间的格式化函数（Canvas.setDateFormatter），不带时区的时间按UTC处理
+        
+        ReportLab 以文档时间戳的 (年, 月, 日, 时, 分, 秒) 调用格式化函数，这里忽略传入的时间，
+        始终返回 moment。
+        """
+        utc = time.gmtime(calendar.timegm(moment.utctimetuple()))
+        date = "D:%04d%02d%02d%02d%02d%02d+00'00'" % tuple(utc)[:6]
+        return lambda *args: date
     
     def generate(
         self,
         output_path: Optional[str] = None,
-        return_bytes: bool = False
-    ) -> Optional[bytes]:
+        return_bytes: bool = False,
+        profile: bool = False
+    ) -> Union[Optional[bytes], Tuple[Optional[bytes], ReportProfile]]:
         """生成PDF报告
         
         Args:
             output_path: 输出文件路径（可选）
             return_bytes: 是否返回PDF字节流
+            profile: 是否启用性能分析。启用后记录数据加载、模板渲染、各元素构建、
+                    布局（doc.build/multiBuild，包含canvas_save）和Canvas保存各阶段的
+                    墙钟时间、CPU时间和tracemalloc峰值内存，以及页数和输出大小。
+                    tracemalloc会明显拖慢生成速度，只应在诊断时启用
         
         Returns:
-            如果return_bytes为True，返回PDF字节流；否则返回None
+            如果return_bytes为True，返回PDF字节流；否则返回None。
+            启用profile时返回 (上述结果, ReportProfile)，ReportProfile同时保存在 last_profile 中。
+            设置了 result_cache 时结果可能来自缓存；启用profile时不使用缓存
+        """
+        if not profile:
+            if self.result_cache is not None:
+                return self._generate_cached(output_path, return_bytes)
+            return self._generate(output_path, return_bytes)
+        
+        self._profiler = ReportProfiler()
+        self._profiler.start()
+        try:
+            result = self._generate(output_path, return_bytes)
+        finally:
+            report_profile = self._profiler.stop()
+            self._profiler = None
+        
+        report_profile.data_source_timings = self.get_data_source_timings()
+        self.last_profile = report_profile
+        return result, report_profile
+    
+    def get_cache_key(self) -> str:
+        """计算当前配置和数据对应的结果缓存键
+        
+        数据本身是缓存键的一部分，因此会先加载所有被引用但尚未加载的数据源。
         """
+        names = [
+            name for name in self.data_sources.pending_names()
+            if name not in self.skipped_data_sources
+        ]
+        if names:
+            self.data_sources.prefetch(names, max_workers=self.fetch_workers)
+        
+        return make_cache_key(
+            self.config_parser.config,
+            self.data_sources.loaded(),
+            extra={'fonts': sorted(self.style_manager.registered_fonts)}
+        )
+    
+    def _generate_cached(
+        self,
+        output_path: Optional[str] = None,
+        return_bytes: bool = False
+    ) -> Optional[bytes]:
+        """通过结果缓存生成PDF报告（参数和返回值见 generate）"""
+        key = self.get_cache_key()
+        pdf_bytes = self.result_cache.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = self._generate(return_bytes=True)
+            self.result_cache.put(key, pdf_bytes)
+        
+        if output_path:
+            with open(output_path, 'wb') as f:
+                f.write(pdf_bytes)
+        
+        if return_bytes:
+            return pdf_bytes
+        
+        # 既没有指定路径，也没有要求返回字节流时使用默认路径（与 _generate 一致）
+        if not output_path:
+            output_path = "output.pdf"
+            with open(output_path, 'wb') as f:
+                f.write(pdf_bytes)
+        print(f"PDF generated successfully: {output_path}")
+        return None
+    
+    def _generate(
+        self,
+        output_path: Optional[str] = None,
+        return_bytes: bool = False
+    ) -> Optional[bytes]:
+        """生成PDF报告（参数和返回值见 generate）"""
         # 获取元数据
         metadata = self.config_parser.get_metadata()
         
+        # 清空上一次生成时收集的目录条目
+        self.toc_generator.reset()
+        
+        # 并发加载本次需要的数据源
+        with self._profile_stage('data_loading'):
+            self._prefetch_data_sources()
+        
         # 创建PDF文档
         if output_path:
             output = output_path
@@ -290,6 +599,7 @@ class PDFReportGenerator:
                 rightMargin=right_margin,
                 title=metadata.get('title', 'Report'),
                 author=metadata.get('author', 'PDF Generator'),
+                invariant=1 if self.deterministic else None,
             )
             
             # 创建Frame
@@ -305,28 +615,6 @@ class PDFReportGenerator:
             template = PageTemplate(id='main', frames=[frame])
             doc.addPageTemplates([template])
             
-            # 构建内容
-            story = self._build_story(page_size)
-            
-            # 使用自定义Canvas生成PDF
-            # 如果有目录，使用multiBuild进行两次构建
-            page_mgr = self.page_template_manager  # 保存引用避免类型检查错误
-            if self.toc_generator and self.toc_generator.is_enabled() and self.toc_generator.is_auto_generate():
-                doc.multiBuild(
-                    story,
-                    canvasmaker=lambda *args, **kwargs: page_mgr.create_canvas(
-                        args[0], 
-                        page_size
-                    )
-                )
-            else:
-                doc.build(
-                    story,
-                    canvasmaker=lambda *args, **kwargs: page_mgr.create_canvas(
-                        args[0], 
-                        page_size
-                    )
-                )
         else:
             # 使用简单模板
             doc = SimpleDocTemplate(
@@ -338,17 +626,34 @@ class PDFReportGenerator:
                 rightMargin=right_margin,
                 title=metadata.get('title', 'Report'),
                 author=metadata.get('author', 'PDF Generator'),
+                invariant=1 if self.deterministic else None,
             )
-            
-            # 构建内容
+        
+        # 正文可用宽度（Frame 左右内边距各6点），供表格自动列宽使用
+        self.element_factory.frame_width = page_size[0] - left_margin - right_margin - 12
+        
+        # 构建内容
+        with self._profile_stage('story_build'):
             story = self._build_story(page_size)
-            
-            # 生成PDF
-            # 如果有目录，使用multiBuild进行两次构建
-            if self.toc_generator and self.toc_generator.is_enabled() and self.toc_generator.is_auto_generate():
-                doc.multiBuild(story)
+        
+        # 生成PDF（有页眉页脚时使用自定义Canvas）
+        # 如果有自动目录，使用multiBuild多次构建直到页码稳定；单遍目录只需构建一次
+        fingerprint = self.get_cache_key() if self.deterministic else None
+        canvasmaker = self._make_canvasmaker(page_size, fingerprint)
+        with self._profile_stage('layout'):
+            if (self.toc_generator and self.toc_generator.is_enabled()
+                    and self.toc_generator.is_auto_generate()
+                    and not self.toc_generator.is_single_pass()):
+                doc.multiBuild(story, canvasmaker=canvasmaker)
+            else:
+                doc.build(story, canvasmaker=canvasmaker)
+        
+        if self._profiler:
+            self._profiler.profile.page_count = doc.page
+            if isinstance(output, io.BytesIO):
+                self._profiler.profile.output_size = len(output.getbuffer())
             else:
-                doc.build(story)
+                self._profiler.profile.output_size = os.path.getsize(output)
         
         # 返回结果
         if return_bytes:
@@ -396,4 +701,21 @@ class PDFReportGenerator:
         for name, ds in self.data_source_objects.items():
             summary[name] = ds.get_summary()
         return summary
+    
+    def close(self):
+        """释放生成器持有的资源
+        
+        关闭由 chart_workers 创建的图表渲染进程池（外部传入的 chart_pool 不会被关闭）。
+        可以重复调用；关闭后生成器仍然可以使用，图表改为逐个渲染。
+        """
+        if self._owns_chart_pool and self.chart_pool is not None:
+            self.chart_pool.shutdown()
+        self.chart_pool = None
+        self._owns_chart_pool = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
@@ -1,6 +1,6 @@
 """页眉页脚处理器"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from pathlib import Path
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
@@ -13,7 +13,13 @@ from pdf_generator.utils.page_numbers import PageNumberFormatter
 class HeaderFooterHandler:
     """页眉页脚处理器"""
     
-    def __init__(self, config: Dict[str, Any], style_manager, context: Dict[str, Any] = None):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        style_manager,
+        context: Dict[str, Any] = None,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
         """
         初始化页眉页脚处理器
         
@@ -21,10 +27,12 @@ class HeaderFooterHandler:
             config: 页面模板配置
             style_manager: 样式管理器
             context: 上下文数据（用于变量替换）
+            clock: 返回当前时间的函数，用于 {{date}}、{{datetime}}、{{year}}，默认为 datetime.now
         """
         self.config = config
         self.style_manager = style_manager
         self.context = context or {}
+        self.clock = clock or datetime.now
         
         # 获取页眉页脚配置
         self.header_config = config.get('header', {})
@@ -50,13 +58,20 @@ class HeaderFooterHandler:
         """获取页脚高度"""
         return self.footer_height if self.has_footer() else 0
     
-    def draw_header(self, canvas_obj: canvas.Canvas, page_num: int, total_pages: int):
+    def draw_header(
+        self,
+        canvas_obj: canvas.Canvas,
+        page_num: int,
+        total_pages: Optional[int],
+        defer: Optional[Callable] = None
+    ):
         """绘制页眉
         
         Args:
             canvas_obj: Canvas对象
             page_num: 当前页码
-            total_pages: 总页数
+            total_pages: 总页数，未知时为None
+            defer: 总页数未知时，用于延迟绘制引用了总页数的区域（见 _draw_section）
         """
         if not self.has_header():
             return
@@ -72,7 +87,8 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         self._draw_section(
@@ -82,7 +98,8 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         self._draw_section(
@@ -92,20 +109,28 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         # 绘制分隔线（如果启用）
         if self.header_config.get('showLine', False):
             self._draw_line(canvas_obj, page_height - self.header_height, page_width)
     
-    def draw_footer(self, canvas_obj: canvas.Canvas, page_num: int, total_pages: int):
+    def draw_footer(
+        self,
+        canvas_obj: canvas.Canvas,
+        page_num: int,
+        total_pages: Optional[int],
+        defer: Optional[Callable] = None
+    ):
         """绘制页脚
         
         Args:
             canvas_obj: Canvas对象
             page_num: 当前页码
-            total_pages: 总页数
+            total_pages: 总页数，未知时为None
+            defer: 总页数未知时，用于延迟绘制引用了总页数的区域（见 _draw_section）
         """
         if not self.has_footer():
             return
@@ -121,7 +146,8 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         self._draw_section(
@@ -131,7 +157,8 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         self._draw_section(
@@ -141,7 +168,8 @@ class HeaderFooterHandler:
             y_position, 
             page_width,
             page_num,
-            total_pages
+            total_pages,
+            defer
         )
         
         # 绘制分隔线（如果启用）
@@ -156,7 +184,8 @@ class HeaderFooterHandler:
         y: float, 
         page_width: float,
         page_num: int,
-        total_pages: int
+        total_pages: Optional[int],
+        defer: Optional[Callable] = None
     ):
         """绘制一个区域（左/中/右）
         
@@ -167,11 +196,19 @@ class HeaderFooterHandler:
             y: Y坐标
             page_width: 页面宽度
             page_num: 当前页码
-            total_pages: 总页数
+            total_pages: 总页数，未知时为None
+            defer: 延迟绘制回调。总页数未知且区域引用了总页数时，
+                  以 draw(canvas_obj, total_pages) 函数调用它，由调用方在总页数确定后再绘制
         """
         if not section_config:
             return
         
+        if total_pages is None and defer is not None and self.uses_total_pages(section_config):
+            defer(lambda canvas_obj, total_pages: self._draw_section(
+                canvas_obj, section_config, align, y, page_width, page_num, total_pages
+            ))
+            return
+        
         section_type = section_config.get('type', 'text')
         
         # 计算X坐标
@@ -190,6 +227,16 @@ class HeaderFooterHandler:
         elif section_type == 'pageNumber':
             self._draw_page_number(canvas_obj, section_config, x, y, align, page_num, total_pages)
     
+    @staticmethod
+    def uses_total_pages(section_config: Dict[str, Any]) -> bool:
+        """区域内容是否引用了总页数"""
+        section_type = section_config.get('type', 'text')
+        if section_type == 'text':
+            return '{{total}}' in section_config.get('content', '')
+        if section_type == 'pageNumber':
+            return '{total}' in section_config.get('format', '{page}')
+        return False
+    
     def _draw_text(
         self, 
         canvas_obj: canvas.Canvas, 
@@ -298,13 +345,13 @@ class HeaderFooterHandler:
         
         # 替换日期
         if '{{date}}' in text:
-            text = text.replace('{{date}}', datetime.now().strftime('%Y-%m-%d'))
+            text = text.replace('{{date}}', self.clock().strftime('%Y-%m-%d'))
         
         if '{{datetime}}' in text:
-            text = text.replace('{{datetime}}', datetime.now().strftime('%Y-%m-%d %H:%M'))
+            text = text.replace('{{datetime}}', self.clock().strftime('%Y-%m-%d %H:%M'))
         
         if '{{year}}' in text:
-            text = text.replace('{{year}}', str(datetime.now().year))
+            text = text.replace('{{year}}', str(self.clock().year))
         
         # 替换页码
         if '{{page}}' in text:
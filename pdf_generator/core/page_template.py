@@ -2,12 +2,47 @@
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable
 
 from pdf_generator.core.header_footer import HeaderFooterHandler
 
 
-class NumberedCanvas(canvas.Canvas):
+class DeferredFormMixin:
+    """延迟填充的表单XObject
+    
+    页面上先放置一个表单引用（doForm），表单内容在保存前才绘制，
+    用于总页数等在生成结束时才能确定的内容。PDF允许引用后定义的表单。
+    """
+    
+    def _init_deferred_forms(self):
+        self._deferred_forms = []
+    
+    def draw_deferred(self, draw_func: Callable, bbox: Optional[tuple] = None):
+        """在当前位置放置延迟绘制的内容
+        
+        Args:
+            draw_func: 绘制函数 draw_func(canvas, total_pages)
+            bbox: 表单边界 (x1, y1, x2, y2)，基于当前坐标系，默认为整个页面
+        """
+        name = f"deferred{len(self._deferred_forms)}"
+        self.doForm(name)
+        self._deferred_forms.append((name, draw_func, bbox or ()))
+    
+    def fill_deferred_forms(self, total_pages: int):
+        """绘制所有延迟表单的内容
+        
+        Args:
+            total_pages: 总页数
+        """
+        for name, draw_func, bbox in self._deferred_forms:
+            self.beginForm(name, *bbox)
+            draw_func(self, total_pages)
+            self.endForm()
+        self._deferred_forms = []
+
+
+class NumberedCanvas(DeferredFormMixin, canvas.Canvas):
     """带页码的自定义Canvas"""
     
     def __init__(self, *args, **kwargs):
@@ -16,6 +51,7 @@ class NumberedCanvas(canvas.Canvas):
         
         canvas.Canvas.__init__(self, *args, **kwargs)
         self._saved_page_states = []
+        self._init_deferred_forms()
     
     def showPage(self):
         """保存页面状态"""
@@ -25,6 +61,7 @@ class NumberedCanvas(canvas.Canvas):
     def save(self):
         """添加页眉页脚并保存"""
         num_pages = len(self._saved_page_states)
+        self.fill_deferred_forms(num_pages)
         
         for page_num, state in enumerate(self._saved_page_states, start=1):
             self.__dict__.update(state)
@@ -39,10 +76,59 @@ class NumberedCanvas(canvas.Canvas):
         canvas.Canvas.save(self)
 
 
+class StreamingNumberedCanvas(DeferredFormMixin, canvas.Canvas):
+    """逐页输出页眉页脚的Canvas
+    
+    NumberedCanvas 为了得到总页数，会保存每一页的完整状态，直到 save() 时才绘制页眉页脚，
+    内存占用随页数线性增长。这里在每页结束时立即绘制页眉页脚并交给ReportLab，
+    引用总页数的区域（如 "Page {page} of {total}"）绘制为延迟表单，保存时统一填充。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        # 提取自定义参数
+        self.header_footer_handler: Optional[HeaderFooterHandler] = kwargs.pop('header_footer_handler', None)
+        
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._init_deferred_forms()
+    
+    def showPage(self):
+        """绘制页眉页脚后结束当前页"""
+        if self.header_footer_handler:
+            page_num = self.getPageNumber()
+            self.header_footer_handler.draw_header(self, page_num, None, self.draw_deferred)
+            self.header_footer_handler.draw_footer(self, page_num, None, self.draw_deferred)
+        
+        canvas.Canvas.showPage(self)
+    
+    def save(self):
+        """填充总页数后保存"""
+        self.fill_deferred_forms(self.getPageNumber() - 1)
+        canvas.Canvas.save(self)
+
+
+class DeferredFormCanvas(DeferredFormMixin, canvas.Canvas):
+    """支持延迟表单的普通Canvas（没有页眉页脚时使用）"""
+    
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._init_deferred_forms()
+    
+    def save(self):
+        """填充延迟表单后保存"""
+        self.fill_deferred_forms(self.getPageNumber() - 1)
+        canvas.Canvas.save(self)
+
+
 class PageTemplateManager:
     """页面模板管理器"""
     
-    def __init__(self, config: Dict[str, Any], style_manager, context: Dict[str, Any] = None):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        style_manager,
+        context: Dict[str, Any] = None,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
         """
         初始化页面模板管理器
         
@@ -50,29 +136,36 @@ class PageTemplateManager:
             config: 页面模板配置
             style_manager: 样式管理器
             context: 上下文数据
+            clock: 返回当前时间的函数（页眉页脚中的日期变量使用），默认为 datetime.now
         """
         self.config = config
         self.style_manager = style_manager
         self.context = context or {}
         
+        # 逐页输出页眉页脚（页数很多时显著降低内存占用）
+        self.stream_pages = bool(config.get('streamPages', False)) if config else False
+        
         # 创建页眉页脚处理器
         self.header_footer_handler = None
         if config:
-            self.header_footer_handler = HeaderFooterHandler(config, style_manager, context)
+            self.header_footer_handler = HeaderFooterHandler(config, style_manager, context, clock)
     
-    def create_canvas(self, filename, pagesize=A4):
+    def create_canvas(self, filename, pagesize=A4, invariant=None):
         """创建自定义Canvas
         
         Args:
             filename: 输出文件名或字节流
             pagesize: 页面大小
+            invariant: 是否使用ReportLab的invariant模式（固定时间戳和文档ID的种子）
         
         Returns:
-            NumberedCanvas对象
+            NumberedCanvas对象；启用streamPages时为StreamingNumberedCanvas对象
         """
-        return NumberedCanvas(
+        canvas_class = StreamingNumberedCanvas if self.stream_pages else NumberedCanvas
+        return canvas_class(
             filename,
             pagesize=pagesize,
+            invariant=invariant,
             header_footer_handler=self.header_footer_handler
         )
     
@@ -0,0 +1,256 @@
+"""多进程并行报告生成
+
+ReportLab 布局和 matplotlib 栅格化都持有 GIL，单个进程内只能用满一个CPU核心。
+ParallelReportRunner 将一批 (配置, 数据) 任务分发到进程池中执行：
+
+- 每个工作进程启动时预先注册字体（StyleManager / ChartGenerator），之后的任务直接复用；
+  指定 font_cache_dir 时字体解析结果保存在磁盘上，被回收后新启动的进程直接加载
+- 结果按完成顺序流式返回
+- 可限制每个工作进程执行的任务数，定期回收进程以控制内存
+- 单个任务失败（包括配置错误、工作进程崩溃）只影响该任务本身
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Union, Iterable, Iterator, List, Mapping, Tuple
+
+
+# 工作进程内的预热状态（保持引用，避免被回收）
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(font_dirs: Optional[list] = None, font_cache_dir: Optional[str] = None):
+    """工作进程初始化：注册字体、导入重量级依赖"""
+    from pdf_generator.core.styles import StyleManager
+    from pdf_generator.utils.chart_generator import ChartGenerator
+
+    if font_cache_dir:
+        from pdf_generator.utils.font_cache import FontMetricsCache
+        from pdf_generator.utils.font_registry import get_font_registry
+        get_font_registry().set_metrics_cache(FontMetricsCache(font_cache_dir))
+
+    _WORKER_STATE['style_manager'] = StyleManager(font_dirs=font_dirs)
+    _WORKER_STATE['chart_generator'] = ChartGenerator()
+
+
+def _run_job(index: int, job: Dict[str, Any], font_dirs: Optional[list] = None) -> Dict[str, Any]:
+    """在工作进程中执行单个任务
+
+    任何异常都在这里捕获并转换为错误结果，避免影响同一批次的其他任务。
+    """
+    from pdf_generator.core.generator import PDFReportGenerator
+
+    result: Dict[str, Any] = {
+        'index': index,
+        'key': job.get('key', str(index)),
+        'success': False,
+        'pid': os.getpid(),
+    }
+    start = time.perf_counter()
+
+    try:
+        config = job.get('config')
+        generator = PDFReportGenerator(
+            config_path=config if isinstance(config, str) else None,
+            config_dict=config if isinstance(config, dict) else None,
+            font_dirs=font_dirs
+        )
+
+        for name, data in (job.get('data') or {}).items():
+            generator.add_data_source(name, data)
+
+        output_path = job.get('output_path')
+        if output_path:
+            generator.generate(output_path=output_path)
+            result['output'] = output_path
+            result['size'] = os.path.getsize(output_path)
+        else:
+            pdf_bytes = generator.to_bytes()
+            result['bytes'] = pdf_bytes
+            result['size'] = len(pdf_bytes)
+
+        result['success'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+class ParallelReportRunner:
+    """多进程并行报告生成器
+
+    Example:
+        >>> runner = ParallelReportRunner(max_workers=4, max_tasks_per_worker=50)
+        >>> jobs = [(config, {"sales": df}) for df in frames]
+        >>> for result in runner.run(jobs):
+        ...     if result['success']:
+        ...         save(result['key'], result['bytes'])
+        ...     else:
+        ...         print(result['error'])
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        font_dirs: Optional[list] = None,
+        font_cache_dir: Optional[str] = None
+    ):
+        """
+        初始化并行生成器
+
+        Args:
+            max_workers: 工作进程数量，默认为CPU核心数
+            max_tasks_per_worker: 每个工作进程最多执行的任务数，达到后进程被替换以释放内存；
+                                 None表示不限制
+            font_dirs: 字体文件目录列表（工作进程预热和每个任务都会使用）
+            font_cache_dir: 字体度量缓存目录，工作进程共享解析好的字体，缩短冷启动时间；
+                           None表示不使用
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError("max_tasks_per_worker must be at least 1")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.font_dirs = font_dirs
+        self.font_cache_dir = font_cache_dir
+
+    def run(
+        self,
+        jobs: Iterable[Union[Mapping[str, Any], Tuple]]
+    ) -> Iterator[Dict[str, Any]]:
+        """执行一批任务，按完成顺序逐个返回结果
+
+        Args:
+            jobs: 任务列表，每个任务可以是：
+                - 字典：{'config': 配置字典或配置文件路径, 'data': {名称: 数据},
+                         'output_path': 输出路径(可选), 'key': 标识(可选)}
+                - 元组：(config, data) 或 (config, data, output_path)
+
+        Yields:
+            任务结果字典：index、key、success、elapsed、size、pid，
+            以及 bytes/output（成功时）或 error（失败时）
+        """
+        indexed_jobs = []
+        for index, job in enumerate(jobs):
+            try:
+                indexed_jobs.append((index, self._normalize_job(job)))
+            except ValueError as e:
+                # 格式错误的任务直接返回错误结果，不影响其他任务
+                yield self._error_result(index, {}, e)
+
+        for batch in self._split_rounds(indexed_jobs):
+            yield from self._run_round(batch)
+
+    def run_all(self, jobs: Iterable[Union[Mapping[str, Any], Tuple]]) -> List[Dict[str, Any]]:
+        """执行一批任务，返回按任务顺序排列的结果列表"""
+        return sorted(self.run(jobs), key=lambda result: result['index'])
+
+    def _create_executor(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """创建预热的进程池（max_workers 默认为 self.max_workers）"""
+        kwargs: Dict[str, Any] = {
+            'max_workers': max_workers or self.max_workers,
+            'initializer': _init_worker,
+            'initargs': (self.font_dirs, self.font_cache_dir),
+        }
+        # Python 3.11+ 原生支持按任务数回收工作进程
+        if self.max_tasks_per_worker and sys.version_info >= (3, 11):
+            kwargs['max_tasks_per_child'] = self.max_tasks_per_worker
+        return ProcessPoolExecutor(**kwargs)
+
+    def _split_rounds(self, indexed_jobs: List[Tuple[int, Dict[str, Any]]]) -> List[List]:
+        """拆分执行轮次
+
+        旧版本Python不支持 max_tasks_per_child，此时每轮最多执行
+        max_workers * max_tasks_per_worker 个任务，每轮使用新的进程池。
+        """
+        if not self.max_tasks_per_worker or sys.version_info >= (3, 11):
+            return [indexed_jobs]
+
+        round_size = self.max_workers * self.max_tasks_per_worker
+        return [indexed_jobs[i:i + round_size] for i in range(0, len(indexed_jobs), round_size)]
+
+    def _run_round(
+        self,
+        indexed_jobs: List[Tuple[int, Dict[str, Any]]],
+        attempt: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """在一个进程池中执行一轮任务
+
+        工作进程崩溃时进程池中未完成的任务都会失败，其中大多数只是被连累：
+        第一次崩溃后把这些任务一起放到一个新的进程池中重试一次；再次崩溃时把剩余任务
+        二分到新的进程池中执行，直到找出单独执行也会崩溃的任务，只有这些任务记为失败。
+
+        Args:
+            indexed_jobs: (序号, 任务) 列表
+            attempt: 崩溃后的重试次数（内部使用）
+        """
+        crashed = []
+
+        with self._create_executor(min(len(indexed_jobs), self.max_workers)) as executor:
+            futures = {
+                executor.submit(_run_job, index, job, self.font_dirs): (index, job)
+                for index, job in indexed_jobs
+            }
+
+            for future in as_completed(futures):
+                index, job = futures[future]
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    # 工作进程异常退出，进程池中未完成的任务都会失败
+                    crashed.append((index, job, e))
+                except Exception as e:
+                    yield self._error_result(index, job, e)
+
+        if not crashed:
+            return
+
+        crashed_jobs = [(index, job) for index, job, _ in crashed]
+        if attempt == 0:
+            print(f"Warning: Worker process crashed, retrying {len(crashed)} job(s) in a new pool")
+            yield from self._run_round(crashed_jobs, attempt=1)
+        elif len(crashed) > 1:
+            # 进程池只有一次崩溃的机会，二分后分别执行，没有导致崩溃的任务的一半可以正常完成
+            middle = len(crashed_jobs) // 2
+            for part in (crashed_jobs[:middle], crashed_jobs[middle:]):
+                yield from self._run_round(part, attempt=attempt + 1)
+        else:
+            index, job, error = crashed[0]
+            yield self._error_result(index, job, error)
+
+    @staticmethod
+    def _error_result(index: int, job: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """构造失败任务的结果"""
+        return {
+            'index': index,
+            'key': job.get('key', str(index)),
+            'success': False,
+            'error': f"{type(error).__name__}: {error}",
+            'elapsed': 0.0,
+        }
+
+    @staticmethod
+    def _normalize_job(job: Union[Mapping[str, Any], Tuple]) -> Dict[str, Any]:
+        """将任务统一为字典形式"""
+        if isinstance(job, Mapping):
+            normalized = dict(job)
+        elif isinstance(job, tuple) and len(job) in (2, 3):
+            normalized = {'config': job[0], 'data': job[1]}
+            if len(job) == 3:
+                normalized['output_path'] = job[2]
+        else:
+            raise ValueError(
+                "Each job must be a dict or a (config, data[, output_path]) tuple"
+            )
+
+        if 'config' not in normalized:
+            raise ValueError("Job is missing required field 'config'")
+
+        return normalized
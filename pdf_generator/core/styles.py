@@ -1,14 +1,14 @@
 """PDF样式管理器"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 from reportlab.lib import colors
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.lib.units import inch
 from reportlab.platypus import TableStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+from pdf_generator.utils.font_registry import get_font_registry
 
 
 class StyleManager:
@@ -77,32 +77,18 @@ class StyleManager:
             # print("Info: No font directories found. Using system default fonts.")
             return
         
-        # 定义字体映射
-        font_mappings = {
-            'SimSun': ['SimSun.ttf', 'SimSun.TTF', 'simsun.ttf', 'simsun.ttc'],
-            'SimHei': ['SimHei.ttf', 'SimHei.TTF', 'simhei.ttf', 'simhei.ttc'],
-            'GB2312': ['GB2312.ttf', 'GB2312.TTF', 'gb2312.ttf'],
-        }
-        
-        # 在所有搜索路径中查找并注册字体
-        for font_name, font_files in font_mappings.items():
+        # 在所有搜索路径中查找并注册字体（进程内共享，已注册的字体不会重复解析）
+        registry = get_font_registry()
+        for font_name, font_path in registry.find_chinese_fonts(search_paths).items():
             if font_name in self.registered_fonts:
                 continue
-                
-            for search_path in search_paths:
-                for font_file in font_files:
-                    font_path = search_path / font_file
-                    if font_path.exists():
-                        try:
-                            pdfmetrics.registerFont(TTFont(font_name, str(font_path)))
-                            self.registered_fonts.add(font_name)
-                            # print(f"Info: Registered font '{font_name}' from {font_path}")
-                            break
-                        except Exception as e:
-                            pass  # 静默失败，继续尝试其他路径
-                
-                if font_name in self.registered_fonts:
-                    break
+            
+            try:
+                registry.register_reportlab_font(font_name, font_path)
+                self.registered_fonts.add(font_name)
+                # print(f"Info: Registered font '{font_name}' from {font_path}")
+            except Exception as e:
+                pass  # 静默失败
         
         # 如果成功注册了字体，设置默认字体
         if self.registered_fonts:
@@ -126,14 +112,17 @@ class StyleManager:
             font_path: 字体文件路径
         """
         try:
-            pdfmetrics.registerFont(TTFont(font_name, font_path))
+            get_font_registry().register_reportlab_font(font_name, font_path)
             self.registered_fonts.add(font_name)
             print(f"Font '{font_name}' registered successfully")
         except Exception as e:
             print(f"Error registering font '{font_name}': {e}")
         
-    def _parse_color(self, color_str: str) -> colors.Color:
-        """解析颜色字符串（支持#RRGGBB格式）"""
+    def parse_color(self, color_str: str) -> colors.Color:
+        """解析颜色字符串（支持#RRGGBB格式，其他格式返回黑色）
+        
+        表格条件格式、分组底色等需要解析配置中颜色的组件也使用这个方法。
+        """
         if color_str.startswith('#'):
             color_str = color_str[1:]
             r = int(color_str[0:2], 16) / 255.0
@@ -142,6 +131,13 @@ class StyleManager:
             return colors.Color(r, g, b)
         return colors.black
     
+    # 兼容旧名称
+    _parse_color = parse_color
+    
+    def _parse_color_cycle(self, color_list: List[Optional[str]]) -> List[Optional[colors.Color]]:
+        """解析交替颜色列表（None 表示不填充）"""
+        return [self.parse_color(color) if color else None for color in color_list]
+    
     def _parse_alignment(self, alignment: str) -> int:
         """解析对齐方式"""
         alignment_map = {
@@ -181,7 +177,7 @@ class StyleManager:
             style_kwargs['leading'] = config.get('leading', config['fontSize'] * 1.2)
         
         if 'textColor' in config:
-            style_kwargs['textColor'] = self._parse_color(config['textColor'])
+            style_kwargs['textColor'] = self.parse_color(config['textColor'])
         
         if 'alignment' in config:
             style_kwargs['alignment'] = self._parse_alignment(config['alignment'])
@@ -242,7 +238,8 @@ class StyleManager:
                 - textColor: 表格内容文字颜色
                 - gridColor: 网格线颜色
                 - gridWidth: 网格线宽度
-                - rowBackground: 行背景色（可以是单一颜色或交替颜色列表）
+                - rowBackground: 行背景色（可以是单一颜色或交替颜色列表，列表按行循环，null表示不填充）
+                - columnBackground: 列背景色（交替颜色列表，按列循环，null表示不填充）
                 - fontSize: 字体大小
                 - padding: 单元格内边距
                 - alignment: 单元格内容水平对齐方式（LEFT/CENTER/RIGHT，默认LEFT）
@@ -251,17 +248,17 @@ class StyleManager:
         commands = []
         
         # 基础网格
-        grid_color = self._parse_color(config.get('gridColor', '#CCCCCC'))
+        grid_color = self.parse_color(config.get('gridColor', '#CCCCCC'))
         grid_width = config.get('gridWidth', 0.5)
         commands.append(('GRID', (0, 0), (-1, -1), grid_width, grid_color))
         
         # 表头样式
         if 'headerBackground' in config:
-            header_bg = self._parse_color(config['headerBackground'])
+            header_bg = self.parse_color(config['headerBackground'])
             commands.append(('BACKGROUND', (0, 0), (-1, 0), header_bg))
         
         if 'headerTextColor' in config:
-            header_text = self._parse_color(config['headerTextColor'])
+            header_text = self.parse_color(config['headerTextColor'])
             commands.append(('TEXTCOLOR', (0, 0), (-1, 0), header_text))
         
         # 表头加粗 - 使用中文字体
@@ -282,21 +279,25 @@ class StyleManager:
         
         # 表格内容文字颜色
         if 'textColor' in config:
-            content_text_color = self._parse_color(config['textColor'])
+            content_text_color = self.parse_color(config['textColor'])
             commands.append(('TEXTCOLOR', (0, 1), (-1, -1), content_text_color))
 
         # 行背景色
         if 'rowBackground' in config:
             row_bg = config['rowBackground']
             if isinstance(row_bg, list):
-                # 交替行颜色
-                for i, color in enumerate(row_bg):
-                    bg_color = self._parse_color(color)
-                    commands.append(('BACKGROUND', (0, i+1), (-1, i+1), bg_color))
+                # 交替行颜色：一条 ROWBACKGROUNDS 命令按行循环，与表格行数无关
+                commands.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), self._parse_color_cycle(row_bg)))
             else:
-                bg_color = self._parse_color(row_bg)
+                bg_color = self.parse_color(row_bg)
                 commands.append(('BACKGROUND', (0, 1), (-1, -1), bg_color))
         
+        # 列背景色（交替颜色，绘制在行背景色之上）
+        if 'columnBackground' in config:
+            commands.append(
+                ('COLBACKGROUNDS', (0, 1), (-1, -1), self._parse_color_cycle(config['columnBackground']))
+            )
+        
         # 字体大小
         if 'fontSize' in config:
             commands.append(('FONTSIZE', (0, 0), (-1, -1), config['fontSize']))
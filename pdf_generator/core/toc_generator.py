@@ -1,20 +1,57 @@
 """目录（TOC）生成器"""
 
-from typing import Dict, Any, List, Optional
+from ast import literal_eval
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable
+import io
+from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import Paragraph, PageBreak, Spacer
-from reportlab.platypus.tableofcontents import TableOfContents
+from reportlab.platypus.tableofcontents import TableOfContents, drawPageNumbers
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 
 
+@lru_cache(maxsize=None)
+def single_pass_supported() -> bool:
+    """当前ReportLab版本是否支持单遍布局的目录
+    
+    单遍目录在段落的 onDraw 回调中读取 canvas._curr_tx_info 得到条目末尾的位置（与ReportLab
+    自带的 drawPageNumbers 相同），这是ReportLab的内部属性。这里绘制一个带 onDraw 的段落检查一次，
+    不支持时输出警告，目录改为使用 multiBuild。
+    """
+    positions = []
+    canvas = Canvas(io.BytesIO())
+    canvas.probeTOCEntryEnd = lambda canv, kind, label: positions.append(getattr(canv, '_curr_tx_info', None))
+    try:
+        paragraph = Paragraph('x<onDraw name="probeTOCEntryEnd" label=""/>', ParagraphStyle('probe'))
+        paragraph.wrapOn(canvas, 100, 100)
+        paragraph.drawOn(canvas, 0, 0)
+    except Exception:
+        positions.clear()
+    
+    info = positions[0] if positions else None
+    if isinstance(info, dict) and 'cur_x' in info and 'cur_y' in info:
+        return True
+    print("Warning: singlePass TOC is not supported by this ReportLab version, using multiBuild instead")
+    return False
+
+
 class HeadingParagraph(Paragraph):
     """带目录通知功能的标题段落"""
     
-    def __init__(self, text, style, key=None, level=0, toc_notify_func=None):
+    def __init__(
+        self,
+        text,
+        style,
+        key=None,
+        level=0,
+        toc_notify_func: Optional[Callable[[str, int], None]] = None
+    ):
         Paragraph.__init__(self, text, style)
         self.key = key
         self.level = level
+        # 绘制时以 (key, 页码) 调用，用于单遍布局时记录标题所在页
         self.toc_notify_func = toc_notify_func
         # 保存纯文本用于TOC
         self.heading_text = text
@@ -39,6 +76,9 @@ class HeadingParagraph(Paragraph):
             # multiBuild机制会自动将这个通知转发给所有注册的TableOfContents对象
             if hasattr(self.canv, '_doctemplate') and self.canv._doctemplate:
                 self.canv._doctemplate.notify('TOCEntry', (self.level, self.heading_text, self.canv.getPageNumber(), self.key))
+            
+            if self.toc_notify_func:
+                self.toc_notify_func(self.key, self.canv.getPageNumber())
 
 
 class TOCEntry:
@@ -111,6 +151,74 @@ class EnhancedTableOfContents(TableOfContents):
             self.levelStyles.append(style)
 
 
+class SinglePassTableOfContents(EnhancedTableOfContents):
+    """单遍布局的目录
+    
+    multiBuild 需要把整个文档反复布局，直到目录中的页码不再变化。而目录条目的标题和级别
+    在构建内容时就已确定，只有页码要等正文布局后才知道，且页码不影响目录的高度。
+    这里直接用已知条目布局目录，每个条目末尾的引导点和页码绘制为延迟表单，
+    保存前再按标题实际所在页填入，整个文档只需布局一次。需要Canvas支持 draw_deferred。
+    """
+    
+    def __init__(self, config: Dict[str, Any], style_manager, entries: List['TOCEntry']):
+        """
+        初始化目录
+        
+        Args:
+            config: TOC配置
+            style_manager: 样式管理器
+            entries: 目录条目列表（构建内容时收集，布局时记录页码）
+        """
+        EnhancedTableOfContents.__init__(self, config, style_manager)
+        self.toc_entries = entries
+    
+    def isIndexing(self):
+        """不参与multiBuild的多遍构建"""
+        return 0
+    
+    def wrap(self, availWidth, availHeight):
+        """使用已收集的条目布局，页码部分延迟绘制"""
+        self._lastEntries = [
+            (entry.level - 1, entry.title, 0, entry.key) for entry in self.toc_entries
+        ]
+        size = EnhancedTableOfContents.wrap(self, availWidth, availHeight)
+        
+        entries_by_key = {entry.key: entry for entry in self.toc_entries}
+        
+        def drawTOCEntryEnd(canvas, kind, label):
+            """在条目末尾放置延迟表单，保存时绘制引导点和页码"""
+            label = label.split(',')
+            level, key = int(label[1]), literal_eval(label[2])
+            style = self.getLevelStyle(level)
+            if self.dotsMinLevel >= 0 and level >= self.dotsMinLevel:
+                dot = ' . '
+            else:
+                dot = ''
+            info = getattr(canvas, '_curr_tx_info', None)
+            if info is None:
+                # single_pass_supported() 已检查过，到这里说明ReportLab的行为与检查时不一致
+                raise RuntimeError("singlePass TOC requires canvas._curr_tx_info in paragraph onDraw callbacks")
+            x, y = info['cur_x'], info['cur_y']
+            entry = entries_by_key[key]
+            
+            def draw_page_number(canvas, total_pages):
+                page = entry.page_num
+                if self.formatter:
+                    page = self.formatter(page)
+                canvas._curr_tx_info = {'cur_x': x, 'cur_y': y}
+                # 不传key：表单中的链接会落到错误的页面上，链接在布局时添加
+                drawPageNumbers(canvas, style, [(page, None)], availWidth, availHeight, dot)
+            
+            canvas.draw_deferred(
+                draw_page_number,
+                bbox=(x, y - style.leading, availWidth, y + style.leading)
+            )
+            canvas.linkRect('', key, (x, y, availWidth, y + style.leading), relative=1)
+        
+        self.canv.drawTOCEntryEnd = drawTOCEntryEnd
+        return size
+
+
 class TOCGenerator:
     """目录生成器"""
     
@@ -125,15 +233,29 @@ class TOCGenerator:
         self.config = config
         self.style_manager = style_manager
         self.entries: List[TOCEntry] = []
+        self._entries_by_key: Dict[str, TOCEntry] = {}
     
     def is_enabled(self) -> bool:
         """是否启用目录"""
         return self.config.get('enabled', False)
     
+    def reset(self):
+        """清空已收集的目录条目（每次生成前调用，避免重复生成时条目累积）"""
+        self.entries = []
+        self._entries_by_key = {}
+    
     def is_auto_generate(self) -> bool:
         """是否自动生成目录"""
         return self.config.get('autoGenerate', True)
     
+    def is_single_pass(self) -> bool:
+        """是否单遍布局自动目录（strategy 为 singlePass，且当前ReportLab版本支持）"""
+        return (
+            self.is_auto_generate()
+            and self.config.get('strategy', 'multiBuild') == 'singlePass'
+            and single_pass_supported()
+        )
+    
     def add_entry(self, level: int, title: str, key: str = None):
         """添加目录条目
         
@@ -144,6 +266,18 @@ class TOCGenerator:
         """
         entry = TOCEntry(level, title, key=key)
         self.entries.append(entry)
+        self._entries_by_key[entry.key] = entry
+    
+    def record_page_number(self, key: str, page_num: int):
+        """记录标题实际所在的页码（标题绘制时调用）
+        
+        Args:
+            key: 条目唯一标识符
+            page_num: 页码
+        """
+        entry = self._entries_by_key.get(key)
+        if entry:
+            entry.page_num = page_num
     
     def generate_toc_elements(self) -> List:
         """生成目录元素
@@ -165,7 +299,10 @@ class TOCGenerator:
         # 添加目录
         if self.is_auto_generate():
             # 使用自动生成的目录
-            toc = EnhancedTableOfContents(self.config, self.style_manager)
+            if self.is_single_pass():
+                toc = SinglePassTableOfContents(self.config, self.style_manager, self.entries)
+            else:
+                toc = EnhancedTableOfContents(self.config, self.style_manager)
             elements.append(toc)
         else:
             # 使用手动配置的条目
@@ -243,8 +380,8 @@ class TOCGenerator:
         
         style = self.style_manager.get_style(style_name)
         
-        # 生成唯一key
-        key = f"heading_{len(self.entries)}_{id(text)}"
+        # 生成唯一key（只依赖标题顺序，保证相同输入生成相同的书签名）
+        key = f"heading_{len(self.entries)}"
         
         # 添加到目录
         if self.is_auto_generate():
@@ -252,7 +389,10 @@ class TOCGenerator:
         
         # 创建使用HeadingParagraph而不是普通Paragraph
         # HeadingParagraph会在绘制时自动添加书签
-        para = HeadingParagraph(text, style, key=key, level=level-1)
+        para = HeadingParagraph(
+            text, style, key=key, level=level-1,
+            toc_notify_func=self.record_page_number if self.is_single_pass() else None
+        )
         
         return para
 
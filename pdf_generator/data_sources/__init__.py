@@ -5,6 +5,7 @@ from pdf_generator.data_sources.json_source import JSONDataSource
 from pdf_generator.data_sources.csv_source import CSVDataSource
 from pdf_generator.data_sources.database import DatabaseDataSource
 from pdf_generator.data_sources.api_source import APIDataSource
+from pdf_generator.data_sources.lazy import LazyDataSourceDict
 
 __all__ = [
     "DataSource",
@@ -12,5 +13,6 @@ __all__ = [
     "CSVDataSource",
     "DatabaseDataSource",
     "APIDataSource",
+    "LazyDataSourceDict",
 ]
 
@@ -1,6 +1,5 @@
 """API数据源"""
 
-import requests
 from typing import Dict, Any
 import pandas as pd
 
@@ -12,6 +11,9 @@ class APIDataSource(DataSource):
     
     def fetch(self) -> pd.DataFrame:
         """从API获取数据"""
+        # requests 在首次请求时才导入
+        import requests
+        
         if 'url' not in self.config:
             raise ValueError(f"API data source '{self.name}' requires 'url' field")
         
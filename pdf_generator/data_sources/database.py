@@ -2,7 +2,6 @@
 
 from typing import Dict, Any
 import pandas as pd
-from sqlalchemy import create_engine, text
 
 from pdf_generator.data_sources.base import DataSource
 
@@ -12,6 +11,9 @@ class DatabaseDataSource(DataSource):
     
     def fetch(self) -> pd.DataFrame:
         """从数据库获取数据"""
+        # SQLAlchemy 在首次查询时才导入
+        from sqlalchemy import create_engine, text
+        
         if 'query' not in self.config:
             raise ValueError(f"Database data source '{self.name}' requires 'query' field")
         
@@ -0,0 +1,239 @@
+"""按需加载的数据源字典"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Iterable
+import pandas as pd
+
+from pdf_generator.data_sources.base import DataSource
+
+
+class LazyDataSourceDict(dict):
+    """首次访问时才加载数据的数据源字典
+
+    行为与普通的 {名称: DataFrame} 字典一致，已注册但尚未加载的数据源
+    在通过 [] / get() / in 访问时调用 DataSource.get_data() 加载。
+    Jinja模板中的 dataSources.x 也会走 [] 访问，因此同样按需加载。
+    遍历、len()、keys() / values() / items() 需要完整的内容，会先加载所有尚未加载的数据源。
+
+    加载失败时输出警告（与原先预加载的行为一致），并视为数据源不存在，
+    之后的访问不会重复尝试。
+
+    prefetch() 通过有界线程池并发加载多个数据源（数据库查询、HTTP请求等以IO等待为主），
+    每个数据源可以设置独立的超时时间。
+    """
+
+    # 并发加载的默认最大线程数
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, default_timeout: Optional[float] = None):
+        """
+        Args:
+            default_timeout: 默认的单个数据源加载超时时间（秒），None表示不限制。
+                            数据源配置中的 fetchTimeout 字段优先
+        """
+        super().__init__()
+        self._sources: Dict[str, DataSource] = {}
+        self._failed: Dict[str, str] = {}
+        self.default_timeout = default_timeout
+        # 每个数据源的加载耗时（秒），用于诊断
+        self.fetch_times: Dict[str, float] = {}
+
+    def register(self, name: str, data_source: DataSource):
+        """注册数据源（不加载数据）"""
+        self._sources[name] = data_source
+        self._failed.pop(name, None)
+
+    def get_timeout(self, name: str) -> Optional[float]:
+        """获取数据源的加载超时时间（秒）"""
+        source = self._sources.get(name)
+        if source is not None and source.config.get('fetchTimeout') is not None:
+            return source.config['fetchTimeout']
+        return self.default_timeout
+
+    def is_registered(self, name: str) -> bool:
+        """数据源是否已注册"""
+        return name in self._sources
+
+    def pending_names(self) -> List[str]:
+        """已注册但尚未加载（也未失败）的数据源名称"""
+        return [
+            name for name in self._sources
+            if not dict.__contains__(self, name) and name not in self._failed
+        ]
+
+    def load(self, name: str) -> Optional[pd.DataFrame]:
+        """加载指定数据源
+
+        Returns:
+            加载的数据；数据源未注册或加载失败时返回None
+        """
+        if dict.__contains__(self, name):
+            return dict.__getitem__(self, name)
+
+        if name not in self._sources or name in self._failed:
+            return None
+
+        if self.get_timeout(name) is not None:
+            # 需要超时控制时在工作线程中加载
+            self.prefetch([name], max_workers=1)
+            return dict.get(self, name)
+
+        start = time.perf_counter()
+        try:
+            data = self._sources[name].get_data()
+        except Exception as e:
+            self._record_failure(name, e, time.perf_counter() - start)
+            return None
+
+        self._record_success(name, data, time.perf_counter() - start)
+        return data
+
+    def prefetch(
+        self,
+        names: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, float]:
+        """并发加载多个数据源
+
+        Args:
+            names: 要加载的数据源名称，None表示所有尚未加载的数据源
+            max_workers: 最大并发线程数，默认为 min(数据源数量, DEFAULT_MAX_WORKERS)
+
+        Returns:
+            本次加载的数据源耗时（秒），超时或失败的数据源同样记录耗时
+        """
+        pending = self.pending_names()
+        if names is not None:
+            wanted = set(names)
+            pending = [name for name in pending if name in wanted]
+
+        if not pending:
+            return {}
+
+        workers = max_workers or min(len(pending), self.DEFAULT_MAX_WORKERS)
+        started: Dict[str, float] = {}
+
+        def fetch(name: str) -> pd.DataFrame:
+            started[name] = time.perf_counter()
+            return self._sources[name].get_data()
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='data-source')
+        try:
+            futures = {executor.submit(fetch, name): name for name in pending}
+            remaining = set(futures)
+
+            while remaining:
+                done, remaining = wait(
+                    remaining,
+                    timeout=self._next_deadline(remaining, futures, started),
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    name = futures[future]
+                    elapsed = time.perf_counter() - started.get(name, time.perf_counter())
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        self._record_failure(name, e, elapsed)
+                    else:
+                        self._record_success(name, data, elapsed)
+
+                # 检查已开始执行但超时的数据源
+                now = time.perf_counter()
+                for future in list(remaining):
+                    name = futures[future]
+                    timeout = self.get_timeout(name)
+                    if timeout is not None and name in started and now - started[name] >= timeout:
+                        remaining.discard(future)
+                        future.cancel()
+                        self._record_failure(
+                            name, TimeoutError(f"timed out after {timeout}s"), now - started[name]
+                        )
+        finally:
+            # 超时的线程无法被强制终止，不等待它们结束
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {name: self.fetch_times[name] for name in pending if name in self.fetch_times}
+
+    def _next_deadline(self, remaining, futures, started) -> Optional[float]:
+        """计算距离最近一个超时的等待时间"""
+        now = time.perf_counter()
+        deadlines = []
+        for future in remaining:
+            name = futures[future]
+            timeout = self.get_timeout(name)
+            if timeout is None:
+                continue
+            if name in started:
+                deadlines.append(max(0.0, started[name] + timeout - now))
+            else:
+                # 还在排队，稍后再检查
+                deadlines.append(0.05)
+        return min(deadlines) if deadlines else None
+
+    def _record_success(self, name: str, data: pd.DataFrame, elapsed: float):
+        """记录加载成功的数据源"""
+        dict.__setitem__(self, name, data)
+        self.fetch_times[name] = elapsed
+        print(f"Loaded data source '{name}': {len(data)} rows")
+
+    def _record_failure(self, name: str, error: Exception, elapsed: float):
+        """记录加载失败的数据源"""
+        self._failed[name] = str(error)
+        self.fetch_times[name] = elapsed
+        print(f"Warning: Failed to load data source '{name}': {error}")
+
+    def get_errors(self) -> Dict[str, str]:
+        """获取加载失败的数据源及错误信息"""
+        return dict(self._failed)
+
+    def __missing__(self, key):
+        data = self.load(key)
+        if data is None:
+            raise KeyError(key)
+        return data
+
+    def __contains__(self, key) -> bool:
+        if dict.__contains__(self, key):
+            return True
+        return self.load(key) is not None
+
+    def __bool__(self) -> bool:
+        # 只有尚未加载的数据源时也视为非空，保证 `if not data_sources` 之类的判断与预加载时一致
+        return dict.__len__(self) > 0 or bool(self.pending_names())
+
+    def loaded(self) -> Dict[str, pd.DataFrame]:
+        """已加载的数据源（不触发加载）"""
+        return {name: dict.__getitem__(self, name) for name in dict.keys(self)}
+
+    def _load_pending(self):
+        """加载所有尚未加载的数据源（遍历整个字典时使用）"""
+        if self.pending_names():
+            self.prefetch()
+
+    def __iter__(self):
+        self._load_pending()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._load_pending()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._load_pending()
+        return dict.keys(self)
+
+    def values(self):
+        self._load_pending()
+        return dict.values(self)
+
+    def items(self):
+        self._load_pending()
+        return dict.items(self)
+
+    def get(self, key, default: Any = None):
+        if key in self:
+            return dict.__getitem__(self, key)
+        return default
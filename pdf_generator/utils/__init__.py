@@ -1,6 +1,18 @@
 """Utility functions and helpers."""
 
-from pdf_generator.utils.chart_generator import ChartGenerator
+from pdf_generator.utils.profiler import ReportProfiler, ReportProfile
+from pdf_generator.utils.result_cache import ReportCache
+from pdf_generator.utils.chart_cache import ChartCache
+from pdf_generator.utils.chart_pool import ChartRenderPool
+from pdf_generator.utils.font_registry import FontRegistry, get_font_registry
+from pdf_generator.utils.font_cache import FontMetricsCache
 
-__all__ = ["ChartGenerator"]
+__all__ = ["ChartGenerator", "ReportProfiler", "ReportProfile", "ReportCache", "ChartCache", "ChartRenderPool", "FontRegistry", "get_font_registry", "FontMetricsCache"]
 
+
+def __getattr__(name):
+    # ChartGenerator 依赖 matplotlib，首次访问时才导入
+    if name == "ChartGenerator":
+        from pdf_generator.utils.chart_generator import ChartGenerator
+        return ChartGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,121 @@
+"""图表渲染缓存
+
+每次生成图表都要创建 matplotlib 画布、调整布局并编码PNG，单个图表需要100–300ms。
+同一个图表配置作用于相同的数据时（例如多份报告共用的汇总图表），结果完全相同。
+
+ChartCache 以图表类型、规范化的图表配置和图表实际用到的列的指纹为键缓存渲染结果
+（PNG、JPEG、未压缩的TIFF或矢量图形数据，见 ChartGenerator.generate_chart），
+与 ReportCache 一样分为内存LRU和可选的磁盘两层。
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from pdf_generator.utils.result_cache import ReportCache, fingerprint_dataframe
+
+
+# 引用数据列的图表配置项
+CHART_COLUMN_KEYS = ('xAxis', 'yAxis', 'labels', 'values', 'sizeColumn', 'colorColumn')
+
+# 只影响图表在PDF中的位置、不影响渲染结果的配置项
+CHART_PLACEMENT_KEYS = ('type', 'dataSource', 'alignment')
+
+
+def get_chart_columns(config: Dict[str, Any], data: pd.DataFrame) -> List[str]:
+    """获取图表用到的数据列（按配置中出现的顺序，忽略不存在的列）"""
+    columns: List[str] = []
+    for key in CHART_COLUMN_KEYS:
+        value = config.get(key)
+        names = value if isinstance(value, (list, tuple)) else [value]
+        for name in names:
+            if isinstance(name, str) and name in data.columns and name not in columns:
+                columns.append(name)
+    return columns
+
+
+def make_chart_cache_key(
+    chart_type: str,
+    config: Dict[str, Any],
+    data: pd.DataFrame,
+    extra: Optional[Any] = None
+) -> str:
+    """计算图表的缓存键
+
+    Args:
+        chart_type: 图表类型
+        config: 图表配置
+        data: 数据源DataFrame，只有图表用到的列计入指纹（不含索引）
+        extra: 其他影响渲染结果的信息（如 matplotlib 字体），需可JSON序列化
+
+    Returns:
+        十六进制SHA-256字符串
+    """
+    normalized = {
+        key: value for key, value in config.items() if key not in CHART_PLACEMENT_KEYS
+    }
+    digest = hashlib.sha256()
+    digest.update(chart_type.encode('utf-8') + b'\0')
+    digest.update(json.dumps(
+        normalized, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    ).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(fingerprint_dataframe(data[get_chart_columns(config, data)], index=False).encode('ascii'))
+    if extra is not None:
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ChartCache(ReportCache):
+    """两层（内存LRU + 磁盘）图表渲染缓存
+
+    线程安全，可以在多个生成器之间共享。
+
+    Example:
+        >>> chart_cache = ChartCache(max_memory_bytes=32 * 1024 * 1024)
+        >>> for df in frames:
+        ...     generator = PDFReportGenerator(config_dict=config, chart_cache=chart_cache)
+        ...     generator.add_data_source("sales", df)
+        ...     generator.to_bytes()
+        >>> chart_cache.get_stats()['hit_rate']
+    """
+
+    # 默认内存缓存上限（字节）
+    DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+    # 默认磁盘缓存上限（字节）
+    DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+    # 条目可能是多种格式，磁盘文件使用中性的后缀
+    FILE_SUFFIX = '.bin'
+
+    # 旧版本的磁盘条目后缀，同样计入大小上限并由淘汰和 clear() 清理
+    LEGACY_FILE_SUFFIXES = ('.png',)
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES
+    ):
+        """
+        Args:
+            max_memory_bytes: 内存缓存的总大小上限（字节），0表示不使用内存缓存
+            cache_dir: 磁盘缓存目录，None表示不使用磁盘缓存
+            max_disk_bytes: 磁盘缓存的总大小上限（字节）
+
+        两个上限按条目的实际大小计算。imageCodec 为 flate 的图表以未压缩的TIFF缓存
+        （宽×高×3字节，默认尺寸约1MB，是同一图表PNG的上百倍），矢量图表包含所有路径数据，
+        也比PNG大；使用这些格式时应相应调大上限（默认的32MB内存上限只能容纳约30个TIFF图表）。
+        """
+        super().__init__(max_memory_bytes, cache_dir, max_disk_bytes)
+
+    def _disk_files(self):
+        files = super()._disk_files()
+        if self.cache_dir and self.cache_dir.exists():
+            for suffix in self.LEGACY_FILE_SUFFIXES:
+                files.extend(self.cache_dir.glob(f'*/*{suffix}'))
+        return files
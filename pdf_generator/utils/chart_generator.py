@@ -1,60 +1,98 @@
-"""图表生成工具"""
+"""图表生成工具
+
+不使用 pyplot：每个图表是独立的 Figure，绑定自己的 FigureCanvasAgg，不经过 pyplot 的全局
+图形管理器，多个线程可以同时生成图表。全局 rcParams 只在字体设置变化时（加锁）写入，
+绘图过程中只读取；单个图表的配置都直接传给绘图对象，不修改 rcParams。
+"""
 
 import io
+import threading
 from typing import Dict, Any, Optional
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib
 matplotlib.use('Agg')  # 使用非交互式后端
-import matplotlib.pyplot as plt
+from matplotlib.backend_bases import register_backend
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
-import matplotlib.font_manager as fm
+from PIL import Image as PILImage
+
+from pdf_generator.utils.downsample import downsample_chart_data
+from pdf_generator.utils.font_registry import get_font_registry
+
+# savefig(format='rlg') 输出 ReportLab 矢量图形
+register_backend('rlg', 'pdf_generator.utils.chart_vector', 'ReportLab Drawing')
+
+# 支持的输出格式
+CHART_FORMATS = ('png', 'vector')
+
+# 位图嵌入PDF的编码：png（PNG编码后再解码）、flate（像素直接交给ReportLab压缩）、jpeg
+CHART_IMAGE_CODECS = ('png', 'flate', 'jpeg')
+
+DEFAULT_JPEG_QUALITY = 85
+
+# 写入全局 rcParams 的锁
+_RC_LOCK = threading.Lock()
+
+
+def _update_rc_params(params: Dict[str, Any]):
+    """更新全局 rcParams（线程安全），值没有变化时不写入，避免影响正在绘图的线程"""
+    with _RC_LOCK:
+        changed = {
+            key: value for key, value in params.items() if matplotlib.rcParams[key] != value
+        }
+        if changed:
+            matplotlib.rcParams.update(changed)
 
 
 class ChartGenerator:
-    """生成各种类型的图表"""
+    """生成各种类型的图表（线程安全，可以在多个线程之间共享）"""
     
     def __init__(self):
         # 设置中文字体支持
         self._setup_chinese_fonts()
-        plt.rcParams['axes.unicode_minus'] = False
     
     def _setup_chinese_fonts(self):
-        """设置matplotlib中文字体支持"""
+        """设置matplotlib中文字体支持
+        
+        使用进程级字体注册表：项目fonts目录中的字体和已为ReportLab注册的中文字体
+        都只会添加到 matplotlib 一次。
+        """
+        registry = get_font_registry()
+        
         # 获取项目根目录下的fonts文件夹
         project_root = Path(__file__).parent.parent.parent
         fonts_dir = project_root / "fonts"
         
-        chinese_fonts = []
+        font_paths = {
+            name: str(path) for name, path in registry.find_chinese_fonts([fonts_dir]).items()
+        }
+        for name, path in registry.get_chinese_font_paths().items():
+            font_paths.setdefault(name, path)
         
-        if fonts_dir.exists():
-            # 注册项目中的字体
-            font_files = {
-                'SimHei': ['SimHei.ttf', 'SimHei.TTF'],
-                'SimSun': ['SimSun.ttf', 'SimSun.TTF'],
-                'GB2312': ['GB2312.ttf', 'GB2312.TTF'],
-            }
-            
-            for font_name, font_file_list in font_files.items():
-                for font_file in font_file_list:
-                    font_path = fonts_dir / font_file
-                    if font_path.exists():
-                        try:
-                            fm.fontManager.addfont(str(font_path))
-                            chinese_fonts.append(font_name)
-                            print(f"Matplotlib: Registered font {font_name} from {font_file}")
-                        except Exception as e:
-                            print(f"Warning: Failed to register {font_name} for matplotlib: {e}")
-                        break
+        chinese_fonts = []
+        for font_name in ('SimHei', 'SimSun', 'GB2312'):
+            font_path = font_paths.get(font_name)
+            if not font_path:
+                continue
+            try:
+                if registry.register_matplotlib_font(font_path):
+                    print(f"Matplotlib: Registered font {font_name} from {Path(font_path).name}")
+                chinese_fonts.append(font_name)
+            except Exception as e:
+                print(f"Warning: Failed to register {font_name} for matplotlib: {e}")
         
         # 设置字体优先级
         if chinese_fonts:
-            plt.rcParams['font.sans-serif'] = chinese_fonts + ['DejaVu Sans']
+            sans_serif = chinese_fonts + ['DejaVu Sans']
             print(f"Matplotlib: Chinese fonts set to {chinese_fonts}")
         else:
             # 尝试使用系统字体
-            plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun', 'DejaVu Sans']
+            sans_serif = ['SimHei', 'Microsoft YaHei', 'SimSun', 'DejaVu Sans']
             print("Warning: Using system fonts for Chinese support")
+        
+        _update_rc_params({'font.sans-serif': sans_serif, 'axes.unicode_minus': False})
     
     def generate_chart(
         self,
@@ -62,16 +100,106 @@ class ChartGenerator:
         data: pd.DataFrame,
         config: Dict[str, Any]
     ) -> bytes:
-        """生成图表并返回PNG字节流
+        """生成图表并返回字节流
         
         Args:
             chart_type: 图表类型（bar/line/pie/scatter/area）
             data: 数据DataFrame
-            config: 图表配置
+            config: 图表配置，format 为 png（默认）或 vector；位图的 imageCodec 为
+                    png（默认）、flate 或 jpeg（jpegQuality 为JPEG质量）；
+                    折线图、面积图和散点图的点数超过 maxPoints 时先降采样；
+                    设置 targetDpi 时按 width×height 英寸和 targetDpi 绘制，不裁剪四周空白
         
         Returns:
-            PNG图表的字节流
+            图表的字节流：PNG；imageCodec 为 flate 时为未压缩的TIFF，为 jpeg 时为JPEG；
+            format 为 vector 时为矢量图形数据（见 chart_vector.load_chart_drawing）
         """
+        output_format = config.get('format', 'png')
+        if output_format not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {output_format}")
+        
+        codec = config.get('imageCodec', 'png')
+        if codec not in CHART_IMAGE_CODECS:
+            raise ValueError(f"Unsupported chart image codec: {codec}")
+        
+        if output_format == 'png' and codec != 'png':
+            return self._encode_image(self.render_image(chart_type, data, config), config)
+        
+        fig = self._build_figure(chart_type, data, config)
+        
+        # 转换为字节流
+        buf = io.BytesIO()
+        fig.savefig(
+            buf,
+            format='rlg' if output_format == 'vector' else 'png',
+            dpi=self._get_dpi(config),
+            bbox_inches=None if config.get('targetDpi') else 'tight'
+        )
+        
+        return buf.getvalue()
+    
+    def render_image(
+        self,
+        chart_type: str,
+        data: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> PILImage.Image:
+        """把图表绘制到Agg画布并返回像素图像（不经过PNG编码）
+        
+        与 savefig(bbox_inches='tight') 一样裁掉四周的空白，但只能裁剪到画布范围内，
+        画布之外的元素（如放在图表外侧的图例）不会被保留。设置 targetDpi 时不裁剪，
+        返回整个画布。
+        
+        Returns:
+            不透明时为RGB图像，否则为RGBA图像
+        """
+        fig = self._build_figure(chart_type, data, config)
+        fig.set_dpi(self._get_dpi(config))
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        # 直接引用画布的RGBA缓冲区
+        pixels = np.asarray(renderer.buffer_rgba())
+        
+        if not config.get('targetDpi'):
+            bbox = fig.get_tightbbox(renderer).padded(matplotlib.rcParams['savefig.pad_inches'])
+            height, width = pixels.shape[:2]
+            dpi = fig.dpi
+            left = max(int(bbox.x0 * dpi), 0)
+            right = min(int(np.ceil(bbox.x1 * dpi)), width)
+            top = max(height - int(np.ceil(bbox.y1 * dpi)), 0)
+            bottom = min(height - int(bbox.y0 * dpi), height)
+            pixels = pixels[top:bottom, left:right]
+        
+        # 裁剪和去掉alpha通道时复制一次像素
+        if (pixels[..., 3] == 255).all():
+            return PILImage.fromarray(np.ascontiguousarray(pixels[..., :3]))
+        return PILImage.fromarray(np.ascontiguousarray(pixels))
+    
+    @staticmethod
+    def _get_dpi(config: Dict[str, Any]) -> float:
+        """栅格化分辨率：targetDpi 优先于 dpi"""
+        return config.get('targetDpi') or config.get('dpi', 100)
+    
+    @staticmethod
+    def _encode_image(image: PILImage.Image, config: Dict[str, Any]) -> bytes:
+        """按 imageCodec 编码 render_image 的结果"""
+        buf = io.BytesIO()
+        if config.get('imageCodec') == 'jpeg':
+            if image.mode == 'RGBA':
+                # JPEG不支持透明，合成到白色背景上
+                background = PILImage.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            image.save(buf, format='JPEG', quality=config.get('jpegQuality', DEFAULT_JPEG_QUALITY))
+        else:
+            # 未压缩的TIFF只是加上文件头的像素数据，嵌入PDF时由ReportLab进行Flate压缩
+            image.save(buf, format='TIFF')
+        return buf.getvalue()
+    
+    def _build_figure(self, chart_type: str, data: pd.DataFrame, config: Dict[str, Any]) -> Figure:
+        """创建并绘制图表"""
+        data, _ = downsample_chart_data(chart_type, data, config)
+        
         fig = self._create_figure(config)
         ax = fig.add_subplot(111)
         
@@ -101,19 +229,15 @@ class ChartGenerator:
         # 调整布局
         fig.tight_layout()
         
-        # 转换为字节流
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=config.get('dpi', 100), bbox_inches='tight')
-        plt.close(fig)
-        buf.seek(0)
-        
-        return buf.read()
+        return fig
     
     def _create_figure(self, config: Dict[str, Any]) -> Figure:
         """创建图表画布"""
         width = config.get('width', 8)
         height = config.get('height', 5)
-        fig = plt.figure(figsize=(width, height))
+        fig = Figure(figsize=(width, height))
+        # 每个图表使用自己的画布，不注册到 pyplot
+        FigureCanvasAgg(fig)
         
         # 设置背景色
         if 'backgroundColor' in config:
@@ -0,0 +1,119 @@
+"""图表并行渲染
+
+ChartGenerator 可以在多个线程中使用，但绘图的大部分时间都持有GIL，多线程无法利用多个CPU核心。
+ChartRenderPool 把一批图表分发到进程池中渲染，每个工作进程只创建一次 ChartGenerator，
+进程池在第一次使用时创建，之后在多次生成之间复用。
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from pdf_generator.utils.font_registry import get_font_registry
+
+
+# 图表渲染任务：(图表类型, 数据, 图表配置)
+ChartJob = Tuple[str, pd.DataFrame, Dict[str, Any]]
+
+# 工作进程内的图表生成器
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(font_paths: Dict[str, str]):
+    """工作进程初始化：注册主进程已注册的中文字体并创建图表生成器
+
+    ChartGenerator 从字体注册表中读取已为ReportLab注册的中文字体，
+    先注册这些字体，工作进程中的图表才会与主进程中渲染的一致。
+    """
+    registry = get_font_registry()
+    for font_name, font_path in font_paths.items():
+        try:
+            registry.register_reportlab_font(font_name, font_path)
+        except Exception as e:
+            print(f"Warning: Failed to register font '{font_name}' in chart worker: {e}")
+
+    from pdf_generator.utils.chart_generator import ChartGenerator
+    _WORKER_STATE['chart_generator'] = ChartGenerator()
+
+
+def _render_chart(chart_type: str, data: pd.DataFrame, config: Dict[str, Any]) -> bytes:
+    """在工作进程中渲染单个图表"""
+    return _WORKER_STATE['chart_generator'].generate_chart(chart_type, data, config)
+
+
+class ChartRenderPool:
+    """多进程图表渲染池（线程安全）
+
+    Example:
+        >>> pool = ChartRenderPool(max_workers=4)
+        >>> results = pool.render([("bar", df, {"xAxis": "产品", "yAxis": "销量"})])
+        >>> pool.shutdown()
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: 工作进程数量，默认为CPU核心数
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(get_font_registry().get_chinese_font_paths(),)
+                )
+            return self._executor
+
+    def render(self, jobs: Sequence[ChartJob]) -> List[Union[bytes, Exception]]:
+        """并行渲染一批图表
+
+        Args:
+            jobs: 渲染任务列表，每个任务为 (图表类型, 数据, 图表配置)
+
+        Returns:
+            与 jobs 顺序一致的结果列表：图表字节，或该图表渲染时抛出的异常
+
+        Raises:
+            BrokenProcessPool: 工作进程异常退出（进程池会被关闭，下次使用时重新创建）
+        """
+        executor = self._get_executor()
+        futures = [executor.submit(_render_chart, *job) for job in jobs]
+
+        results: List[Union[bytes, Exception]] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                self.shutdown()
+                raise
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"ChartRenderPool(max_workers={self.max_workers}, started={self._executor is not None})"
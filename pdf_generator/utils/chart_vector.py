@@ -0,0 +1,479 @@
+"""matplotlib 矢量图表后端
+
+把 matplotlib 图表直接绘制为 ReportLab 图形（reportlab.graphics.shapes），
+嵌入PDF时是矢量路径和文本，不再经过 PNG 编码、解码和按DPI栅格化。
+
+使用方式与其他 matplotlib 输出格式相同：
+
+    >>> fig.savefig(buf, format='rlg', bbox_inches='tight')
+    >>> drawing = load_chart_drawing(buf.getvalue())
+
+输出的字节是图形数据（路径、文本、图片像素和图表用到的字体文件路径），不是 pickle，
+可以放入 ChartCache 或在进程间传递。load_chart_drawing 只按数据重建图形对象并校验每个字段，
+不会执行数据中的代码；它会在当前进程中注册图表用到的字体（名称以 mpl- 开头的 .ttf 文件）。
+
+格式：MAGIC + 4字节（大端）的JSON长度 + JSON（图形结构）+ 图片像素（RGB，按JSON中的偏移量读取）
+"""
+
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from matplotlib import font_manager
+from matplotlib.backend_bases import FigureCanvasBase, RendererBase
+from matplotlib.path import Path as MplPath
+from PIL import Image as PILImage
+from reportlab.graphics.shapes import Drawing, Group, Image, Path, String, FILL_NON_ZERO
+from reportlab.lib.colors import Color
+
+from pdf_generator.utils.font_registry import get_font_registry
+
+
+# 输出格式版本，序列化结构变化时递增（同时计入图表缓存键）
+VECTOR_FORMAT_VERSION = 2
+
+_MAGIC = b'RLGCHART'
+_HEADER = struct.Struct('>I')
+
+_LINE_CAPS = {'butt': 0, 'round': 1, 'projecting': 2}
+_LINE_JOINS = {'miter': 0, 'round': 1, 'bevel': 2}
+
+
+def dump_chart_drawing(drawing: Drawing, fonts: Dict[str, str]) -> bytes:
+    """把 RendererReportLab 绘制的 Drawing 序列化为字节
+
+    Args:
+        drawing: 图表图形
+        fonts: 图表用到的ReportLab字体 {字体名称: 路径}
+    """
+    blobs: List[bytes] = []
+    offset = [0]
+
+    def dump_shape(shape) -> Dict[str, Any]:
+        if isinstance(shape, Group):
+            return {
+                'type': 'group',
+                'transform': [float(v) for v in shape.transform],
+                'contents': [dump_shape(child) for child in shape.contents],
+            }
+        if isinstance(shape, Path):
+            node: Dict[str, Any] = {
+                'type': 'path',
+                'operators': list(shape.operators),
+                'points': [float(v) for v in shape.points],
+                'fillMode': shape.fillMode,
+                'isClipPath': bool(shape.isClipPath),
+                'fill': _dump_color(shape.fillColor),
+                'stroke': _dump_color(shape.strokeColor),
+            }
+            if shape.strokeColor is not None:
+                node['strokeWidth'] = float(shape.strokeWidth)
+                node['strokeLineCap'] = shape.strokeLineCap
+                node['strokeLineJoin'] = shape.strokeLineJoin
+                node['strokeDashArray'] = (
+                    [float(v) for v in shape.strokeDashArray] if shape.strokeDashArray else None
+                )
+            return node
+        if isinstance(shape, String):
+            return {
+                'type': 'string',
+                'x': float(shape.x), 'y': float(shape.y), 'text': shape.text,
+                'fontName': shape.fontName, 'fontSize': float(shape.fontSize),
+                'fill': _dump_color(shape.fillColor),
+            }
+        if isinstance(shape, Image):
+            pixels = shape.path.convert('RGB')
+            data = pixels.tobytes()
+            blobs.append(data)
+            node = {
+                'type': 'image',
+                'x': float(shape.x), 'y': float(shape.y),
+                'width': float(shape.width), 'height': float(shape.height),
+                'size': list(pixels.size), 'offset': offset[0], 'length': len(data),
+            }
+            offset[0] += len(data)
+            return node
+        raise TypeError(f"Unsupported shape in vector chart: {type(shape).__name__}")
+
+    header = json.dumps({
+        'version': VECTOR_FORMAT_VERSION,
+        'width': float(drawing.width),
+        'height': float(drawing.height),
+        'fonts': fonts,
+        'contents': [dump_shape(shape) for shape in drawing.contents],
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return b''.join([_MAGIC, _HEADER.pack(len(header)), header] + blobs)
+
+
+def load_chart_drawing(data: bytes) -> Drawing:
+    """由矢量图表字节恢复 Drawing，并注册其中用到的字体
+
+    Raises:
+        ValueError: 数据不是本模块输出的矢量图表（或已损坏）
+    """
+    try:
+        if not data.startswith(_MAGIC):
+            raise ValueError("missing vector chart header")
+        start = len(_MAGIC) + _HEADER.size
+        (length,) = _HEADER.unpack_from(data, len(_MAGIC))
+        payload = json.loads(bytes(data[start:start + length]).decode('utf-8'))
+        if not isinstance(payload, dict) or payload.get('version') != VECTOR_FORMAT_VERSION:
+            raise ValueError("unsupported version")
+        blobs = memoryview(data)[start + length:]
+
+        fonts = payload['fonts']
+        if not isinstance(fonts, dict):
+            raise ValueError("invalid font list")
+        for font_name, font_path in fonts.items():
+            # 只注册本模块命名的字体，不会替换已注册的其他同名字体
+            if (not font_name.startswith('mpl-') or not isinstance(font_path, str)
+                    or os.path.splitext(font_path)[1].lower() != '.ttf'):
+                raise ValueError(f"invalid font entry '{font_name}'")
+
+        drawing = Drawing(_number(payload['width']), _number(payload['height']))
+        for node in _list(payload['contents']):
+            drawing.add(_load_shape(node, blobs))
+    except ValueError as e:
+        raise ValueError(f"Unsupported vector chart data: {e}") from e
+    except (KeyError, TypeError, AttributeError, RecursionError, struct.error) as e:
+        raise ValueError(f"Unsupported vector chart data: {type(e).__name__}: {e}") from e
+
+    registry = get_font_registry()
+    for font_name, font_path in fonts.items():
+        registry.register_reportlab_font(font_name, font_path)
+    return drawing
+
+
+def _load_shape(node: Dict[str, Any], blobs: memoryview):
+    """按 dump_chart_drawing 输出的结构重建图形对象"""
+    shape_type = node['type']
+    if shape_type == 'group':
+        transform = _numbers(node['transform'])
+        if len(transform) != 6:
+            raise ValueError("invalid transform")
+        group = Group(*(_load_shape(child, blobs) for child in _list(node['contents'])))
+        group.transform = tuple(transform)
+        return group
+
+    if shape_type == 'path':
+        operators = _numbers(node['operators'])
+        if any(op not in (0, 1, 2, 3) for op in operators):
+            raise ValueError("invalid path operator")
+        shape = Path(
+            points=_numbers(node['points']),
+            operators=operators,
+            isClipPath=1 if node['isClipPath'] else 0,
+            fillMode=int(_number(node['fillMode']))
+        )
+        shape.fillColor = _load_color(node['fill'])
+        shape.strokeColor = _load_color(node['stroke'])
+        if shape.strokeColor is not None:
+            shape.strokeWidth = _number(node['strokeWidth'])
+            shape.strokeLineCap = int(_number(node['strokeLineCap']))
+            shape.strokeLineJoin = int(_number(node['strokeLineJoin']))
+            dashes = node['strokeDashArray']
+            if dashes is not None:
+                shape.strokeDashArray = _numbers(dashes)
+        return shape
+
+    if shape_type == 'string':
+        if not isinstance(node['text'], str) or not isinstance(node['fontName'], str):
+            raise ValueError("invalid text")
+        return String(
+            _number(node['x']), _number(node['y']), node['text'],
+            fontName=node['fontName'], fontSize=_number(node['fontSize']),
+            fillColor=_load_color(node['fill'])
+        )
+
+    if shape_type == 'image':
+        width, height = _numbers(node['size'])
+        offset, length = int(_number(node['offset'])), int(_number(node['length']))
+        if width <= 0 or height <= 0 or length != width * height * 3 or offset < 0 \
+                or offset + length > len(blobs):
+            raise ValueError("invalid image data")
+        image = PILImage.frombytes('RGB', (width, height), bytes(blobs[offset:offset + length]))
+        return Image(
+            _number(node['x']), _number(node['y']), _number(node['width']), _number(node['height']), image
+        )
+
+    raise ValueError(f"unknown shape type {shape_type!r}")
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"expected a number, got {type(value).__name__}")
+    return value
+
+
+def _numbers(value) -> list:
+    """校验数值列表（整数列表保持为整数）"""
+    array = np.asarray(_list(value))
+    if array.ndim != 1 or (array.size and array.dtype.kind not in 'iuf'):
+        raise ValueError("expected a list of numbers")
+    return array.tolist()
+
+
+def _list(value) -> list:
+    if not isinstance(value, list):
+        raise ValueError(f"expected a list, got {type(value).__name__}")
+    return value
+
+
+def _dump_color(color: Optional[Color]) -> Optional[List[float]]:
+    if color is None:
+        return None
+    return [float(color.red), float(color.green), float(color.blue), float(color.alpha)]
+
+
+def _load_color(value) -> Optional[Color]:
+    if value is None:
+        return None
+    rgba = _numbers(value)
+    if len(rgba) != 4:
+        raise ValueError("invalid color")
+    return Color(rgba[0], rgba[1], rgba[2], alpha=rgba[3])
+
+
+class RendererReportLab(RendererBase):
+    """把 matplotlib 的绘图操作转换为 ReportLab 图形
+
+    坐标单位为点（figure.dpi 固定为72），原点在左下角，与PDF一致。
+    """
+
+    def __init__(self, width: float, height: float, image_dpi: float = 72):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.image_dpi = image_dpi
+        self.drawing = Drawing(width, height)
+        # 图表用到的ReportLab字体 {字体名称: 路径}
+        self.fonts: Dict[str, str] = {}
+        # 文件路径 -> 已注册的字体名称（None表示无法用于ReportLab）
+        self._font_names: Dict[str, Optional[str]] = {}
+        self._clip_key = None
+        self._clip_group: Optional[Group] = None
+
+    def flipy(self):
+        return False
+
+    def get_canvas_width_height(self):
+        return self.width, self.height
+
+    def option_image_nocomposite(self):
+        return True
+
+    def get_image_magnification(self):
+        return self.image_dpi / 72.0
+
+    def draw_path(self, gc, path, transform, rgbFace=None):
+        # 无填充时按裁剪矩形裁掉路径中不可见的部分（与PDF后端相同）
+        clip = None
+        if rgbFace is None and gc.get_hatch_path() is None:
+            clip_rect = gc.get_clip_rectangle()
+            if clip_rect is not None:
+                clip = clip_rect.extents
+
+        shape = self._to_path(path.iter_segments(
+            transform, clip=clip, simplify=path.should_simplify and rgbFace is None,
+            curves=True, sketch=gc.get_sketch_params()
+        ))
+        if shape is None:
+            return
+
+        if gc.get_forced_alpha():
+            stroke_alpha = fill_alpha = gc.get_alpha()
+        else:
+            stroke_alpha = gc.get_rgb()[3]
+            fill_alpha = rgbFace[3] if rgbFace is not None and len(rgbFace) > 3 else 1.0
+
+        linewidth = gc.get_linewidth()
+        if linewidth > 0 and stroke_alpha > 0:
+            shape.strokeColor = self._color(gc.get_rgb(), stroke_alpha)
+            shape.strokeWidth = linewidth
+            shape.strokeLineCap = _LINE_CAPS.get(gc.get_capstyle(), 0)
+            shape.strokeLineJoin = _LINE_JOINS.get(gc.get_joinstyle(), 0)
+            _, dashes = gc.get_dashes()
+            if dashes:
+                shape.strokeDashArray = list(dashes)
+        else:
+            shape.strokeColor = None
+
+        if rgbFace is not None and fill_alpha > 0:
+            shape.fillColor = self._color(rgbFace, fill_alpha)
+        else:
+            shape.fillColor = None
+
+        if shape.strokeColor is not None or shape.fillColor is not None:
+            self._add(gc, shape)
+
+    def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
+        font_name = None if ismath else self._get_font_name(prop, s)
+        if font_name is None:
+            # 公式或ReportLab无法使用的字体：转换为路径
+            return self._draw_text_as_path(gc, x, y, s, prop, angle, ismath)
+
+        alpha = gc.get_alpha() if gc.get_forced_alpha() else gc.get_rgb()[3]
+        text = String(
+            0, 0, s, fontName=font_name, fontSize=prop.get_size_in_points(),
+            fillColor=self._color(gc.get_rgb(), alpha)
+        )
+        group = Group(text)
+        group.translate(x, y)
+        if angle:
+            group.rotate(angle)
+        self._add(gc, group)
+
+    def draw_image(self, gc, x, y, im):
+        h, w = im.shape[:2]
+        if w == 0 or h == 0:
+            return
+
+        image = PILImage.fromarray(np.asarray(im, dtype=np.uint8))
+        if image.mode == 'RGBA':
+            # 图形中的图片合成到白色背景上
+            background = PILImage.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+
+        scale = self.get_image_magnification()
+        self._add(gc, Image(x, y, w / scale, h / scale, image))
+
+    def _add(self, gc, shape):
+        """添加图形，连续使用相同裁剪区域的图形放在同一个裁剪组中"""
+        clip_rect = gc.get_clip_rectangle()
+        clip_path, clip_transform = gc.get_clip_path()
+        if clip_rect is None and clip_path is None:
+            self._clip_key = None
+            self._clip_group = None
+            self.drawing.add(shape)
+            return
+
+        key = (
+            tuple(clip_rect.bounds) if clip_rect is not None else None,
+            id(clip_path), id(clip_transform)
+        )
+        if key != self._clip_key or self._clip_group is None:
+            group = Group()
+            if clip_rect is not None:
+                x0, y0, x1, y1 = clip_rect.extents
+                group.add(self._clip_shape([
+                    ((x0, y0), MplPath.MOVETO), ((x1, y0), MplPath.LINETO),
+                    ((x1, y1), MplPath.LINETO), ((x0, y1), MplPath.LINETO),
+                    ((x0, y0), MplPath.CLOSEPOLY),
+                ]))
+            if clip_path is not None:
+                tpath, affine = clip_path.get_transformed_path_and_affine()
+                group.add(self._clip_shape(tpath.iter_segments(affine, curves=True)))
+            self.drawing.add(group)
+            self._clip_key = key
+            self._clip_group = group
+        self._clip_group.add(shape)
+
+    def _clip_shape(self, segments) -> Path:
+        shape = self._to_path(
+            ((np.asarray(points).ravel(), code) for points, code in segments)
+        ) or Path()
+        shape.isClipPath = 1
+        shape.strokeColor = None
+        shape.fillColor = None
+        return shape
+
+    @staticmethod
+    def _to_path(segments) -> Optional[Path]:
+        """把 matplotlib 路径段转换为ReportLab Path，空路径返回None"""
+        shape = Path(fillMode=FILL_NON_ZERO)
+        current = (0.0, 0.0)
+        start = (0.0, 0.0)
+        for points, code in segments:
+            if code == MplPath.MOVETO:
+                current = start = (points[0], points[1])
+                shape.moveTo(*current)
+            elif code == MplPath.LINETO:
+                current = (points[0], points[1])
+                shape.lineTo(*current)
+            elif code == MplPath.CURVE3:
+                # 二次贝塞尔曲线转换为三次
+                (x0, y0), (cx, cy), (x, y) = current, points[:2], points[2:4]
+                shape.curveTo(
+                    x0 + 2 / 3 * (cx - x0), y0 + 2 / 3 * (cy - y0),
+                    x + 2 / 3 * (cx - x), y + 2 / 3 * (cy - y),
+                    x, y
+                )
+                current = (x, y)
+            elif code == MplPath.CURVE4:
+                shape.curveTo(*points[:6])
+                current = (points[4], points[5])
+            elif code == MplPath.CLOSEPOLY:
+                shape.closePath()
+                current = start
+        return shape if shape.operators else None
+
+    def _get_font_name(self, prop, s: str) -> Optional[str]:
+        """获取文本使用的ReportLab字体名称，字体缺少文本中的字符时返回None"""
+        font_path = font_manager.findfont(prop)
+        if font_path not in self._font_names:
+            font_name = None
+            if os.path.splitext(font_path)[1].lower() == '.ttf':
+                digest = hashlib.sha256(font_path.encode('utf-8')).hexdigest()[:8]
+                stem = os.path.splitext(os.path.basename(font_path))[0]
+                font_name = f"mpl-{stem}-{digest}"
+                try:
+                    get_font_registry().register_reportlab_font(font_name, font_path)
+                except Exception as e:
+                    print(f"Warning: Drawing text as paths, cannot use font {font_path}: {e}")
+                    font_name = None
+            self._font_names[font_path] = font_name
+
+        font_name = self._font_names[font_path]
+        if font_name is None:
+            return None
+
+        from reportlab.pdfbase import pdfmetrics
+        char_to_glyph = pdfmetrics.getFont(font_name).face.charToGlyph
+        if any(ord(c) not in char_to_glyph for c in s):
+            return None
+
+        self.fonts[font_name] = font_path
+        return font_name
+
+    @staticmethod
+    def _color(rgb, alpha: float) -> Color:
+        return Color(float(rgb[0]), float(rgb[1]), float(rgb[2]), alpha=float(alpha))
+
+
+class FigureCanvasReportLab(FigureCanvasBase):
+    """输出 ReportLab 矢量图形的画布，对应 savefig 的 format='rlg'"""
+
+    filetypes = {'rlg': 'ReportLab Drawing'}
+
+    def get_default_filetype(self):
+        return 'rlg'
+
+    def print_rlg(self, filename_or_obj, *, dpi: Optional[float] = None,
+                  bbox_inches_restore=None, **kwargs):
+        """绘制图表并写入序列化的 Drawing
+
+        Args:
+            filename_or_obj: 文件路径或可写的二进制文件对象
+            dpi: 图表中图片（如颜色条）的分辨率，不影响矢量内容
+        """
+        image_dpi = dpi or self.figure.dpi
+        # PDF中1点 = 1/72英寸
+        self.figure.dpi = 72
+        width, height = self.figure.get_size_inches() * 72
+
+        renderer = RendererReportLab(width, height, image_dpi)
+        self.figure.draw(renderer)
+
+        data = dump_chart_drawing(renderer.drawing, renderer.fonts)
+        if hasattr(filename_or_obj, 'write'):
+            filename_or_obj.write(data)
+        else:
+            with open(filename_or_obj, 'wb') as f:
+                f.write(data)
+
+
+FigureCanvas = FigureCanvasReportLab
@@ -0,0 +1,202 @@
+"""表格条件格式
+
+每条规则按列向量化计算，得到命中的单元格矩阵（数据行数 × 列数）。命中的单元格先在每列中合并为
+连续的行区间，再把相邻列中行区间相同的合并为一个矩形，每个矩形只生成一条 BACKGROUND / TEXTCOLOR
+命令，命令数量与命中的连续区域数量成正比，而不是与命中的单元格数量成正比。
+
+规则格式：
+    {"column": "金额", "operator": "<", "value": 0, "textColor": "#FF0000"}
+    {"columns": ["收入", "支出"], "operator": "between", "value": [100, 200], "background": "#FFF2CC"}
+    {"column": 2, "top": 10, "background": "#E2EFDA"}
+
+- column / columns: 列名或列下标（未指定时为所有列）
+- operator + value: 比较条件（<、<=、>、>=、==、!=、between）；数值比较时无法转换为数值的单元格不命中
+- top / bottom: 每列中最大/最小的 N 个值（与第 N 个值相等的单元格也命中）
+- background / textColor: 命中单元格的背景色 / 文字颜色
+
+分组底色（groupBanding）按分组列的取值变化交替设置行背景色，每个连续的分组一条 BACKGROUND 命令：
+    {"column": "部门", "colors": ["#F2F2F2", null]}
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+DEFAULT_BAND_COLORS = ['#F2F2F2', None]
+
+
+def conditional_format_commands(
+    df: pd.DataFrame,
+    column_names: Sequence[Any],
+    rules: List[Dict[str, Any]],
+    parse_color: Callable[[str], Any],
+    row_offset: int = 1
+) -> List[tuple]:
+    """把条件格式规则转换为 TableStyle 命令
+
+    Args:
+        df: 表格数据（不含表头），第 i 列对应表格的第 i 列
+        column_names: 规则中的列名对应的列（通常为DataFrame的列名或表头）
+        rules: 条件格式规则列表，后面的规则覆盖前面的规则
+        parse_color: 颜色解析函数
+        row_offset: 第一个数据行在表格中的行号（表头行数）
+
+    Returns:
+        BACKGROUND / TEXTCOLOR 命令列表
+    """
+    commands = []
+    for rule in rules:
+        mask = evaluate_rule(df, column_names, rule)
+        if not mask.any():
+            continue
+        ranges = mask_to_ranges(mask)
+        for key, op in (('background', 'BACKGROUND'), ('textColor', 'TEXTCOLOR')):
+            if key not in rule:
+                continue
+            color = parse_color(rule[key])
+            commands.extend(
+                (op, (start_col, start_row + row_offset), (end_col, end_row + row_offset), color)
+                for start_col, start_row, end_col, end_row in ranges
+            )
+    return commands
+
+
+def group_band_commands(
+    df: pd.DataFrame,
+    column_names: Sequence[Any],
+    banding: Dict[str, Any],
+    parse_color: Callable[[str], Any],
+    row_offset: int = 1
+) -> List[tuple]:
+    """分组底色：分组列（任意一列）的取值变化时换下一个颜色，颜色列表循环使用，None 表示不填充
+
+    Returns:
+        每个填充颜色的连续分组一条 BACKGROUND 命令（整行）
+    """
+    columns = _resolve_columns(df, column_names, banding)
+    rows = len(df)
+    if not columns or rows == 0:
+        return []
+
+    # 与上一行相比分组列是否变化（按显示的字符串比较，NaN 也视为相同的值）
+    changes = np.zeros(rows, dtype=bool)
+    changes[0] = True
+    for col_idx in columns:
+        values = df.iloc[:, col_idx].astype(str).to_numpy()
+        changes[1:] |= values[1:] != values[:-1]
+    starts = np.flatnonzero(changes)
+    ends = np.append(starts[1:], rows) - 1
+
+    colors = [parse_color(color) if color else None for color in banding.get('colors', DEFAULT_BAND_COLORS)]
+    commands = []
+    for group, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        color = colors[group % len(colors)]
+        if color is not None:
+            commands.append(('BACKGROUND', (0, start + row_offset), (-1, end + row_offset), color))
+    return commands
+
+
+def evaluate_rule(df: pd.DataFrame, column_names: Sequence[Any], rule: Dict[str, Any]) -> np.ndarray:
+    """计算一条规则命中的单元格，返回 (行数, 列数) 的布尔矩阵"""
+    mask = np.zeros(df.shape, dtype=bool)
+    for col_idx in _resolve_columns(df, column_names, rule):
+        column = df.iloc[:, col_idx]
+        if 'top' in rule or 'bottom' in rule:
+            mask[:, col_idx] = _rank_mask(_to_numbers(column), rule)
+        else:
+            mask[:, col_idx] = _compare(column, rule.get('operator', '=='), rule.get('value'))
+    return mask
+
+
+def mask_to_ranges(mask: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """把命中矩阵合并为矩形区域 [(起始列, 起始行, 结束列, 结束行)]（行列号都包含在区域内）"""
+    rows, cols = mask.shape
+    padded = np.zeros((rows + 2, cols), dtype=np.int8)
+    padded[1:-1] = mask
+    # 按列转置后 nonzero 的结果先按列、再按行排序
+    edges = np.diff(padded, axis=0).T
+    run_cols, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+
+    ranges = []
+    # 行区间 -> 区域在 ranges 中的位置（只有紧接着的下一列可以继续合并）
+    open_ranges: Dict[Tuple[int, int], int] = {}
+    for col, start, end in zip(run_cols.tolist(), run_starts.tolist(), (run_ends - 1).tolist()):
+        key = (start, end)
+        pos = open_ranges.get(key)
+        if pos is not None and ranges[pos][2] == col - 1:
+            ranges[pos] = (ranges[pos][0], start, col, end)
+        else:
+            open_ranges[key] = len(ranges)
+            ranges.append((col, start, col, end))
+    return ranges
+
+
+def _resolve_columns(df: pd.DataFrame, column_names: Sequence[Any], rule: Dict[str, Any]) -> List[int]:
+    """把规则中的列名或列下标转换为列下标"""
+    if 'columns' in rule:
+        columns = rule['columns']
+    elif 'column' in rule:
+        columns = [rule['column']]
+    else:
+        return list(range(df.shape[1]))
+
+    names = list(column_names)
+    indices = []
+    for column in columns:
+        if isinstance(column, int) and not isinstance(column, bool):
+            if 0 <= column < df.shape[1]:
+                indices.append(column)
+                continue
+        elif column in names:
+            indices.append(names.index(column))
+            continue
+        print(f"Warning: Conditional format column '{column}' not found, skipping")
+    return indices
+
+
+def _to_numbers(column: pd.Series) -> np.ndarray:
+    """转换为浮点数数组，无法转换的值为 NaN"""
+    return pd.to_numeric(column, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _compare(column: pd.Series, operator: str, value: Any) -> np.ndarray:
+    """按比较条件计算一列的命中情况"""
+    if operator == 'between':
+        low, high = value
+        numbers = _to_numbers(column)
+        return (numbers >= low) & (numbers <= high)
+
+    compare = OPERATORS[operator]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # 无法转换为数值的单元格不命中（包括 != ）
+        numbers = _to_numbers(column)
+        return compare(numbers, value) & ~np.isnan(numbers)
+    # 文本比较：与表格中显示的字符串比较
+    return compare(column.astype(str).to_numpy(), str(value))
+
+
+def _rank_mask(numbers: np.ndarray, rule: Dict[str, Any]) -> np.ndarray:
+    """每列中最大（top）或最小（bottom）的 N 个值"""
+    valid = numbers[~np.isnan(numbers)]
+    if 'top' in rule:
+        n = min(int(rule['top']), len(valid))
+        if n <= 0:
+            return np.zeros(len(numbers), dtype=bool)
+        threshold = np.partition(valid, len(valid) - n)[len(valid) - n]
+        return numbers >= threshold
+    n = min(int(rule['bottom']), len(valid))
+    if n <= 0:
+        return np.zeros(len(numbers), dtype=bool)
+    threshold = np.partition(valid, n - 1)[n - 1]
+    return numbers <= threshold
@@ -0,0 +1,171 @@
+"""图表数据降采样
+
+几十万个点的折线图或散点图在6英寸宽的图表中大部分点互相重叠，却会让 matplotlib
+花费数秒绘制。绘图前先在 NumPy 中降采样：
+
+- 折线图/面积图：LTTB（Largest-Triangle-Three-Buckets），保留峰谷等形状特征
+- 散点图：网格分箱采样，每个有数据的格子保留一个点，保留点的分布范围
+
+降采样的结果最多 max_points 行，对已降采样的数据再次降采样不会改变结果。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 未设置 maxPoints 时，每英寸图表宽度保留的点数
+AUTO_POINTS_PER_INCH = 300
+
+# 支持降采样的图表类型
+DOWNSAMPLE_CHART_TYPES = ('line', 'area', 'scatter')
+
+
+def get_max_points(config: Dict[str, Any]) -> Optional[int]:
+    """获取图表的点数上限
+
+    maxPoints 为正整数时使用该值，为0时不降采样；未设置时按图表宽度自动计算。
+    """
+    max_points = config.get('maxPoints')
+    if max_points is None:
+        return int(config.get('width', 8) * AUTO_POINTS_PER_INCH)
+    max_points = int(max_points)
+    return max_points if max_points > 0 else None
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """LTTB降采样，返回保留的点的下标（升序，包含首尾两点）
+
+    Args:
+        x: X坐标（按升序排列的数值）
+        y: Y坐标
+        threshold: 保留的点数
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1][:max(threshold, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # 首尾两点之间的点分到 threshold-2 个桶中
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    # 下一个桶的平均点（最后一个桶之后是终点）
+    avg_x = np.append(sums_x[1:] / counts[1:], x[n - 1])
+    avg_y = np.append(sums_y[1:] / counts[1:], y[n - 1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 与上一个选中点、下一个桶的平均点构成的三角形面积最大的点（省略了系数1/2）
+        areas = np.abs(
+            (x[prev] - avg_x[i]) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y[i] - y[prev])
+        )
+        prev = start + int(np.argmax(areas))
+        indices[i + 1] = prev
+    return indices
+
+
+def binned_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """网格分箱采样，每个有数据的格子保留第一个点，返回保留的点的下标（升序）
+
+    非有限值（NaN、inf）的点不会被绘制，直接丢弃。
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(finite) <= max_points:
+        return finite
+
+    bins = max(int(np.sqrt(max_points)), 1)
+    bin_ids = _bin(x[finite], bins) * bins + _bin(y[finite], bins)
+    _, first = np.unique(bin_ids, return_index=True)
+    return finite[np.sort(first)]
+
+
+def downsample_chart_data(
+    chart_type: str,
+    data: pd.DataFrame,
+    config: Dict[str, Any]
+) -> Tuple[pd.DataFrame, int]:
+    """按图表配置降采样数据
+
+    列缺失或图表类型不需要降采样时原样返回数据，由图表生成器照常处理。
+
+    Args:
+        chart_type: 图表类型
+        data: 数据DataFrame
+        config: 图表配置（xAxis、yAxis、stacked、maxPoints、width）
+
+    Returns:
+        (降采样后的DataFrame, 丢弃的行数)
+    """
+    max_points = get_max_points(config)
+    if chart_type not in DOWNSAMPLE_CHART_TYPES or max_points is None or len(data) <= max_points:
+        return data, 0
+
+    x_col = config.get('xAxis')
+    y_cols = config.get('yAxis')
+    if isinstance(y_cols, str):
+        y_cols = [y_cols]
+    if not x_col or not y_cols or any(col not in data.columns for col in [x_col, *y_cols]):
+        return data, 0
+
+    try:
+        x = _numeric_x(data[x_col])
+        if chart_type == 'scatter':
+            indices = binned_indices(x, data[y_cols[0]].to_numpy(dtype=float), max_points)
+        elif chart_type == 'area' and config.get('stacked', False):
+            # 堆叠面积图的各系列共用X坐标，按总和的形状选点
+            total = np.nansum([_values(data[col]) for col in y_cols], axis=0)
+            indices = lttb_indices(x, total, max_points)
+        else:
+            indices = _union_lttb(x, [_values(data[col]) for col in y_cols], max_points)
+    except (TypeError, ValueError):
+        # 无法转换为数值的列
+        return data, 0
+
+    return data.iloc[indices], len(data) - len(indices)
+
+
+def _union_lttb(x: np.ndarray, series: List[np.ndarray], max_points: int) -> np.ndarray:
+    """每个系列分别降采样，合并选中的点（总数不超过 max_points）"""
+    threshold = max(max_points // len(series), 3)
+    if len(series) == 1:
+        return lttb_indices(x, series[0], min(threshold, max_points))
+    indices = np.unique(np.concatenate([lttb_indices(x, y, threshold) for y in series]))
+    if len(indices) > max_points:
+        indices = indices[np.linspace(0, len(indices) - 1, max_points).astype(np.int64)]
+    return indices
+
+
+def _numeric_x(column: pd.Series) -> np.ndarray:
+    """X轴数值：日期转换为时间戳，其他非数值列（类别）使用位置"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=float)
+    return np.arange(len(column), dtype=float)
+
+
+def _values(column: pd.Series) -> np.ndarray:
+    values = column.to_numpy(dtype=float)
+    # NaN 不参与面积计算
+    return np.where(np.isfinite(values), values, 0.0)
+
+
+def _bin(values: np.ndarray, bins: int) -> np.ndarray:
+    low, high = values.min(), values.max()
+    if high <= low:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - low) / (high - low) * bins).astype(np.int64), bins - 1)
@@ -0,0 +1,183 @@
+"""字体度量磁盘缓存
+
+TTFont 解析大字体文件（如 fonts/GB2312.TTF）需要遍历 cmap、hmtx、loca 等表，
+在频繁重启的工作进程中，这部分开销会反复出现在冷启动时间里。
+
+FontMetricsCache 把解析结果（字符映射、字宽、字形位置、表目录等）以 pickle
+保存到磁盘，键由字体文件内容的SHA-256和ReportLab版本组成。再次加载同一个字体时
+直接恢复解析结果，字体文件本身通过内存映射提供给子集化使用，不再复制到内存。
+
+注意：缓存文件使用 pickle，缓存目录必须只对可信用户可写。
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from weakref import WeakKeyDictionary
+
+from reportlab import Version as REPORTLAB_VERSION, rl_config
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTEncoding
+
+
+# 缓存格式版本，缓存内容的结构变化时递增
+CACHE_FORMAT_VERSION = 1
+
+# 不写入缓存的字段：字体文件数据在加载时重新映射
+_EXCLUDED_FIELDS = ('_ttf_data',)
+
+
+class FontMetricsCache:
+    """TTF字体解析结果的磁盘缓存（线程安全）
+
+    Example:
+        >>> from pdf_generator.utils import FontMetricsCache, get_font_registry
+        >>> get_font_registry().set_metrics_cache(FontMetricsCache(".font_cache"))
+        >>> generator = PDFReportGenerator(config_dict=config)  # 字体从缓存加载
+
+    也可以通过环境变量 PDF_GENERATOR_FONT_CACHE_DIR 为进程级字体注册表启用缓存。
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], use_mmap: bool = True):
+        """
+        Args:
+            cache_dir: 缓存目录
+            use_mmap: 从缓存加载时是否以内存映射方式提供字体文件数据；
+                      Windows 下映射期间字体文件无法被替换或删除
+        """
+        self.cache_dir = Path(cache_dir)
+        self.use_mmap = use_mmap
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, font_name: str, font_path: Union[str, Path], subfont_index: int = 0) -> TTFont:
+        """加载字体，优先使用缓存的解析结果
+
+        未命中时正常解析字体并写入缓存；缓存文件损坏或不兼容时退回到正常解析。
+
+        Args:
+            font_name: 注册到ReportLab的字体名称
+            font_path: 字体文件路径
+            subfont_index: TTC字体集合中的子字体序号
+
+        Returns:
+            TTFont 实例
+
+        Raises:
+            字体文件无法读取或解析时抛出原始异常
+        """
+        font_path = str(font_path)
+        data = self._read_font_data(font_path)
+        key = self._make_key(hashlib.sha256(data).hexdigest(), subfont_index)
+
+        state = self._read_entry(key)
+        if state is not None:
+            try:
+                font = self._restore_font(font_name, font_path, state, data)
+            except Exception as e:
+                print(f"Warning: Ignoring incompatible font cache entry for {font_path}: {e}")
+            else:
+                with self._lock:
+                    self.hits += 1
+                return font
+
+        with self._lock:
+            self.misses += 1
+
+        try:
+            font = TTFont(font_name, font_path, subfontIndex=subfont_index)
+        finally:
+            # 未命中或恢复失败时内存映射只用于计算摘要，TTFont 会自己读取字体文件
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._write_entry(key, {
+            name: value for name, value in vars(font.face).items()
+            if name not in _EXCLUDED_FIELDS
+        })
+        return font
+
+    def clear(self):
+        """删除所有缓存文件（不重置统计）"""
+        for path in self.cache_dir.glob('*.pickle'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    @staticmethod
+    def _make_key(file_digest: str, subfont_index: int) -> str:
+        version = hashlib.sha256(
+            f"{REPORTLAB_VERSION}:{CACHE_FORMAT_VERSION}".encode('utf-8')
+        ).hexdigest()[:16]
+        return f"{file_digest}-{subfont_index}-{version}"
+
+    def _read_font_data(self, font_path: str):
+        """读取字体文件数据（内存映射或完整读取）"""
+        with open(font_path, 'rb') as f:
+            if self.use_mmap:
+                try:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    # 空文件或不支持内存映射的文件系统
+                    pass
+            return f.read()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to read font cache entry {key}: {e}")
+            return None
+        return state if isinstance(state, dict) else None
+
+    def _write_entry(self, key: str, state: Dict[str, Any]):
+        """原子写入缓存文件，多个进程可以共享同一个目录"""
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Warning: Failed to write font cache file {path}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _restore_font(font_name: str, font_path: str, state: Dict[str, Any], data) -> TTFont:
+        """由缓存的解析结果重建 TTFont（与 TTFont.__init__ 设置相同的属性）"""
+        face = TTFontFace.__new__(TTFontFace)
+        face.__dict__.update(state)
+        face._ttf_data = data
+        face.filename = font_path
+
+        font = TTFont.__new__(TTFont)
+        font.fontName = font_name
+        font.face = face
+        font.encoding = TTEncoding()
+        font.state = WeakKeyDictionary()
+        font._asciiReadable = rl_config.ttfAsciiReadable
+        return font
+
+    def __repr__(self) -> str:
+        return f"FontMetricsCache(cache_dir={self.cache_dir}, hits={self.hits}, misses={self.misses})"
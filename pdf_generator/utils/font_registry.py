@@ -0,0 +1,204 @@
+"""进程级字体注册表
+
+StyleManager 和 ChartGenerator 每次创建时都会扫描字体目录、解析TTF文件并注册到
+ReportLab（pdfmetrics）和 matplotlib（fontManager）。字体注册是进程级的全局状态，
+重复注册同一个文件没有意义，却要付出解析TTF的代价。
+
+FontRegistry 在进程内只保留一份：
+- 字体目录的文件列表按 (目录, 修改时间) 缓存，目录内容不变时不再扫描
+- 同一个字体文件按 (路径, 修改时间) 只注册一次；pdfmetrics 中已有同名字体时直接跳过
+- ReportLab 注册过的中文字体文件同样提供给 matplotlib 使用
+- 可选的 FontMetricsCache 把解析结果保存到磁盘，新进程冷启动时不必重新解析TTF
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from pdf_generator.utils.font_cache import FontMetricsCache
+
+
+# 自动注册的中文字体：字体名称 -> 候选文件名
+CHINESE_FONT_FILES: Dict[str, List[str]] = {
+    'SimSun': ['SimSun.ttf', 'SimSun.TTF', 'simsun.ttf', 'simsun.ttc'],
+    'SimHei': ['SimHei.ttf', 'SimHei.TTF', 'simhei.ttf', 'simhei.ttc'],
+    'GB2312': ['GB2312.ttf', 'GB2312.TTF', 'gb2312.ttf'],
+}
+
+# 启用字体度量磁盘缓存的环境变量（缓存目录）
+FONT_CACHE_DIR_ENV = 'PDF_GENERATOR_FONT_CACHE_DIR'
+
+# 文件标识：(绝对路径, 修改时间)
+FontFileKey = Tuple[str, float]
+
+
+class FontRegistry:
+    """进程级字体注册表（线程安全）
+
+    通过 get_font_registry() 获取共享实例。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 目录 -> (修改时间, 文件名集合)
+        self._dir_listings: Dict[str, Tuple[float, frozenset]] = {}
+        # ReportLab字体名称 -> 注册时的文件标识
+        self._reportlab_fonts: Dict[str, FontFileKey] = {}
+        # 已添加到 matplotlib 的文件
+        self._matplotlib_files: set = set()
+        # 字体度量磁盘缓存
+        self._metrics_cache: Optional[FontMetricsCache] = None
+
+        cache_dir = os.environ.get(FONT_CACHE_DIR_ENV)
+        if cache_dir:
+            try:
+                self._metrics_cache = FontMetricsCache(cache_dir)
+            except OSError as e:
+                print(f"Warning: Failed to create font cache directory {cache_dir}: {e}")
+
+    def set_metrics_cache(self, cache: Optional[FontMetricsCache]):
+        """设置字体度量磁盘缓存，None表示不使用缓存（只影响之后注册的字体）"""
+        with self._lock:
+            self._metrics_cache = cache
+
+    @property
+    def metrics_cache(self) -> Optional[FontMetricsCache]:
+        return self._metrics_cache
+
+    @staticmethod
+    def _file_key(path: Path) -> Optional[FontFileKey]:
+        """获取文件标识，文件不存在时返回None"""
+        try:
+            resolved = path.resolve()
+            return str(resolved), resolved.stat().st_mtime
+        except OSError:
+            return None
+
+    def _list_dir(self, directory: Path) -> frozenset:
+        """列出目录中的文件名（按目录修改时间缓存）"""
+        try:
+            mtime = directory.stat().st_mtime
+        except OSError:
+            return frozenset()
+
+        key = str(directory.resolve())
+        with self._lock:
+            cached = self._dir_listings.get(key)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        try:
+            names = frozenset(os.listdir(directory))
+        except OSError:
+            names = frozenset()
+
+        with self._lock:
+            self._dir_listings[key] = (mtime, names)
+        return names
+
+    def find_chinese_fonts(self, search_paths: Iterable[Path]) -> Dict[str, Path]:
+        """在搜索路径中查找中文字体文件
+
+        Args:
+            search_paths: 字体目录列表，按优先级排列
+
+        Returns:
+            {字体名称: 文件路径}，每个字体取优先级最高的目录中找到的第一个候选文件
+        """
+        search_paths = list(search_paths)
+        found: Dict[str, Path] = {}
+        for font_name, font_files in CHINESE_FONT_FILES.items():
+            for search_path in search_paths:
+                names = self._list_dir(search_path)
+                font_file = next((f for f in font_files if f in names), None)
+                if font_file:
+                    found[font_name] = search_path / font_file
+                    break
+        return found
+
+    def register_reportlab_font(self, font_name: str, font_path) -> bool:
+        """注册ReportLab字体
+
+        pdfmetrics 中已有同名字体，且不是由本注册表从另一个文件（或已修改的文件）注册的，
+        就直接跳过，不再解析TTF文件。设置了字体度量缓存时优先从缓存加载解析结果。
+
+        Args:
+            font_name: 字体名称
+            font_path: 字体文件路径
+
+        Returns:
+            本次是否解析并注册了字体（已注册而跳过时为False）
+
+        Raises:
+            解析字体文件失败时抛出原始异常
+        """
+        key = self._file_key(Path(font_path))
+        with self._lock:
+            registered = font_name in pdfmetrics.getRegisteredFontNames()
+            previous = self._reportlab_fonts.get(font_name)
+            if registered and (previous is None or previous == key):
+                return False
+
+            if self._metrics_cache:
+                font = self._metrics_cache.load(font_name, font_path)
+            else:
+                font = TTFont(font_name, str(font_path))
+            pdfmetrics.registerFont(font)
+            if key:
+                self._reportlab_fonts[font_name] = key
+            return True
+
+    def get_reportlab_font_path(self, font_name: str) -> Optional[str]:
+        """获取通过本注册表注册的ReportLab字体的文件路径"""
+        with self._lock:
+            key = self._reportlab_fonts.get(font_name)
+        return key[0] if key else None
+
+    def get_chinese_font_paths(self) -> Dict[str, str]:
+        """获取已为ReportLab注册的中文字体文件 {字体名称: 路径}"""
+        with self._lock:
+            return {
+                name: key[0] for name, key in self._reportlab_fonts.items()
+                if name in CHINESE_FONT_FILES
+            }
+
+    def register_matplotlib_font(self, font_path) -> bool:
+        """将字体文件添加到 matplotlib 的 fontManager（同一文件只添加一次）
+
+        Returns:
+            本次是否新添加了字体
+
+        Raises:
+            添加失败时抛出原始异常
+        """
+        key = self._file_key(Path(font_path))
+        if key is None:
+            return False
+
+        with self._lock:
+            if key in self._matplotlib_files:
+                return False
+
+            import matplotlib.font_manager as fm
+            fm.fontManager.addfont(key[0])
+            self._matplotlib_files.add(key)
+            return True
+
+    def clear(self):
+        """清空缓存的目录列表和注册记录（不会从 pdfmetrics / matplotlib 中移除字体）"""
+        with self._lock:
+            self._dir_listings.clear()
+            self._reportlab_fonts.clear()
+            self._matplotlib_files.clear()
+
+
+_registry = FontRegistry()
+
+
+def get_font_registry() -> FontRegistry:
+    """获取进程级共享的字体注册表"""
+    return _registry
@@ -0,0 +1,522 @@
+"""ReportLab 矢量图表
+
+ChartGenerator 用 matplotlib 把图表渲染为PNG，ReportLab 再把PNG解码后嵌入PDF：
+文件较大、放大后模糊，而且需要导入 matplotlib。
+
+NativeChartGenerator 使用与 ChartGenerator 相同的配置项（xAxis、yAxis、stacked、colors 等），
+直接用 reportlab.graphics 把图表绘制为 Drawing，作为矢量图形写入PDF。
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, Group, Rect, String
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+
+# 默认系列颜色（与 matplotlib 默认配色 tab10 一致）
+DEFAULT_COLORS = [
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf',
+]
+
+# 散点图 colorColumn 使用的颜色映射（viridis 的采样点，线性插值）
+VIRIDIS = ['#440154', '#3b528b', '#21918c', '#5ec962', '#fde725']
+
+# 坐标轴刻度和图例的字号
+LABEL_FONT_SIZE = 8
+
+# 类别型X轴最多显示的标签数
+MAX_CATEGORY_LABELS = 12
+
+# 绘图区 (x, y, 宽, 高)
+PlotArea = Tuple[float, float, float, float]
+
+# 图例条目 (颜色, 名称)
+LegendItems = List[Tuple[colors.Color, str]]
+
+
+class NativeChartGenerator:
+    """生成 ReportLab 矢量图表（不依赖 matplotlib）"""
+
+    def __init__(self, font_name: str = 'Helvetica'):
+        """
+        Args:
+            font_name: 标题、坐标轴和图例使用的字体（需已注册到ReportLab）
+        """
+        self.font_name = font_name
+
+    def generate_chart(
+        self,
+        chart_type: str,
+        data: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> Drawing:
+        """生成图表并返回 Drawing
+
+        Args:
+            chart_type: 图表类型（bar/line/pie/scatter/area）
+            data: 数据DataFrame
+            config: 图表配置，与 ChartGenerator 相同；width/height 为图表在页面上的尺寸（英寸）
+
+        Returns:
+            ReportLab Drawing（可以直接作为flowable使用）
+
+        Raises:
+            ValueError: 图表类型不支持、缺少必需的配置项或数据为空
+        """
+        if data.empty:
+            raise ValueError("Chart data source is empty")
+
+        width = config.get('width', 6) * inch
+        height = config.get('height', 4) * inch
+        drawing = Drawing(width, height)
+
+        if 'backgroundColor' in config:
+            drawing.add(Rect(
+                0, 0, width, height,
+                fillColor=self._parse_color(config['backgroundColor']), strokeColor=None
+            ))
+
+        # 标题
+        top = height - 8
+        title = config.get('title', '')
+        if title:
+            title_size = config.get('titleFontSize', 14)
+            top -= title_size
+            drawing.add(String(
+                width / 2, top, str(title),
+                fontName=self.font_name, fontSize=title_size, textAnchor='middle'
+            ))
+            top -= 10
+
+        if chart_type == 'bar':
+            legend_items = self._create_bar_chart(drawing, top, data, config)
+        elif chart_type == 'line':
+            legend_items = self._create_line_chart(drawing, top, data, config)
+        elif chart_type == 'pie':
+            legend_items = self._create_pie_chart(drawing, top, data, config)
+        elif chart_type == 'scatter':
+            legend_items = self._create_scatter_chart(drawing, top, data, config)
+        elif chart_type == 'area':
+            legend_items = self._create_area_chart(drawing, top, data, config)
+        else:
+            raise ValueError(f"Unsupported chart type: {chart_type}")
+
+        if config.get('showLegend', True) and legend_items:
+            self._add_legend(drawing, top, legend_items, config.get('legendPosition', 'best'))
+
+        return drawing
+
+    # ------------------------------------------------------------------
+    # 各类图表
+    # ------------------------------------------------------------------
+
+    def _create_bar_chart(self, drawing: Drawing, top: float, data: pd.DataFrame,
+                          config: Dict[str, Any]) -> LegendItems:
+        """创建柱状图"""
+        x_col = config.get('xAxis')
+        y_cols = config.get('yAxis')
+
+        if not x_col or not y_cols:
+            raise ValueError("Bar chart requires 'xAxis' and 'yAxis' in config")
+
+        if isinstance(y_cols, str):
+            y_cols = [y_cols]
+
+        categories = [str(value) for value in data[x_col]]
+        series = [self._to_values(data[y_col]) for y_col in y_cols]
+        rotate_labels = len(categories) > MAX_CATEGORY_LABELS
+
+        x, y, w, h = self._plot_area(drawing, top, config, x_col, 'Value', rotate_labels)
+        chart = VerticalBarChart()
+        chart.x, chart.y, chart.width, chart.height = x, y, w, h
+        chart.data = series
+
+        # barWidth 与 matplotlib 相同，是相对于类别间距的比例
+        bar_width = config.get('barWidth', 0.35)
+        chart.barWidth = bar_width
+        chart.barSpacing = 0
+        chart.groupSpacing = max(1 - len(y_cols) * bar_width, 0.05)
+
+        palette = self._series_colors(config, len(y_cols))
+        for idx in range(len(y_cols)):
+            chart.bars[idx].fillColor = palette[idx]
+            chart.bars[idx].strokeColor = None
+
+        chart.categoryAxis.categoryNames = categories
+        self._style_category_labels(chart.categoryAxis.labels, rotate_labels)
+        chart.valueAxis.forceZero = 1
+        self._style_value_axis(chart.valueAxis, config.get('grid', True))
+
+        drawing.add(chart)
+        return list(zip(palette, y_cols))
+
+    def _create_line_chart(self, drawing: Drawing, top: float, data: pd.DataFrame,
+                           config: Dict[str, Any]) -> LegendItems:
+        """创建折线图"""
+        x_col = config.get('xAxis')
+        y_cols = config.get('yAxis')
+
+        if not x_col or not y_cols:
+            raise ValueError("Line chart requires 'xAxis' and 'yAxis' in config")
+
+        if isinstance(y_cols, str):
+            y_cols = [y_cols]
+
+        x_values, label_format = self._x_positions(data[x_col])
+        rotate_labels = label_format is not None and len(x_values) > MAX_CATEGORY_LABELS
+        plot = self._create_line_plot(
+            drawing, top, config, x_col, 'Value', x_values, label_format, rotate_labels,
+            [self._points(x_values, self._to_values(data[y_col])) for y_col in y_cols]
+        )
+
+        palette = self._series_colors(config, len(y_cols))
+        for idx in range(len(y_cols)):
+            plot.lines[idx].strokeColor = palette[idx]
+            plot.lines[idx].strokeWidth = 1.5
+            plot.lines[idx].symbol = makeMarker(
+                'FilledCircle', size=4, fillColor=palette[idx], strokeColor=palette[idx]
+            )
+
+        drawing.add(plot)
+        return list(zip(palette, y_cols))
+
+    def _create_area_chart(self, drawing: Drawing, top: float, data: pd.DataFrame,
+                           config: Dict[str, Any]) -> LegendItems:
+        """创建面积图"""
+        x_col = config.get('xAxis')
+        y_cols = config.get('yAxis')
+
+        if not x_col or not y_cols:
+            raise ValueError("Area chart requires 'xAxis' and 'yAxis' in config")
+
+        if isinstance(y_cols, str):
+            y_cols = [y_cols]
+
+        x_values, label_format = self._x_positions(data[x_col])
+        rotate_labels = label_format is not None and len(x_values) > MAX_CATEGORY_LABELS
+        series = [self._to_values(data[y_col]) for y_col in y_cols]
+        palette = self._series_colors(config, len(y_cols))
+        stacked = config.get('stacked', False)
+
+        if stacked:
+            # 堆叠面积图：每个系列填充到下方系列之和，从最上层开始绘制，下层覆盖上层
+            totals = [0.0] * len(x_values)
+            cumulative = []
+            for values in series:
+                totals = [t + (v or 0.0) for t, v in zip(totals, values)]
+                cumulative.append(list(totals))
+            plot_series = cumulative[::-1]
+            # 不透明的颜色（与白色混合）避免重叠区域颜色叠加
+            fill_colors = [self._blend_white(color, 0.7) for color in palette][::-1]
+        else:
+            plot_series = series
+            fill_colors = [self._with_alpha(color, 0.5) for color in palette]
+
+        plot = self._create_line_plot(
+            drawing, top, config, x_col, 'Value', x_values, label_format, rotate_labels,
+            [self._points(x_values, values) for values in plot_series],
+            # 填充区域闭合到X轴两端，两端不留空白
+            category_padding=0
+        )
+        plot.yValueAxis.forceZero = 1
+        for idx, fill_color in enumerate(fill_colors):
+            plot.lines[idx].inFill = True
+            plot.lines[idx].fillColor = fill_color
+            plot.lines[idx].strokeColor = fill_color if stacked else palette[idx]
+            plot.lines[idx].strokeWidth = 0.5 if stacked else 1
+
+        drawing.add(plot)
+        return list(zip(palette, y_cols))
+
+    def _create_pie_chart(self, drawing: Drawing, top: float, data: pd.DataFrame,
+                          config: Dict[str, Any]) -> LegendItems:
+        """创建饼图"""
+        labels_col = config.get('labels')
+        values_col = config.get('values')
+
+        if not labels_col or not values_col:
+            raise ValueError("Pie chart requires 'labels' and 'values' in config")
+
+        labels = [str(label) for label in data[labels_col]]
+        values = [value or 0.0 for value in self._to_values(data[values_col])]
+        total = sum(values)
+
+        # 四周留出标签和图例的位置，居中放置正方形饼图
+        size = max(min(drawing.width * 0.55, top - 40), 10)
+        pie = Pie()
+        pie.width = pie.height = size
+        pie.x = (drawing.width - size) / 2
+        pie.y = (top - size) / 2
+        pie.data = values
+        pie.startAngle = config.get('startAngle', 90)
+        pie.direction = 'anticlockwise'
+
+        if config.get('showPercentage', True) and total:
+            pie.labels = [f"{label} {value / total * 100:.1f}%" for label, value in zip(labels, values)]
+        else:
+            pie.labels = labels
+
+        palette = self._series_colors(config, len(values))
+        explode = config.get('explode') or []
+        pie.slices.strokeColor = colors.white
+        pie.slices.strokeWidth = 0.5
+        pie.slices.fontName = self.font_name
+        pie.slices.fontSize = LABEL_FONT_SIZE
+        for idx in range(len(values)):
+            pie.slices[idx].fillColor = palette[idx]
+            if idx < len(explode) and explode[idx]:
+                # matplotlib 的 explode 是半径的比例
+                pie.slices[idx].popout = explode[idx] * size / 2
+
+        drawing.add(pie)
+        return list(zip(palette, labels))
+
+    def _create_scatter_chart(self, drawing: Drawing, top: float, data: pd.DataFrame,
+                              config: Dict[str, Any]) -> LegendItems:
+        """创建散点图"""
+        x_col = config.get('xAxis')
+        y_col = config.get('yAxis')
+
+        if not x_col or not y_col:
+            raise ValueError("Scatter chart requires 'xAxis' and 'yAxis' in config")
+
+        size_col = config.get('sizeColumn')
+        color_col = config.get('colorColumn')
+
+        x_values, label_format = self._x_positions(data[x_col])
+        y_values = self._to_values(data[y_col])
+        alpha = config.get('alpha', 0.6)
+
+        # matplotlib 的 s 是标记的面积（点的平方）
+        if size_col and size_col in data.columns:
+            sizes = [math.sqrt(abs(s or 0.0)) for s in self._to_values(data[size_col])]
+        else:
+            sizes = [math.sqrt(config.get('markerSize', 50))] * len(y_values)
+
+        if color_col and color_col in data.columns:
+            point_colors = self._colormap(self._to_values(data[color_col]))
+        else:
+            point_colors = [self._series_colors(config, 1)[0]] * len(y_values)
+
+        uniform = len(set(sizes)) <= 1 and len(set(map(str, point_colors))) <= 1
+        if uniform:
+            series = [self._points(x_values, y_values)]
+        else:
+            # 每个点的大小或颜色不同：每个点作为一个单独的系列
+            kept = [
+                (point, size, color)
+                for x, y, size, color in zip(x_values, y_values, sizes, point_colors)
+                for point in self._points([x], [y])
+            ]
+            series = [[point] for point, _, _ in kept]
+            sizes = [size for _, size, _ in kept]
+            point_colors = [color for _, _, color in kept]
+
+        plot = self._create_line_plot(
+            drawing, top, config, x_col, y_col, x_values, label_format, False, series
+        )
+        plot.joinedLines = 0
+        for idx in range(len(series)):
+            color = self._with_alpha(point_colors[idx], alpha)
+            plot.lines[idx].strokeColor = None
+            plot.lines[idx].symbol = makeMarker(
+                'FilledCircle', size=sizes[idx], fillColor=color, strokeColor=None
+            )
+
+        drawing.add(plot)
+        # 与 ChartGenerator 一致：散点没有图例标签
+        return []
+
+    # ------------------------------------------------------------------
+    # 布局和样式
+    # ------------------------------------------------------------------
+
+    def _plot_area(self, drawing: Drawing, top: float, config: Dict[str, Any],
+                   default_x_label: str, default_y_label: str, rotate_labels: bool) -> PlotArea:
+        """添加坐标轴标题并计算绘图区"""
+        x_label = config.get('xLabel', default_x_label)
+        y_label = config.get('yLabel', default_y_label)
+
+        left = 42
+        bottom = 18 + (22 if rotate_labels else 0)
+        if y_label:
+            left += 14
+            group = Group(String(
+                0, 0, str(y_label), fontName=self.font_name, fontSize=LABEL_FONT_SIZE + 1,
+                textAnchor='middle'
+            ))
+            # 逆时针旋转90度，放在绘图区左侧的垂直中线上
+            group.transform = (0, 1, -1, 0, 12, bottom + 14 + (top - bottom - 14) / 2)
+            drawing.add(group)
+        if x_label:
+            bottom += 14
+            drawing.add(String(
+                left + (drawing.width - left - 14) / 2, 6, str(x_label),
+                fontName=self.font_name, fontSize=LABEL_FONT_SIZE + 1, textAnchor='middle'
+            ))
+
+        return left, bottom, drawing.width - left - 14, max(top - bottom, 10)
+
+    def _create_line_plot(self, drawing: Drawing, top: float, config: Dict[str, Any],
+                          x_col: str, default_y_label: str, x_values: List[float],
+                          label_format: Optional[Callable[[float], str]], rotate_labels: bool,
+                          series: Sequence[Sequence[Tuple[float, float]]],
+                          category_padding: float = 0.5) -> LinePlot:
+        """创建数值坐标的 LinePlot（折线图、面积图和散点图共用）
+
+        category_padding 为类别型X轴两端留出的空白（以类别间距为单位）。
+        """
+        x, y, w, h = self._plot_area(drawing, top, config, x_col, default_y_label, rotate_labels)
+        plot = LinePlot()
+        plot.x, plot.y, plot.width, plot.height = x, y, w, h
+        plot.data = [list(points) for points in series]
+
+        grid = config.get('grid', True)
+        self._style_value_axis(plot.yValueAxis, grid)
+        self._style_value_axis(plot.xValueAxis, grid)
+
+        if label_format is not None:
+            # 类别型X轴：刻度放在每个类别的位置上，类别过多时间隔显示
+            step = max(1, math.ceil(len(x_values) / MAX_CATEGORY_LABELS))
+            plot.xValueAxis.valueSteps = x_values[::step]
+            plot.xValueAxis.valueMin = -category_padding
+            plot.xValueAxis.valueMax = max(len(x_values) - 1, 1) + category_padding
+            plot.xValueAxis.labelTextFormat = label_format
+            self._style_category_labels(plot.xValueAxis.labels, rotate_labels)
+
+        return plot
+
+    def _style_value_axis(self, axis, grid: bool):
+        axis.labels.fontName = self.font_name
+        axis.labels.fontSize = LABEL_FONT_SIZE
+        axis.strokeColor = colors.HexColor('#555555')
+        if grid:
+            axis.visibleGrid = 1
+            axis.gridStrokeColor = colors.HexColor('#DDDDDD')
+            axis.gridStrokeWidth = 0.5
+
+    def _style_category_labels(self, labels, rotate: bool):
+        labels.fontName = self.font_name
+        labels.fontSize = LABEL_FONT_SIZE
+        if rotate:
+            labels.angle = 45
+            labels.boxAnchor = 'ne'
+
+    def _add_legend(self, drawing: Drawing, top: float, items: LegendItems, position: str):
+        """在绘图区内按 legendPosition（如 'upper right'、'lower left'，'best' 视为右上）放置图例"""
+        position = str(position).lower()
+        legend = Legend()
+        legend.colorNamePairs = [(color, str(name)) for color, name in items]
+        legend.fontName = self.font_name
+        legend.fontSize = LABEL_FONT_SIZE
+        legend.dx = legend.dy = 6
+        legend.deltay = LABEL_FONT_SIZE + 3
+        legend.columnMaximum = max(len(items), 1)
+        legend.alignment = 'right'
+
+        if 'left' in position:
+            legend.x, horizontal = 70, 'w'
+        elif 'center' in position and 'right' not in position:
+            legend.x, horizontal = drawing.width / 2, ''
+        else:
+            legend.x, horizontal = drawing.width - 20, 'e'
+
+        if 'lower' in position:
+            legend.y, vertical = 60, 's'
+        else:
+            legend.y, vertical = top - 6, 'n'
+
+        legend.boxAnchor = (vertical + horizontal) or 'c'
+        drawing.add(legend)
+
+    # ------------------------------------------------------------------
+    # 数据和颜色
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _points(x_values: Sequence[float], y_values: Sequence[Optional[float]]) -> List[Tuple[float, float]]:
+        """组合为坐标点，跳过缺失的值"""
+        return [
+            (x, y) for x, y in zip(x_values, y_values)
+            if y is not None and not math.isnan(x)
+        ]
+
+    @staticmethod
+    def _to_values(series: pd.Series) -> List[Optional[float]]:
+        """转换为浮点数列表，缺失值和无法转换的值为None"""
+        numeric = pd.to_numeric(series, errors='coerce')
+        return [None if pd.isna(value) else float(value) for value in numeric]
+
+    @classmethod
+    def _x_positions(cls, series: pd.Series) -> Tuple[List[float], Optional[Callable[[float], str]]]:
+        """计算X轴坐标
+
+        Returns:
+            (坐标列表, 标签格式化函数)；数值型X轴的格式化函数为None，
+            其他类型（文本、日期等）按类别处理，坐标为 0..n-1
+        """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return [value if value is not None else math.nan for value in cls._to_values(series)], None
+
+        labels = [str(value) for value in series]
+
+        def label_format(value: float) -> str:
+            index = int(round(value))
+            return labels[index] if 0 <= index < len(labels) else ''
+
+        return [float(i) for i in range(len(labels))], label_format
+
+    def _series_colors(self, config: Dict[str, Any], count: int) -> List[colors.Color]:
+        """系列颜色：配置中的 colors 优先，不足时使用默认配色"""
+        configured = config.get('colors') or []
+        return [
+            self._parse_color(configured[i]) if i < len(configured)
+            else colors.HexColor(DEFAULT_COLORS[i % len(DEFAULT_COLORS)])
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _parse_color(value: Any) -> colors.Color:
+        """解析颜色（#RRGGBB 或颜色名称），无法解析时为黑色"""
+        try:
+            return colors.toColor(value)
+        except ValueError:
+            return colors.black
+
+    @staticmethod
+    def _with_alpha(color: colors.Color, alpha: float) -> colors.Color:
+        return colors.Color(color.red, color.green, color.blue, alpha=alpha)
+
+    @staticmethod
+    def _blend_white(color: colors.Color, alpha: float) -> colors.Color:
+        return colors.Color(*(alpha * c + (1 - alpha) for c in (color.red, color.green, color.blue)))
+
+    @staticmethod
+    def _colormap(values: List[Optional[float]]) -> List[colors.Color]:
+        """把数值映射为 viridis 颜色"""
+        present = [v for v in values if v is not None]
+        low, high = (min(present), max(present)) if present else (0.0, 1.0)
+        span = (high - low) or 1.0
+        anchors = [colors.HexColor(c) for c in VIRIDIS]
+
+        result = []
+        for value in values:
+            t = 0.0 if value is None else (value - low) / span * (len(anchors) - 1)
+            i = min(int(t), len(anchors) - 2)
+            f = t - i
+            a, b = anchors[i], anchors[i + 1]
+            result.append(colors.Color(
+                a.red + (b.red - a.red) * f,
+                a.green + (b.green - a.green) * f,
+                a.blue + (b.blue - a.blue) * f,
+            ))
+        return result
@@ -0,0 +1,196 @@
+"""报告生成性能分析工具
+
+记录生成过程中各阶段和各元素的墙钟时间、CPU时间和峰值内存（tracemalloc）。
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+class ReportProfile:
+    """一次报告生成的性能数据
+
+    Attributes:
+        stages: 各阶段统计 {名称: {'wall', 'cpu', 'peak_memory', 'calls'}}，按首次出现顺序排列
+        elements: 每个元素的统计列表（index、type、wall、cpu、peak_memory、template_wall；
+                  图表降采样时还有 dropped_points，即丢弃的数据点数）
+        page_count: 页数
+        output_size: PDF大小（字节）
+        wall / cpu: 整个生成过程的墙钟时间和CPU时间（秒）
+        peak_memory: 整个生成过程的峰值内存增量（字节）；未跟踪内存时为None
+        data_source_timings: 各数据源的加载耗时（秒）
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.elements: List[Dict[str, Any]] = []
+        self.page_count: Optional[int] = None
+        self.output_size: Optional[int] = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory: Optional[int] = None
+        self.data_source_timings: Dict[str, float] = {}
+
+    def add_stage(self, name: str, wall: float, cpu: float, peak_memory: Optional[int]):
+        """累加阶段统计（同名阶段多次出现时合并）"""
+        stage = self.stages.setdefault(
+            name, {'wall': 0.0, 'cpu': 0.0, 'peak_memory': None, 'calls': 0}
+        )
+        stage['wall'] += wall
+        stage['cpu'] += cpu
+        stage['calls'] += 1
+        if peak_memory is not None:
+            stage['peak_memory'] = max(stage['peak_memory'] or 0, peak_memory)
+
+    def get_element_type_summary(self) -> Dict[str, Dict[str, Any]]:
+        """按元素类型汇总的统计"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for element in self.elements:
+            item = summary.setdefault(
+                element['type'], {'count': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_memory': None}
+            )
+            item['count'] += 1
+            item['wall'] += element['wall']
+            item['cpu'] += element['cpu']
+            if element['peak_memory'] is not None:
+                item['peak_memory'] = max(item['peak_memory'] or 0, element['peak_memory'])
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'peak_memory': self.peak_memory,
+            'page_count': self.page_count,
+            'output_size': self.output_size,
+            'data_source_timings': dict(self.data_source_timings),
+            'stages': {name: dict(stage) for name, stage in self.stages.items()},
+            'element_types': self.get_element_type_summary(),
+            'elements': [dict(element) for element in self.elements],
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """转换为JSON字符串"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def __repr__(self) -> str:
+        return (
+            f"ReportProfile(wall={self.wall:.3f}s, pages={self.page_count}, "
+            f"size={self.output_size}, stages={list(self.stages)})"
+        )
+
+
+class _Frame:
+    """正在计时的阶段"""
+
+    def __init__(self, trace_memory: bool):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.memory_start = 0
+        self.memory_peak = 0
+        if trace_memory:
+            self.memory_start, _ = tracemalloc.get_traced_memory()
+            self.memory_peak = self.memory_start
+
+
+class ReportProfiler:
+    """报告生成性能分析器
+
+    阶段可以嵌套（例如元素构建嵌套在内容构建中），内层阶段的内存峰值会同时计入外层阶段。
+
+    Example:
+        >>> profiler = ReportProfiler()
+        >>> profiler.start()
+        >>> with profiler.stage('layout'):
+        ...     doc.build(story)
+        >>> profile = profiler.stop()
+        >>> print(profile.to_json(indent=2))
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        Args:
+            trace_memory: 是否使用tracemalloc跟踪内存（会显著降低执行速度）
+        """
+        self.trace_memory = trace_memory
+        self.profile = ReportProfile()
+        self._stack: List[_Frame] = []
+        self._root: Optional[_Frame] = None
+        self._started_tracing = False
+
+    def start(self):
+        """开始分析"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._root = self._enter()
+
+    def stop(self) -> ReportProfile:
+        """结束分析并返回结果"""
+        if self._root is not None:
+            wall, cpu, peak = self._exit(self._root)
+            self.profile.wall = wall
+            self.profile.cpu = cpu
+            self.profile.peak_memory = peak
+            self._root = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        return self.profile
+
+    @contextmanager
+    def stage(self, name: str):
+        """记录一个阶段"""
+        frame = self._enter()
+        try:
+            yield
+        finally:
+            self.profile.add_stage(name, *self._exit(frame))
+
+    @contextmanager
+    def element(self, index: int, element_type: str):
+        """记录一个元素的构建，yield的字典可以补充额外信息"""
+        record: Dict[str, Any] = {'index': index, 'type': element_type}
+        frame = self._enter()
+        try:
+            yield record
+        finally:
+            wall, cpu, peak = self._exit(frame)
+            record.update({'wall': wall, 'cpu': cpu, 'peak_memory': peak})
+            record.setdefault('template_wall', 0.0)
+            self.profile.elements.append(record)
+
+    def _enter(self) -> _Frame:
+        if self.trace_memory and self._stack:
+            # 保存外层阶段到目前为止的峰值，再为内层阶段重置峰值
+            _, peak = tracemalloc.get_traced_memory()
+            self._stack[-1].memory_peak = max(self._stack[-1].memory_peak, peak)
+            tracemalloc.reset_peak()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+
+        frame = _Frame(self.trace_memory)
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame: _Frame):
+        wall = time.perf_counter() - frame.wall_start
+        cpu = time.process_time() - frame.cpu_start
+        peak_delta = None
+
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            frame.memory_peak = max(frame.memory_peak, peak)
+            peak_delta = frame.memory_peak - frame.memory_start
+
+        self._stack.remove(frame)
+        if self.trace_memory and self._stack:
+            self._stack[-1].memory_peak = max(self._stack[-1].memory_peak, frame.memory_peak)
+
+        return wall, cpu, peak_delta
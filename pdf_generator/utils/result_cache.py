@@ -0,0 +1,271 @@
+"""生成结果缓存
+
+按内容寻址缓存生成好的PDF：键由配置的规范化哈希和每个数据源DataFrame的指纹组成，
+配置和数据都相同的请求（例如定时刷新的仪表盘）直接返回缓存的字节，不再运行ReportLab。
+
+缓存分为两层：进程内的LRU内存缓存和可选的磁盘缓存，两层都有大小上限并按最近使用淘汰。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Mapping, Union
+
+import pandas as pd
+
+
+def fingerprint_dataframe(df: pd.DataFrame, index: bool = True) -> str:
+    """计算DataFrame的内容指纹
+
+    使用 pd.util.hash_pandas_object 逐行哈希，并加入列名和类型；
+    包含列表、字典等不可哈希值的列退回到JSON序列化后哈希。
+
+    Args:
+        df: DataFrame
+        index: 是否把索引计入指纹
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(repr([str(dtype) for dtype in df.dtypes]).encode('utf-8'))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=index).values.tobytes())
+    except TypeError:
+        digest.update(
+            df.to_json(orient='split', index=index, date_format='iso', default_handler=str).encode('utf-8')
+        )
+    return digest.hexdigest()
+
+
+def make_cache_key(
+    config: Dict[str, Any],
+    data_sources: Mapping[str, pd.DataFrame],
+    extra: Optional[Any] = None
+) -> str:
+    """计算报告的缓存键
+
+    Args:
+        config: 报告配置
+        data_sources: 数据源字典 {名称: DataFrame}
+        extra: 其他影响输出的信息（如已注册的字体），需可JSON序列化
+
+    Returns:
+        十六进制SHA-256字符串
+    """
+    digest = hashlib.sha256()
+    canonical = json.dumps(
+        config, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    digest.update(canonical.encode('utf-8'))
+    for name in sorted(data_sources):
+        digest.update(b'\0' + name.encode('utf-8') + b'\0')
+        digest.update(fingerprint_dataframe(data_sources[name]).encode('ascii'))
+    if extra is not None:
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """两层（内存LRU + 磁盘）PDF结果缓存
+
+    线程安全，可以在多个生成器之间共享。磁盘缓存以 <目录>/<键前两位>/<键>.pdf 保存，
+    写入时先写临时文件再原子替换，多个进程可以共享同一个目录。
+
+    Example:
+        >>> cache = ReportCache(cache_dir=".pdf_cache", max_disk_bytes=512 * 1024 * 1024)
+        >>> generator = PDFReportGenerator(config_dict=config, result_cache=cache)
+        >>> pdf_bytes = generator.to_bytes()   # 未命中：生成并写入缓存
+        >>> pdf_bytes = generator.to_bytes()   # 命中：直接返回缓存的字节
+        >>> cache.get_stats()['hits']
+        1
+    """
+
+    # 默认内存缓存上限（字节）
+    DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+
+    # 默认磁盘缓存上限（字节）
+    DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+
+    # 磁盘缓存文件的扩展名
+    FILE_SUFFIX = '.pdf'
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES
+    ):
+        """
+        Args:
+            max_memory_bytes: 内存缓存的总大小上限（字节），0表示不使用内存缓存
+            cache_dir: 磁盘缓存目录，None表示不使用磁盘缓存
+            max_disk_bytes: 磁盘缓存的总大小上限（字节）
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """读取缓存
+
+        Returns:
+            缓存的字节；未命中时返回None
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return data
+
+        data = self._read_disk(key)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._put_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        """写入缓存（内存和磁盘）"""
+        with self._lock:
+            self._put_memory(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        """清空两层缓存（不重置统计）"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+        for path in self._disk_files():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'memory_items': len(self._memory),
+                'memory_bytes': self._memory_size,
+            }
+
+    def _put_memory(self, key: str, data: bytes):
+        """写入内存缓存并按LRU淘汰（调用方持有锁）"""
+        if len(data) > self.max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_size -= len(previous)
+
+        self._memory[key] = data
+        self._memory_size += len(data)
+
+        while self._memory_size > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.FILE_SUFFIX}"
+
+    def _disk_files(self):
+        if not self.cache_dir or not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f'*/*{self.FILE_SUFFIX}'))
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """读取磁盘缓存，命中时更新修改时间用于LRU淘汰"""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key: str, data: bytes):
+        """原子写入磁盘缓存，超出大小上限时淘汰最久未使用的文件"""
+        if not self.cache_dir or len(data) > self.max_disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Failed to write report cache file {path}: {e}")
+            return
+
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """按修改时间淘汰磁盘缓存，直到总大小不超过上限"""
+        files = []
+        total = 0
+        for path in self._disk_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        files.sort(key=lambda item: item[0])
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def __repr__(self) -> str:
+        stats = self.get_stats()
+        return (
+            f"{type(self).__name__}(hits={stats['hits']}, misses={stats['misses']}, "
+            f"memory_items={stats['memory_items']}, cache_dir={self.cache_dir})"
+        )
@@ -0,0 +1,130 @@
+"""表格列宽估算
+
+未指定列宽时，ReportLab 在布局时测量每个单元格（Paragraph 单元格还要按可用宽度反复换行）。
+这里根据字体度量直接估算每列需要的宽度：
+
+- 每个字符的宽度用 pdfmetrics.stringWidth 计算一次，按字体缓存
+- 整列字符串拼接后按码点查表，用累加和得到每个字符串的宽度
+- 列宽按内容最宽的单元格计算，再按最小/最大列宽和可用宽度调整：
+  先压缩可以换行的列（包含 Paragraph 的列），仍然放不下时再压缩所有列
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from reportlab.pdfbase import pdfmetrics
+
+# ReportLab Table 的默认字体、字号和左右内边距
+DEFAULT_FONT_NAME = 'Helvetica'
+DEFAULT_FONT_SIZE = 10
+DEFAULT_PADDING = 6
+
+# 字体 -> {码点: 字号为1时的宽度}
+_CHAR_WIDTHS: Dict[str, Dict[int, float]] = {}
+_CHAR_WIDTHS_LOCK = threading.Lock()
+
+
+def get_cell_font(
+    commands: Sequence[tuple],
+    row: int,
+    total_rows: int
+) -> Tuple[str, float, float]:
+    """获取表格样式中某一行的字体、字号和左右内边距之和
+
+    按命令顺序取最后一个覆盖该行的设置（与 ReportLab 相同，后面的命令覆盖前面的命令）。
+    """
+    font_name, font_size = DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE
+    left, right = DEFAULT_PADDING, DEFAULT_PADDING
+    for command in commands:
+        op = command[0]
+        sr, er = command[1][1], command[2][1]
+        if isinstance(sr, str) or isinstance(er, str):
+            continue
+        sr = sr + total_rows if sr < 0 else sr
+        er = er + total_rows if er < 0 else er
+        if not sr <= row <= er:
+            continue
+
+        if op == 'FONTNAME':
+            font_name = command[3]
+        elif op == 'FONT':
+            font_name = command[3]
+            if len(command) > 4:
+                font_size = command[4]
+        elif op in ('FONTSIZE', 'SIZE'):
+            font_size = command[3]
+        elif op == 'LEFTPADDING':
+            left = command[3]
+        elif op == 'RIGHTPADDING':
+            right = command[3]
+    return font_name, font_size, left + right
+
+
+def string_widths(strings: Sequence[str], font_name: str, font_size: float) -> np.ndarray:
+    """计算一组字符串的宽度（点）"""
+    if len(strings) == 0:
+        return np.zeros(0)
+
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    codes = np.frombuffer(''.join(strings).encode('utf-32-le'), dtype=np.uint32)
+    unique, inverse = np.unique(codes, return_inverse=True)
+
+    with _CHAR_WIDTHS_LOCK:
+        cache = _CHAR_WIDTHS.setdefault(font_name, {})
+        for code in unique.tolist():
+            if code not in cache:
+                cache[code] = pdfmetrics.stringWidth(chr(code), font_name, 1)
+        unit_widths = np.array([cache[code] for code in unique.tolist()])
+
+    cumulative = np.concatenate(([0.0], np.cumsum(unit_widths[inverse])))
+    ends = np.cumsum(lengths)
+    return (cumulative[ends] - cumulative[ends - lengths]) * font_size
+
+
+def fit_column_widths(
+    widths: Sequence[float],
+    available: float,
+    min_width: float = 0,
+    max_width: Optional[float] = None,
+    flexible: Optional[Sequence[bool]] = None
+) -> List[float]:
+    """把列宽调整到可用宽度以内
+
+    Args:
+        widths: 各列内容需要的宽度
+        available: 可用宽度
+        min_width / max_width: 单列的最小/最大宽度
+        flexible: 各列是否可以换行；放不下时先压缩可以换行的列
+
+    Returns:
+        列宽列表；最小列宽之和超过可用宽度时总宽度仍会超出
+    """
+    widths = np.asarray(widths, dtype=float)
+    if max_width is not None:
+        widths = np.minimum(widths, max_width)
+    widths = np.maximum(widths, min_width)
+    if widths.sum() <= available:
+        return widths.tolist()
+
+    if flexible is not None:
+        flexible = np.asarray(flexible, dtype=bool)
+        remaining = available - widths[~flexible].sum()
+        if flexible.any() and remaining >= min_width * flexible.sum():
+            widths[flexible] = _water_fill(widths[flexible], remaining, min_width)
+            return widths.tolist()
+
+    return _water_fill(widths, available, min_width).tolist()
+
+
+def _water_fill(widths: np.ndarray, total: float, minimum: float) -> np.ndarray:
+    """把超过上限的列压缩到同一个上限，使总宽度等于 total（较窄的列保持不变）"""
+    order = np.sort(widths)
+    below = 0.0
+    cap = total / len(order)
+    for k, width in enumerate(order):
+        cap = (total - below) / (len(order) - k)
+        if cap <= width:
+            break
+        below += width
+    return np.minimum(widths, max(cap, minimum))